@@ -0,0 +1,78 @@
+"""
+Measures the CPU time of a request to `GET /api/v1/media` answered from the cache.
+
+Compares sending the cached body as is (`bytes`) with validating it back into a `MediaModel`
+and letting FastAPI serialize the response model (`model`), which is what a cache hit used
+to cost.
+
+    poetry run python benchmarks/bench_cached_response.py --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+os.environ.setdefault("OMDB_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from movie_scrapper_api.api.responses import json_response  # noqa: E402
+from movie_scrapper_api.cache.response import CachedResponse  # noqa: E402
+from movie_scrapper_api.models.media import MediaModel  # noqa: E402
+from movie_scrapper_api.scrapper import Scrapper  # noqa: E402
+
+FIXTURES_PATH = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "omdb"
+
+
+async def cached_body(imdb_id: str) -> bytes:
+    payload = json.loads((FIXTURES_PATH / f"{imdb_id}.json").read_text())
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+    async with Scrapper(transport=transport) as scrapper:
+        return (await scrapper.find_media_json({'i': imdb_id})).body
+
+
+def create_app(body: bytes) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model")
+    async def model() -> MediaModel:
+        return MediaModel.model_validate_json(body)
+
+    @app.get("/bytes")
+    async def raw() -> MediaModel:
+        return json_response(CachedResponse.from_body(body))
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    for _ in range(100):
+        await client.get(path)
+
+    start = time.process_time()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.process_time() - start) / requests
+
+
+async def main(requests: int, imdb_id: str) -> None:
+    app = create_app(await cached_body(imdb_id))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        model = await measure(client, "/model", requests)
+        raw = await measure(client, "/bytes", requests)
+
+    print(f"{'variant':<10}{'cpu/request':>14}")
+    print(f"{'model':<10}{model * 1e6:>11.1f} us")
+    print(f"{'bytes':<10}{raw * 1e6:>11.1f} us")
+    print(f"saved {(model - raw) * 1e6:.1f} us ({(1 - raw / model) * 100:.0f}%) of CPU per request")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--imdb-id", default="tt0068646")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.imdb_id))
@@ -0,0 +1,93 @@
+"""
+Measures how many media per second are converted from recorded payloads of OMDB.
+
+Compares the conversion the `Scrapper` used to do (`json` decoding, an intermediate dict, a
+full `model_validate` and then `model_dump_json` for the cache) with `render_media`, which
+renders the body of the API directly. Then compares how the models of the rendered bodies are
+built for `Scrapper.find_media`, with `CachedResponse.to_model`, which validates the JSON, and
+with `build_media`.
+
+    poetry run python benchmarks/bench_omdb_parsing.py --corpus tests/fixtures/omdb
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+from movie_scrapper_api.cache.response import CachedResponse
+from movie_scrapper_api.models.media import MediaModel
+from movie_scrapper_api.omdb import build_media, render_media
+
+FIXTURES_PATH = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "omdb"
+
+
+def legacy_render_media(content: bytes) -> bytes:
+    return legacy_parse_media(content).model_dump_json().encode()
+
+
+def legacy_parse_media(content: bytes) -> MediaModel:
+    media_data = json.loads(content)
+    if "Error" in media_data:
+        raise ValueError(media_data['Error'])
+
+    return MediaModel.model_validate({
+        'title': media_data['Title'],
+        'year': media_data['Year'],
+        'rated': media_data['Rated'],
+        'released': media_data['Released'],
+        'genres': [genre.strip() for genre in media_data['Genre'].split(',')],
+        'director': media_data['Director'],
+        'writers': [writer.strip() for writer in media_data['Writer'].split(',')],
+        'actors': [actor.strip() for actor in media_data['Actors'].split(',')],
+        'plot': media_data['Plot'],
+        'languages': [language.strip() for language in media_data['Language'].split(',')],
+        'countries': [country.strip() for country in media_data['Country'].split(',')],
+        'awards': media_data['Awards'],
+        'poster': media_data['Poster'] if media_data['Poster'] != "N/A" else None,
+        'ratings': [{'source': rating['Source'], 'value': rating['Value']} for rating in media_data['Ratings']],
+        'imdb': {
+            'rating': media_data['imdbRating'],
+            'votes': media_data['imdbVotes'],
+            'id': media_data['imdbID']
+        },
+        'type': media_data['Type'],
+        'embed': f"https://vidsrc.to/embed/{media_data['Type']}/{media_data['imdbID']}"
+    })
+
+
+def measure(parse: Callable[[bytes], object], corpus: list[bytes], rounds: int) -> float:
+    for content in corpus:
+        parse(content)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in corpus:
+            parse(content)
+    return rounds * len(corpus) / (time.perf_counter() - start)
+
+
+def main(corpus_path: Path, rounds: int) -> None:
+    corpus = [path.read_bytes() for path in sorted(corpus_path.glob("tt*.json"))]
+    bodies = [render_media(content) for content in corpus]
+    variants = {
+        "legacy body": measure(legacy_render_media, corpus, rounds),
+        "render_media": measure(render_media, corpus, rounds),
+        "to_model": measure(lambda body: CachedResponse.from_body(body).to_model(MediaModel), bodies, rounds),
+        "build_media": measure(build_media, bodies, rounds),
+    }
+
+    print(f"{len(corpus)} payloads x {rounds} rounds")
+    print(f"{'variant':<14}{'objects/s':>12}")
+    for name, objects in variants.items():
+        print(f"{name:<14}{objects:>12,.0f}")
+    print(f"body speed-up x{variants['render_media'] / variants['legacy body']:.2f}")
+    print(f"model speed-up x{variants['build_media'] / variants['to_model']:.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=FIXTURES_PATH, help="A folder of recorded tt*.json payloads")
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.corpus, args.rounds)
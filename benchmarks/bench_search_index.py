@@ -0,0 +1,99 @@
+"""
+Measures the local index of the titles: how long it takes to build and to map, and how many
+searches per second it answers, for queries being typed and for queries with typos.
+
+The titles are made up of common words and of random ones, so that the index can be as large
+as a dump of IMDB.
+
+    poetry run python benchmarks/bench_search_index.py --titles 200000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from movie_scrapper_api.search_index import Segment, TitleIndex
+
+WORDS = (
+    "the a of and night day man woman love war star lost last first dark light house king queen "
+    "blood city river black white red blue secret story return rise fall dead life world dream "
+    "shadow fire ice storm heart game road home ghost wild new old little big great summer winter"
+).split()
+SYLLABLES = "ka lo mi ne ru sa to vi ze an el or ul ith bar den gor mal tor wen".split()
+
+
+def make_titles(count: int, seed: int = 7) -> list[dict]:
+    generator = random.Random(seed)
+    words = WORDS + [
+        "".join(generator.choice(SYLLABLES) for _ in range(generator.randint(2, 4))) for _ in range(count // 10)
+    ]
+
+    def title() -> str:
+        return " ".join(
+            generator.choice(WORDS if generator.random() < 0.4 else words) for _ in range(generator.randint(1, 5))
+        )
+
+    return [
+        {
+            'title': title().title(),
+            'year': str(generator.randint(1920, 2023)),
+            'imdbID': f"tt{number:07d}",
+            'type': "movie",
+            'poster': None
+        }
+        for number in range(count)
+    ]
+
+
+def make_queries(titles: list[dict], count: int, seed: int = 11) -> tuple[list[str], list[str], list[str]]:
+    generator = random.Random(seed)
+    typed, typos, expected = [], [], []
+    for media in generator.sample(titles, count):
+        expected.append(media['imdbID'])
+        title = media['title']
+        typed.append(title[:generator.randint(3, len(title))] if len(title) > 3 else title)
+        if len(title) > 4:
+            position = generator.randrange(1, len(title) - 2)
+            title = title[:position] + title[position + 1] + title[position] + title[position + 2:]
+        typos.append(title)
+    return typed, typos, expected
+
+
+def measure(index: TitleIndex, queries: list[str], expected: list[str]) -> tuple[float, float]:
+    """The searches per second, and the share of them that found the expected media."""
+    found = 0
+    start = time.perf_counter()
+    for query, imdb_id in zip(queries, expected):
+        found += any(media['imdbID'] == imdb_id for _, media in index.search(query))
+    return len(queries) / (time.perf_counter() - start), found / len(queries)
+
+
+def main(count: int, queries: int) -> None:
+    titles = make_titles(count)
+    typed, typos, expected = make_queries(titles, queries)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "titles.idx"
+        start = time.perf_counter()
+        path.write_bytes(Segment.build(titles))
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = TitleIndex(path)
+        mapped = time.perf_counter() - start
+
+        print(f"{count:,} titles, {path.stat().st_size / 2 ** 20:.1f} MiB")
+        print(f"built in {built:.2f}s, mapped in {mapped * 1000:.2f}ms")
+        print(f"{'queries':<10}{'searches/s':>12}{'found':>8}")
+        for name, variant in (("typed", typed), ("typos", typos)):
+            searches, found = measure(index, variant, expected)
+            print(f"{name:<10}{searches:>12,.0f}{found:>8.0%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.titles, args.queries)
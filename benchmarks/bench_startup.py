@@ -0,0 +1,100 @@
+"""
+Measures the cold start of the API, with and without `FAST_START`: how long it takes to import
+the application in a fresh interpreter, how long until it answers its first request, and how
+long that first request takes, the time to build its route included.
+
+Every measure is the median of `--runs` fresh processes, so that it can be compared between two
+versions to track the startup latency.
+
+    poetry run python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+
+
+def environment(fast_start: bool, port: int = 9101) -> dict[str, str]:
+    return {
+        **os.environ,
+        'OMDB_API_KEY': os.environ.get('OMDB_API_KEY', "benchmark"),
+        'FAST_START': str(fast_start).lower(),
+        'BIND_HOST': "127.0.0.1",
+        'BIND_PORT': str(port),
+        'LOG_LEVEL': "30"
+    }
+
+
+def measure_import(fast_start: bool) -> float:
+    """The seconds to import the application, over the ones of an empty interpreter."""
+    def run(code: str) -> float:
+        started_at = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT_PATH, env=environment(fast_start), check=True)
+        return time.perf_counter() - started_at
+
+    return run("import movie_scrapper_api.__main__") - run("pass")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(fast_start: bool, path: str) -> tuple[float, float]:
+    """The seconds until the API answers its first request, and the ones that request took."""
+    port = free_port()
+    started_at = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "movie_scrapper_api"], cwd=ROOT_PATH, env=environment(fast_start, port)
+    )
+    try:
+        with socket.socket() as sock:
+            while sock.connect_ex(("127.0.0.1", port)) != 0:
+                time.sleep(0.005)
+        requested_at = time.perf_counter()
+        httpx.get(f"http://127.0.0.1:{port}{path}").raise_for_status()
+        answered_at = time.perf_counter()
+        return answered_at - started_at, answered_at - requested_at
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(runs: int, path: str, output: Path | None) -> None:
+    results = {}
+    for fast_start in (False, True):
+        imports = [measure_import(fast_start) for _ in range(runs)]
+        first_requests = [measure_first_request(fast_start, path) for _ in range(runs)]
+        results['fast_start' if fast_start else 'default'] = {
+            'import': statistics.median(imports),
+            'ready': statistics.median(ready for ready, _ in first_requests),
+            'first_request': statistics.median(request for _, request in first_requests)
+        }
+
+    print(f"{'mode':<12}{'import':>10}{'answered':>12}{'1st request':>14}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<12}{result['import'] * 1000:>8.0f}ms{result['ready'] * 1000:>10.0f}ms"
+            f"{result['first_request'] * 1000:>12.1f}ms"
+        )
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/v1/stats", help="The first request")
+    parser.add_argument("--output", type=Path, help="A JSON file to write the results to")
+    args = parser.parse_args()
+    main(args.runs, args.path, args.output)
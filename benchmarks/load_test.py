@@ -0,0 +1,190 @@
+"""
+Drives `GET /api/v1/media` and `GET /api/v1/search/media/{media_name}` at increasing
+concurrency, and reports the throughput and the p50/p95/p99 latencies of every level.
+
+Unless `--url` points it to a running API, it starts the stand-in of OMDB of
+`tests/fake_omdb.py` and the API in front of it, so that the numbers do not depend on OMDB
+nor on the network. The requests are drawn from the recorded payloads with a fixed seed, so
+that two runs make the same requests. With `--no-cache` every request reaches the stand-in
+of OMDB, instead of being answered from the cache after the first one.
+
+    poetry run python benchmarks/load_test.py --concurrency 1 8 32 128 --requests 2000
+    poetry run python benchmarks/load_test.py --no-cache --latency 0.05 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+FIXTURES_PATH = ROOT_PATH / "tests" / "fixtures" / "omdb"
+
+
+@dataclass
+class Result:
+    concurrency: int
+    requests: int
+    errors: int
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+
+
+def make_requests(count: int, seed: int) -> list[tuple[str, dict]]:
+    """The paths and the query parameters of the requests, a mix of lookups and searches."""
+    generator = random.Random(seed)
+    titles = [json.loads(path.read_text()) for path in sorted(FIXTURES_PATH.glob("tt*.json"))]
+    searches = [
+        path.stem.removeprefix("search-").partition("-page-") for path in sorted(FIXTURES_PATH.glob("search-*.json"))
+    ]
+    choices = [
+        *(("/api/v1/media", {'q': media['imdbID']}) for media in titles),
+        *(("/api/v1/media", {'q': media['Title'], 'mode': 't'}) for media in titles),
+        *((f"/api/v1/search/media/{name.replace('-', ' ')}", {'page': page or 1}) for name, _, page in searches),
+        ("/api/v1/media", {'q': "tt0000000"})
+    ]
+    return [generator.choice(choices) for _ in range(count)]
+
+
+def percentile(latencies: list[float], share: float) -> float:
+    return latencies[min(len(latencies) - 1, int(share * len(latencies)))]
+
+
+async def run_level(client: httpx.AsyncClient, requests: list[tuple[str, dict]], concurrency: int) -> Result:
+    pending = iter(requests)
+    latencies = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for path, params in pending:
+            started_at = time.perf_counter()
+            try:
+                res = await client.get(path, params=params)
+                errors += res.status_code >= 500
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return Result(
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        throughput=len(latencies) / elapsed,
+        p50=percentile(latencies, 0.50),
+        p95=percentile(latencies, 0.95),
+        p99=percentile(latencies, 0.99)
+    )
+
+
+async def run(url: str, levels: list[int], count: int, warmup: int, seed: int) -> list[Result]:
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        await run_level(client, make_requests(warmup, seed), min(levels))
+        return [await run_level(client, make_requests(count, seed + level), level) for level in levels]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@contextmanager
+def serve(args: argparse.Namespace) -> Iterator[str]:
+    """Starts the stand-in of OMDB and the API in front of it, and yields the URL of the API."""
+    omdb_port, api_port = free_port(), free_port()
+    fake_omdb = [
+        sys.executable, "-m", "tests.fake_omdb", "--port", str(omdb_port), "--latency", str(args.latency),
+        "--jitter", str(args.jitter), "--error-rate", str(args.error_rate), "--seed", str(args.seed)
+    ]
+    env = {
+        **os.environ,
+        'BIND_HOST': "127.0.0.1",
+        'BIND_PORT': str(api_port),
+        'OMDB_BASE_URL': f"http://127.0.0.1:{omdb_port}",
+        'OMDB_API_KEY': "load-test",
+        'OMDB_RATE_LIMIT': "1000000",
+        'OMDB_BURST': "1000000",
+        'OMDB_DAILY_QUOTA': "1000000000",
+        'LOG_ACCESS_SAMPLE_RATE': "0",
+        'REFRESH_TOP_N': "0",
+    }
+    if args.no_cache:
+        env.update(
+            CACHE_MEDIA_TTL="0", CACHE_SEARCH_TTL="0", CACHE_NOT_FOUND_TTL="0", CACHE_STALE_TTL="0",
+            SEARCH_INDEX_ENABLED="false"
+        )
+
+    processes = [subprocess.Popen(fake_omdb, cwd=ROOT_PATH)]
+    try:
+        processes.append(subprocess.Popen([sys.executable, "-m", "movie_scrapper_api"], cwd=ROOT_PATH, env=env))
+        url = f"http://127.0.0.1:{api_port}"
+        wait_until_up(f"http://127.0.0.1:{omdb_port}")
+        wait_until_up(f"{url}/api/v1/stats")
+        yield url
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.url:
+        results = asyncio.run(run(args.url, args.concurrency, args.requests, args.warmup, args.seed))
+    else:
+        with serve(args) as url:
+            results = asyncio.run(run(url, args.concurrency, args.requests, args.warmup, args.seed))
+
+    print(f"{'concurrency':>11}{'requests/s':>12}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}")
+    for result in results:
+        print(
+            f"{result.concurrency:>11}{result.throughput:>12,.0f}{result.p50 * 1000:>8.1f}ms"
+            f"{result.p95 * 1000:>8.1f}ms{result.p99 * 1000:>8.1f}ms{result.errors:>8}"
+        )
+    if args.output:
+        args.output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="A running API, instead of starting one in front of the stand-in of OMDB")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=2000, help="requests made at every level of concurrency")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-cache", action="store_true", help="send every request to the stand-in of OMDB")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds every answer of OMDB takes")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0, help="share of the calls to OMDB that fail")
+    parser.add_argument("--output", type=Path, help="A JSON file to write the results to")
+    main(parser.parse_args())
@@ -1,11 +1,23 @@
 import importlib.metadata
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from loguru import logger
 
+from movie_scrapper_api.admission import AdmissionController, AdmissionMiddleware
+from movie_scrapper_api.api.admin import admin_router
+from movie_scrapper_api.api.errors import upstream_error_handler
+from movie_scrapper_api.api.metrics import metrics_router
 from movie_scrapper_api.api.v1.routes import v1_router
 from movie_scrapper_api.config import setup_app_logging, settings
+from movie_scrapper_api.exceptions import UpstreamError
+from movie_scrapper_api.logging import RequestIDMiddleware
+from movie_scrapper_api.metrics import MetricsMiddleware, create_metrics
+from movie_scrapper_api.profiling import ProfilingMiddleware, create_profiler
+from movie_scrapper_api.scrapper import Scrapper
+from movie_scrapper_api.tracing import TracingMiddleware, create_tracer
 
 BASE_PATH = Path(__file__).resolve().parent
 
@@ -25,11 +37,34 @@ tags_metadata = [
     {
         "name": "Media",
         "description": "Functions of the media"
+    },
+    {
+        "name": "Series",
+        "description": "The seasons and the episodes of the series"
+    },
+    {
+        "name": "Stats",
+        "description": "The internal counters of the API"
+    },
+    {
+        "name": "Admin",
+        "description": "The profiler of the requests, with the admin token"
     }
 ]
 
 version = importlib.metadata.version('movie-scrapper-api')
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with Scrapper(config=settings, metrics=app.state.metrics, tracer=app.state.tracer) as scrapper:
+        app.state.scrapper = scrapper
+        yield
+    app.state.metrics.close()
+    app.state.tracer.close()
+    await logger.complete()
+
+
 setup_app_logging(config=settings)
 app = FastAPI(
     title="Movie Scrapper API",
@@ -39,21 +74,48 @@ app = FastAPI(
     swagger_ui_parameters={
         "syntaxHighlight.theme": "monokai"
     },
+    lifespan=lifespan,
 )
 
+app.state.metrics = create_metrics(settings)
+app.state.tracer = create_tracer(settings)
+app.state.profiler = create_profiler(settings)
+app.state.admission = None
+if settings.ADMISSION_MAX_IN_FLIGHT > 0:
+    app.state.admission = AdmissionController(
+        settings.ADMISSION_MAX_IN_FLIGHT,
+        settings.ADMISSION_MAX_QUEUE,
+        settings.ADMISSION_QUEUE_TIMEOUT
+    )
+# Inside the admission control, so that the time a request waits in line is not in its profile.
+if app.state.profiler is not None:
+    app.add_middleware(ProfilingMiddleware, profiler=app.state.profiler, admin_token=settings.ADMIN_TOKEN)
+# Inside the other middlewares, so that the shed requests are logged, measured and have CORS headers.
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=app.state.admission,
+    max_timeout=settings.REQUEST_MAX_TIMEOUT,
+    metrics=app.state.metrics
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=['http://localhost:4200']
 )
 
+if app.state.metrics.enabled:
+    app.add_middleware(MetricsMiddleware, metrics=app.state.metrics)
+app.add_middleware(RequestIDMiddleware)
+# Outside the other middlewares, so that the span of a request holds all of its time.
+if app.state.tracer.enabled:
+    app.add_middleware(TracingMiddleware, tracer=app.state.tracer)
+
+app.add_exception_handler(UpstreamError, upstream_error_handler)
+
 app.include_router(v1_router, prefix="/api/v1")
+app.include_router(metrics_router)
+app.include_router(admin_router, prefix="/admin")
 
 if __name__ == '__main__':
-    import uvicorn
+    from movie_scrapper_api.server import serve
 
-    uvicorn.run(
-        app,
-        host=settings.BIND_HOST,
-        port=settings.BIND_PORT,
-        log_level=settings.LOG_LEVEL,
-    )
+    serve(app, settings)
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from movie_scrapper_api.metrics import Metrics
+from movie_scrapper_api.models.stats import AdmissionStats
+
+# The `time.monotonic()` by which the request being answered must be over, if it has a deadline
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+# The seconds the client is willing to wait for the answer
+TIMEOUT_HEADER = b"x-request-timeout"
+
+# Never shed, so that the API can still be watched while it is overloaded
+EXEMPT_PATHS = ("/metrics", "/api/v1/stats", "/admin", "/docs", "/redoc", "/openapi.json")
+
+
+class AdmissionController:
+    """
+    Admits up to `max_in_flight` requests at the same time in a worker.
+
+    The requests over it wait in line, in the order they arrived, up to `max_queue` of them and
+    for at most `queue_timeout` seconds or until their deadline. The ones that do not fit in the
+    line, or that waited too long, are not admitted, and are meant to be answered at once
+    instead of piling up while their clients give up on them.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.__waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self.__waiters)
+
+    async def acquire(self, deadline: float | None = None) -> bool:
+        """Waits for the request to be admitted, returns whether it was. Admitted requests must be released."""
+        if self.in_flight < self.max_in_flight and not self.__waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self.__waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        timeout = self.queue_timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+        waiter = asyncio.get_running_loop().create_future()
+        self.__waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, max(timeout, 0))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as err:
+            if waiter.done() and not waiter.cancelled():
+                # The request was admitted as it gave up, its place goes to the next one.
+                self.release()
+            elif waiter in self.__waiters:
+                self.__waiters.remove(waiter)
+            if isinstance(err, asyncio.CancelledError):
+                raise
+            self.shed += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        """Ends an admitted request, handing its place to the first one waiting in line, if any."""
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            in_flight=self.in_flight,
+            waiting=self.waiting,
+            admitted=self.admitted,
+            shed=self.shed,
+            timed_out=self.timed_out
+        )
+
+
+class AdmissionMiddleware:
+    """
+    Answers the requests the `AdmissionController` does not admit with `503 Service Unavailable`
+    and `Retry-After`, and cancels the admitted ones that are not over by their deadline. Without
+    a controller, every request is admitted.
+
+    A client sets the deadline of its request with `X-Request-Timeout`, in seconds, up to
+    `max_timeout`. It is kept in `request_deadline` while the request is answered, so that its
+    lookups stop waiting for OMDB by then, and the request is cancelled once it has passed,
+    with every call to OMDB that nobody else waits for. The request is answered with `504
+    Gateway Timeout`, unless its response has already started.
+    """
+
+    def __init__(
+            self,
+            app,
+            controller: AdmissionController | None,
+            max_timeout: float,
+            metrics: Metrics | None = None
+    ):
+        self.app = app
+        self.controller = controller
+        self.max_timeout = max_timeout
+        self.metrics = metrics or Metrics()
+
+    def __deadline(self, scope: dict) -> float | None:
+        header = dict(scope["headers"]).get(TIMEOUT_HEADER)
+        if header is None:
+            return None
+        try:
+            timeout = float(header)
+        except ValueError:
+            return None
+        if not math.isfinite(timeout):
+            return None
+        return time.monotonic() + min(max(timeout, 0), self.max_timeout)
+
+    @staticmethod
+    async def __answer(send, status: int, detail: str, headers: list[tuple[bytes, bytes]]) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        deadline = self.__deadline(scope)
+        if self.controller is not None and not await self.controller.acquire(deadline):
+            self.metrics.request_shed("overloaded")
+            retry_after = str(max(math.ceil(self.controller.queue_timeout), 1)).encode()
+            await self.__answer(send, 503, "The API is overloaded, try again later.", [(b"retry-after", retry_after)])
+            return
+
+        started = False
+
+        async def send_started(message: dict) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        token = request_deadline.set(deadline)
+        try:
+            if deadline is None:
+                await self.app(scope, receive, send_started)
+            else:
+                await asyncio.wait_for(self.app(scope, receive, send_started), max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            if deadline is None or time.monotonic() < deadline:
+                raise
+            if self.controller is not None:
+                self.controller.timed_out += 1
+            self.metrics.request_shed("deadline")
+            if not started:
+                await self.__answer(send, 504, "The request did not finish before its deadline.", [])
+        finally:
+            request_deadline.reset(token)
+            if self.controller is not None:
+                self.controller.release()
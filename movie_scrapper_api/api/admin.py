@@ -0,0 +1,74 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query
+from fastapi.responses import PlainTextResponse
+
+from movie_scrapper_api.api.dependencies import get_profiler
+from movie_scrapper_api.api.routing import route_class
+from movie_scrapper_api.config import settings
+from movie_scrapper_api.models.errors import HTTPError
+from movie_scrapper_api.models.stats import ProfilerStats
+from movie_scrapper_api.profiling import Profiler, is_admin
+
+
+def require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    """Lets only the requests with the admin token through. The endpoints are not served without one."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="The admin token is missing or wrong.")
+
+
+def require_profiler(profiler: Annotated[Profiler | None, Depends(get_profiler)]) -> Profiler:
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="The profiler is not enabled.")
+    return profiler
+
+
+admin_router = APIRouter(route_class=route_class(), dependencies=[Depends(require_admin)])
+
+
+@admin_router.post(
+    "/profile",
+    status_code=200,
+    summary="Profile the next requests",
+    description="Profiles the next `requests` requests of the worker that answers, one at a time. The name of "
+                "the report of every request is in its `X-Profile-Report` header.",
+    response_description="The state of the profiler.",
+    responses={
+        403: {"description": "The admin token is missing or wrong.", "model": HTTPError},
+        404: {"description": "The profiler is not enabled.", "model": HTTPError}
+    },
+    tags=["Admin"]
+)
+async def arm_profiler(
+        profiler: Annotated[Profiler, Depends(require_profiler)],
+        requests: Annotated[int, Query(ge=1, le=100)] = 1
+) -> ProfilerStats:
+    profiler.arm(requests)
+    return profiler.stats()
+
+
+@admin_router.get(
+    "/profiles/{name}",
+    status_code=200,
+    summary="The report of the profiler for a request",
+    response_description="The report, as text.",
+    responses={
+        403: {"description": "The admin token is missing or wrong.", "model": HTTPError},
+        404: {"description": "The report was not found, or the profiler is not enabled.", "model": HTTPError}
+    },
+    response_class=PlainTextResponse,
+    tags=["Admin"]
+)
+async def get_profile(
+        name: Annotated[str, Path()],
+        profiler: Annotated[Profiler, Depends(require_profiler)]
+) -> PlainTextResponse:
+    try:
+        report = profiler.report(name)
+    except ValueError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    if report is None:
+        raise HTTPException(status_code=404, detail="The report was not found.")
+    return PlainTextResponse(report.read_text())
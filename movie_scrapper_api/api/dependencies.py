@@ -0,0 +1,26 @@
+from fastapi import Request
+
+from movie_scrapper_api.admission import AdmissionController
+from movie_scrapper_api.metrics import Metrics
+from movie_scrapper_api.profiling import Profiler
+from movie_scrapper_api.scrapper import Scrapper
+
+
+def get_scrapper(request: Request) -> Scrapper:
+    """Hands out the `Scrapper` owned by the application's lifespan."""
+    return request.app.state.scrapper
+
+
+def get_metrics(request: Request) -> Metrics:
+    """Hands out the metrics of the application."""
+    return request.app.state.metrics
+
+
+def get_admission(request: Request) -> AdmissionController | None:
+    """Hands out the admission control of the application, if it is enabled."""
+    return request.app.state.admission
+
+
+def get_profiler(request: Request) -> Profiler | None:
+    """Hands out the profiler of the requests of the application, if it is enabled."""
+    return request.app.state.profiler
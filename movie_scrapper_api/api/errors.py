@@ -0,0 +1,14 @@
+import math
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from movie_scrapper_api.exceptions import UpstreamError
+
+
+async def upstream_error_handler(request: Request, exc: UpstreamError) -> JSONResponse:
+    """Answers `503 Service Unavailable` when OMDB can not answer, telling when to retry if known."""
+    headers = {}
+    if exc.retry_after is not None:
+        headers["Retry-After"] = str(math.ceil(exc.retry_after))
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
@@ -0,0 +1,29 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from movie_scrapper_api.api.dependencies import get_metrics
+from movie_scrapper_api.api.routing import route_class
+from movie_scrapper_api.metrics import Metrics
+from movie_scrapper_api.models.errors import HTTPError
+
+metrics_router = APIRouter(route_class=route_class())
+
+
+@metrics_router.get(
+    "/metrics",
+    status_code=200,
+    summary="The metrics of the API for Prometheus",
+    response_description="The metrics, in the text format of Prometheus.",
+    responses={
+        404: {"description": "The metrics are not enabled.", "model": HTTPError}
+    },
+    response_class=Response,
+    tags=["Stats"]
+)
+async def get_metrics_text(metrics: Annotated[Metrics, Depends(get_metrics)]) -> Response:
+    rendered = metrics.render()
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="The metrics are not enabled.")
+    content, media_type = rendered
+    return Response(content=content, media_type=media_type)
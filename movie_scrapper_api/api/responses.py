@@ -0,0 +1,29 @@
+from fastapi import Response
+
+from movie_scrapper_api.cache.response import CachedResponse
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether the `If-None-Match` header of a request matches the ETag, with a weak comparison."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def json_response(cached: CachedResponse, if_none_match: str | None = None, max_age: int = 0) -> Response:
+    """
+    Sends the rendered body of a cached answer as is, without serializing its model again.
+
+    The response carries the ETag of the body and may be cached by the clients and the proxies
+    for `max_age` seconds. When the client already has the same body, it gets a `304 Not
+    Modified` without it.
+    """
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={max_age}"
+    }
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
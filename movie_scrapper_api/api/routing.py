@@ -0,0 +1,113 @@
+import inspect
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.dependencies.utils import get_typed_return_annotation
+from fastapi.routing import APIRoute
+from fastapi.utils import create_cloned_field, create_response_field
+
+from movie_scrapper_api.config import settings
+
+
+class DeferredRoute(APIRoute):
+    """
+    A route that builds the pydantic fields of its response models when they are first needed,
+    by its first request or by the OpenAPI schema, instead of when the application is loaded.
+
+    FastAPI builds the fields of the response model and of every documented response of a
+    route as soon as it is declared, and once more when its router is included in the
+    application, which is most of the time the application takes to load once its imports are
+    done. A deferred route only pays it for the routes that are requested.
+
+    It builds the fields with the helpers of FastAPI, and replaces the attributes `APIRoute`
+    sets them in, which are not a public API: it only works with FastAPI 0.101, the version the
+    API depends on, and `tests/test_routing.py` fails when an upgrade changes them.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            endpoint: Callable[..., Any],
+            *,
+            response_model: Any = Default(None),
+            responses: dict[int | str, dict[str, Any]] | None = None,
+            **kwargs
+    ):
+        if isinstance(response_model, DefaultPlaceholder):
+            annotation = get_typed_return_annotation(endpoint)
+            response_model = None if inspect.isclass(annotation) and issubclass(annotation, Response) else annotation
+        responses = responses or {}
+        self.__models = {code: response['model'] for code, response in responses.items() if response.get('model')}
+        self.__fields: tuple | None = None
+
+        super().__init__(
+            path,
+            endpoint,
+            response_model=None,
+            responses={
+                code: {name: value for name, value in response.items() if name != 'model'}
+                for code, response in responses.items()
+            },
+            **kwargs
+        )
+        self.response_model = response_model
+        self.responses = responses
+
+    def __build(self) -> tuple:
+        if self.__fields is None:
+            response_field = cloned_field = None
+            if self.response_model:
+                response_field = create_response_field(
+                    name="Response_" + self.unique_id,
+                    type_=self.response_model,
+                    mode="serialization"
+                )
+                cloned_field = create_cloned_field(response_field)
+            response_fields = {
+                code: create_response_field(name=f"Response_{code}_{self.unique_id}", type_=model)
+                for code, model in self.__models.items()
+            }
+            self.__fields = response_field, cloned_field, response_fields
+        return self.__fields
+
+    # `APIRoute.__init__` sets the fields to none, they are built by `__build` instead.
+    @property
+    def response_field(self):
+        return self.__build()[0]
+
+    @response_field.setter
+    def response_field(self, _value) -> None:
+        pass
+
+    @property
+    def secure_cloned_response_field(self):
+        return self.__build()[1]
+
+    @secure_cloned_response_field.setter
+    def secure_cloned_response_field(self, _value) -> None:
+        pass
+
+    @property
+    def response_fields(self):
+        return self.__build()[2]
+
+    @response_fields.setter
+    def response_fields(self, _value) -> None:
+        pass
+
+    def get_route_handler(self) -> Callable:
+        handler = None
+
+        async def handle(request):
+            nonlocal handler
+            if handler is None:
+                handler = APIRoute.get_route_handler(self)
+            return await handler(request)
+
+        return handle
+
+
+def route_class() -> type[APIRoute]:
+    """The routes of the API, deferred with `FAST_START`."""
+    return DeferredRoute if settings.FAST_START else APIRoute
@@ -1,12 +1,42 @@
-from typing import Annotated
+import os
+from typing import Annotated, AsyncIterator
 
-from fastapi import APIRouter, HTTPException, Query
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 
+from movie_scrapper_api.admission import AdmissionController
+from movie_scrapper_api.api.dependencies import get_admission, get_scrapper
+from movie_scrapper_api.api.responses import etag_matches, json_response
+from movie_scrapper_api.api.routing import route_class
+from movie_scrapper_api.config import settings
+from movie_scrapper_api.exceptions import UpstreamError
+from movie_scrapper_api.models.batch import BatchMediaModel, BatchMediaRequest, BatchMediaResult
 from movie_scrapper_api.models.errors import HTTPError
 from movie_scrapper_api.models.media import MediaModel, SearchModel, GetMediaMode, MediaType, PlotType
+from movie_scrapper_api.models.series import SeasonModel, SeriesModel
+from movie_scrapper_api.models.stats import StatsModel
+from movie_scrapper_api.omdb import dumps
 from movie_scrapper_api.scrapper import Scrapper
 
-v1_router = APIRouter()
+v1_router = APIRouter(route_class=route_class())
+
+
+def media_params(
+        q: str,
+        mode: GetMediaMode,
+        type: MediaType | None = None,
+        year: str | None = None,
+        plot: PlotType = PlotType.Short
+) -> dict:
+    """Builds the OMDB params of a media lookup."""
+    params = {
+        mode.value: q,
+        'plot': plot.value
+    }
+    if type is not None: params['type'] = type.value
+    if year is not None: params['y'] = year
+    return params
 
 
 @v1_router.get(
@@ -15,47 +45,297 @@ v1_router = APIRouter()
     summary="The info of the media that matches the name given",
     response_description="The media.",
     responses={
+        304: {"description": "The media has not changed since the `ETag` given in `If-None-Match`."},
         404: {"description": "A media with this name was not found.", "model": HTTPError},
-        500: {"description": "A server error has occurred."}
+        500: {"description": "A server error has occurred."},
+        503: {"description": "OMDB can not answer right now, retry after `Retry-After` seconds.", "model": HTTPError}
     },
     tags=["Media"]
 )
 async def get_media(
         q: Annotated[str, Query()],
+        scrapper: Annotated[Scrapper, Depends(get_scrapper)],
         mode: Annotated[GetMediaMode, Query()] = GetMediaMode.ID,
         type: Annotated[MediaType | None, Query()] = None,
         year: Annotated[str | None, Query()] = None,
-        plot: Annotated[PlotType, Query()] = PlotType.Short
+        plot: Annotated[PlotType, Query()] = PlotType.Short,
+        if_none_match: Annotated[str | None, Header()] = None
 ) -> MediaModel:
-    scrapper = Scrapper()
     try:
-        params = {
-            mode.value: q,
-            'plot': plot
-        }
-        if type is not None: params['type'] = type.value
-        if year is not None: params['year'] = year
-        media = await scrapper.find_media(params)
+        with scrapper.tracer.span("find_media"):
+            media = await scrapper.find_media_json(media_params(q, mode, type, year, plot))
     except ValueError as err:
         raise HTTPException(status_code=404, detail=str(err))
-    return media
+    with scrapper.tracer.span("respond"):
+        return json_response(media, if_none_match, settings.HTTP_CACHE_MEDIA_MAX_AGE)
+
+
+def batch_result(batch: BatchMediaRequest, index: int, result: MediaModel | Exception) -> BatchMediaResult:
+    query = batch.queries[index]
+    if isinstance(result, ValueError):
+        return BatchMediaResult(index=index, query=query, status=404, error=str(result))
+    if isinstance(result, UpstreamError):
+        return BatchMediaResult(index=index, query=query, status=503, error=str(result))
+    if isinstance(result, httpx.HTTPError):
+        return BatchMediaResult(index=index, query=query, status=502, error="OMDB could not be reached.")
+    return BatchMediaResult(index=index, query=query, status=200, media=result)
+
+
+@v1_router.post(
+    "/media/batch",
+    status_code=200,
+    summary="The info of many media at once",
+    response_description="The result of every query. With `stream`, one result per line as soon as it is found.",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        422: {"description": "The batch is too large.", "model": HTTPError},
+        500: {"description": "A server error has occurred."}
+    },
+    tags=["Media"]
+)
+async def get_media_batch(
+        batch: BatchMediaRequest,
+        scrapper: Annotated[Scrapper, Depends(get_scrapper)],
+        stream: Annotated[bool, Query()] = False
+) -> BatchMediaModel:
+    if len(batch.queries) > settings.BATCH_MAX_SIZE:
+        raise HTTPException(status_code=422, detail=f"A batch can have up to {settings.BATCH_MAX_SIZE} queries.")
+
+    params = [media_params(query, batch.mode, batch.type, plot=batch.plot) for query in batch.queries]
+    results = scrapper.find_many(params)
+
+    if stream:
+        async def lines() -> AsyncIterator[bytes]:
+            async for index, result in results:
+                yield batch_result(batch, index, result).model_dump_json().encode() + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    batch_results = [batch_result(batch, index, result) async for index, result in results]
+    return BatchMediaModel(results=sorted(batch_results, key=lambda result: result.index))
+
+
+@v1_router.get(
+    "/media/{imdb_id}/seasons/{season}",
+    status_code=200,
+    summary="The episodes of a season of a series",
+    description="The episodes of a season of the series with this IMDB ID, and with `details`, the info of "
+                "every episode, found at the same time.",
+    response_description="The season.",
+    responses={
+        304: {"description": "The season has not changed since the `ETag` given in `If-None-Match`."},
+        404: {"description": "A series with this season was not found.", "model": HTTPError},
+        500: {"description": "A server error has occurred."},
+        503: {"description": "OMDB can not answer right now, retry after `Retry-After` seconds.", "model": HTTPError}
+    },
+    tags=["Media", "Series"]
+)
+async def get_season(
+        imdb_id: str,
+        season: Annotated[int, Path(ge=1)],
+        scrapper: Annotated[Scrapper, Depends(get_scrapper)],
+        details: Annotated[bool, Query()] = False,
+        plot: Annotated[PlotType, Query()] = PlotType.Short,
+        if_none_match: Annotated[str | None, Header()] = None
+) -> SeasonModel:
+    try:
+        with scrapper.tracer.span("find_season"):
+            found = await scrapper.find_season_json(imdb_id, season, plot if details else None)
+    except ValueError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    with scrapper.tracer.span("respond"):
+        return json_response(found, if_none_match, settings.HTTP_CACHE_MEDIA_MAX_AGE)
+
+
+@v1_router.get(
+    "/media/{imdb_id}/seasons",
+    status_code=200,
+    summary="Every season of a series",
+    description="The episodes of every season of the series with this IMDB ID, found at the same time, and with "
+                "`details`, the info of every episode. With `stream`, one season per line as soon as it is found.",
+    response_description="The series.",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        304: {"description": "The series has not changed since the `ETag` given in `If-None-Match`."},
+        404: {"description": "A series with this ID was not found.", "model": HTTPError},
+        500: {"description": "A server error has occurred."},
+        503: {"description": "OMDB can not answer right now, retry after `Retry-After` seconds.", "model": HTTPError}
+    },
+    tags=["Media", "Series"]
+)
+async def get_series(
+        imdb_id: str,
+        scrapper: Annotated[Scrapper, Depends(get_scrapper)],
+        details: Annotated[bool, Query()] = False,
+        plot: Annotated[PlotType, Query()] = PlotType.Short,
+        stream: Annotated[bool, Query()] = False,
+        if_none_match: Annotated[str | None, Header()] = None
+) -> SeriesModel:
+    try:
+        if not stream:
+            found = await scrapper.find_series_json(imdb_id, plot if details else None)
+            return json_response(found, if_none_match, settings.HTTP_CACHE_MEDIA_MAX_AGE)
+
+        seasons = scrapper.find_seasons(imdb_id, plot if details else None)
+        # The first season is found before the response starts, so that a missing series is a 404.
+        first = await anext(seasons)
+    except ValueError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+
+    async def lines() -> AsyncIterator[bytes]:
+        yield first.body + b"\n"
+        async for season in seasons:
+            yield season.body + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def search_lines(first: dict, found: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    yield dumps(first) + b"\n"
+    async for media in found:
+        yield dumps(media) + b"\n"
+
+
+async def search_events(first: dict, found: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """The media of a search as server-sent events, ended by an `end` event so that the client does not reconnect."""
+    yield b"data: " + dumps(first) + b"\n\n"
+    async for media in found:
+        yield b"data: " + dumps(media) + b"\n\n"
+    yield b"event: end\ndata: {}\n\n"
+
+
+@v1_router.get(
+    "/poster/{imdb_id}",
+    status_code=200,
+    summary="The poster of the media",
+    description="The poster of the media with this IMDB ID, kept by the API, or with `width`, its thumbnail of "
+                "this width, one of `POSTER_THUMBNAIL_WIDTHS`.",
+    response_description="The poster.",
+    response_class=FileResponse,
+    responses={
+        200: {"content": {"image/jpeg": {}}},
+        304: {"description": "The poster has not changed since the `ETag` given in `If-None-Match`."},
+        404: {"description": "The media or its poster was not found.", "model": HTTPError},
+        422: {"description": "There is no thumbnail of this width.", "model": HTTPError},
+        500: {"description": "A server error has occurred."},
+        503: {"description": "The poster can not be downloaded right now.", "model": HTTPError}
+    },
+    tags=["Media"]
+)
+async def get_poster(
+        imdb_id: str,
+        scrapper: Annotated[Scrapper, Depends(get_scrapper)],
+        width: Annotated[int | None, Query()] = None,
+        if_none_match: Annotated[str | None, Header()] = None
+) -> FileResponse:
+    if scrapper.posters is None:
+        raise HTTPException(status_code=404, detail="The posters are not kept by this API.")
+    if width is not None and width not in settings.poster_thumbnail_widths:
+        raise HTTPException(status_code=422, detail=f"The thumbnails are {settings.poster_thumbnail_widths} wide.")
+    # The poster may be removed by another request or worker between the time it is found and the
+    # time it is sent, it is then found again, once.
+    for _ in range(2):
+        try:
+            path = await scrapper.find_poster(imdb_id, width)
+        except ValueError as err:
+            raise HTTPException(status_code=404, detail=str(err))
+        try:
+            stat_result = os.stat(path)
+            break
+        except FileNotFoundError:
+            continue
+    else:
+        raise HTTPException(status_code=404, detail="The poster was removed before it could be sent.")
+
+    # The file is sent from the disk as it is read, its ETag is the one of its size and time.
+    response = FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": f"public, max-age={settings.HTTP_CACHE_POSTER_MAX_AGE}"},
+        stat_result=stat_result
+    )
+    if etag_matches(if_none_match, response.headers["etag"]):
+        return Response(status_code=304, headers={
+            "ETag": response.headers["etag"],
+            "Cache-Control": response.headers["cache-control"]
+        })
+    return response
 
 
 @v1_router.get(
     "/search/media/{media_name}",
     status_code=200,
     summary="A list media that matches the name given",
+    description="A page of the media that match the name given, or with `aggregate`, the media of its "
+                "first pages merged in a single list ranked by how well their title matches the name. With "
+                "`stream`, every media as soon as its page is found, one per line, or one per event when "
+                "`Accept` is `text/event-stream`, in the order the pages are found.",
     response_description="A list of media.",
     responses={
+        200: {"content": {"application/x-ndjson": {}, "text/event-stream": {}}},
+        304: {"description": "The results have not changed since the `ETag` given in `If-None-Match`."},
         404: {"description": "A media with this name was not found.", "model": HTTPError},
-        500: {"description": "A server error has occurred."}
+        500: {"description": "A server error has occurred."},
+        503: {"description": "OMDB can not answer right now, retry after `Retry-After` seconds.", "model": HTTPError}
     },
     tags=["Media", "Search"]
 )
-async def search_media_by_name(media_name: str) -> SearchModel:
-    scrapper = Scrapper()
+async def search_media_by_name(
+        media_name: str,
+        scrapper: Annotated[Scrapper, Depends(get_scrapper)],
+        page: Annotated[int, Query(ge=1, le=100)] = 1,
+        limit: Annotated[int | None, Query(ge=1)] = None,
+        type: Annotated[MediaType | None, Query()] = None,
+        year: Annotated[str | None, Query()] = None,
+        aggregate: Annotated[int | None, Query(ge=1, le=settings.SEARCH_MAX_PAGES)] = None,
+        stream: Annotated[bool, Query()] = False,
+        if_none_match: Annotated[str | None, Header()] = None,
+        accept: Annotated[str | None, Header()] = None
+) -> SearchModel:
     try:
-        media = await scrapper.search_media(media_name)
+        if stream:
+            found = scrapper.stream_search(
+                media_name, aggregate or 1, type, year, limit, first_page=page if aggregate is None else 1
+            )
+            # The first media is found before the response starts, so that a search without any is a 404.
+            first = await anext(found)
+            if accept is not None and "text/event-stream" in accept:
+                return StreamingResponse(
+                    search_events(first, found), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+                )
+            return StreamingResponse(search_lines(first, found), media_type="application/x-ndjson")
+        with scrapper.tracer.span("search_media", pages=aggregate or 1):
+            if aggregate is None:
+                media = await scrapper.search_media_json(media_name, page, type, year, limit)
+            else:
+                media = await scrapper.search_pages(media_name, aggregate, type, year, limit)
     except ValueError as err:
         raise HTTPException(status_code=404, detail=str(err))
-    return media
+    with scrapper.tracer.span("respond"):
+        return json_response(media, if_none_match, settings.HTTP_CACHE_SEARCH_MAX_AGE)
+
+
+@v1_router.get(
+    "/stats",
+    status_code=200,
+    summary="The counters of the caches and the rate limiter of the API",
+    response_description="The stats.",
+    tags=["Stats"]
+)
+async def get_stats(
+        scrapper: Annotated[Scrapper, Depends(get_scrapper)],
+        admission: Annotated[AdmissionController | None, Depends(get_admission)]
+) -> StatsModel:
+    return StatsModel(
+        cache=await scrapper.cache.stats(),
+        not_found_cache=await scrapper.not_found_cache.stats(),
+        alias_cache=await scrapper.alias_cache.stats(),
+        coalescing=scrapper.flights.stats(),
+        refresh=scrapper.refresher.stats(),
+        rate_limit=scrapper.quota.stats(),
+        upstream=scrapper.upstream_stats(),
+        search_index=scrapper.index.stats() if scrapper.index is not None else None,
+        media_store=await scrapper.store.stats() if scrapper.store is not None else None,
+        posters=scrapper.posters.stats() if scrapper.posters is not None else None,
+        admission=admission.stats() if admission is not None else None
+    )
@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+
+from movie_scrapper_api.models.stats import CacheStats
+
+
+class CacheBackend(ABC):
+    """
+    The storage of the cached answers of OMDB.
+
+    The values are the serialized bytes of the answers, so that every backend can share them
+    between the workers of the API no matter where they live. A backend that can not be reached
+    behaves as an empty cache instead of failing the request.
+    """
+    name: str
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> bytes | None:
+        """Returns the value of the key, or `None` if it is not cached or has expired."""
+        entry = await self.get_with_ttl(key)
+        return entry[0] if entry is not None else None
+
+    @abstractmethod
+    async def get_with_ttl(self, key: str) -> tuple[bytes, float] | None:
+        """Returns the value of the key with the seconds it has left to live, or `None`."""
+
+    @abstractmethod
+    async def ttl(self, key: str) -> float | None:
+        """Returns the seconds the key has left to live, or `None`, without counting a lookup."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Caches the value of the key for `ttl` seconds. A `ttl` of zero does not cache it."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Drops the key from the cache."""
+
+    async def close(self) -> None:
+        """Releases the resources of the backend."""
+
+    def _count(self, entry: tuple[bytes, float] | None) -> tuple[bytes, float] | None:
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def stats(self) -> CacheStats:
+        return CacheStats(backend=self.name, hits=self.hits, misses=self.misses)
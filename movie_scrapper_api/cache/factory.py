@@ -0,0 +1,27 @@
+from movie_scrapper_api.cache.base import CacheBackend
+from movie_scrapper_api.cache.memory import MemoryBackend
+from movie_scrapper_api.config import Settings
+
+
+def create_cache_backend(config: Settings, name: str, max_entries: int) -> CacheBackend:
+    """
+    Creates the cache backend chosen in the settings.
+
+    `name` tells apart the caches that share the same storage: it is the table of the SQLite
+    backend and a part of the key prefix of the Redis backend.
+    """
+    if config.CACHE_BACKEND == "memory":
+        return MemoryBackend(max_entries)
+
+    if config.CACHE_BACKEND == "sqlite":
+        from movie_scrapper_api.cache.sqlite import SQLiteBackend
+        return SQLiteBackend(config.CACHE_SQLITE_PATH, table=name, max_entries=max_entries)
+
+    if config.CACHE_BACKEND == "redis":
+        try:
+            from movie_scrapper_api.cache.redis import RedisBackend
+        except ImportError as err:
+            raise RuntimeError("The redis cache backend requires the redis extra: poetry install -E redis") from err
+        return RedisBackend(config.CACHE_REDIS_URL, prefix=f"{config.CACHE_KEY_PREFIX}{name}:")
+
+    raise ValueError(f"Unknown cache backend {config.CACHE_BACKEND!r}")
@@ -0,0 +1,42 @@
+from urllib.parse import urlencode
+
+NOT_FOUND_ERRORS = ("Movie not found!", "Incorrect IMDb ID.", "Series or season not found!")
+
+MEDIA_PARAMS = ("i", "t", "type", "y", "plot")
+SEARCH_PARAMS = ("s", "type", "y", "page")
+ALIAS_PARAMS = ("t", "type", "y")
+SEASON_PARAMS = ("i", "season")
+
+
+def normalize_params(params: dict, allowed: tuple[str, ...]) -> list[tuple[str, str]]:
+    """
+    Keeps the query params of an OMDB call that change its answer.
+
+    Their values are stripped and lower-cased (OMDB matches them case-insensitively) and they
+    are sorted by name, so the same question asked in a different way is normalized the same.
+    """
+    normalized = {}
+    for name, value in params.items():
+        name = name.lower()
+        if name not in allowed or value is None:
+            continue
+        value = getattr(value, 'value', value)
+        normalized[name] = str(value).strip().lower()
+    return sorted(normalized.items())
+
+
+def media_cache_key(params: dict) -> str:
+    return "media:" + urlencode(normalize_params({'plot': 'short', **params}, MEDIA_PARAMS))
+
+
+def search_cache_key(params: dict) -> str:
+    return "search:" + urlencode(normalize_params(params, SEARCH_PARAMS))
+
+
+def alias_cache_key(title: str, type: str | None = None, year: str | None = None) -> str:
+    """The key of the IMDB ID of the media with this title, and with this type and year when given."""
+    return "alias:" + urlencode(normalize_params({'t': title, 'type': type, 'y': year}, ALIAS_PARAMS))
+
+
+def season_cache_key(params: dict) -> str:
+    return "season:" + urlencode(normalize_params(params, SEASON_PARAMS))
@@ -0,0 +1,118 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+from movie_scrapper_api.cache.base import CacheBackend
+from movie_scrapper_api.models.stats import CacheStats
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    A size-bounded, in-process cache whose entries expire after their own time to live.
+
+    When the cache is full, the least recently used entry is evicted. The counters of hits,
+    misses, evictions and expirations are kept for the stats of the API.
+    """
+    __entries: OrderedDict[Hashable, tuple[float, V]]
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.__clock = clock
+        self.__entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self.__entries.get(key)
+        return entry is not None and entry[0] > self.__clock()
+
+    def get(self, key: Hashable) -> V | None:
+        entry = self.get_with_ttl(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_ttl(self, key: Hashable) -> tuple[V, float] | None:
+        """Returns the value of the key with the seconds it has left to live, or `None`."""
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        ttl = expires_at - self.__clock()
+        if ttl <= 0:
+            del self.__entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return value, ttl
+
+    def ttl(self, key: Hashable) -> float | None:
+        """Returns the seconds the key has left to live, or `None`, without counting a lookup."""
+        entry = self.__entries.get(key)
+        if entry is None or entry[0] <= self.__clock():
+            return None
+        return entry[0] - self.__clock()
+
+    def set(self, key: Hashable, value: V, ttl: float) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        self.__entries[key] = (self.__clock() + ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            backend="memory",
+            entries=len(self.__entries),
+            max_entries=self.max_entries,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations
+        )
+
+
+class MemoryBackend(CacheBackend):
+    """A cache backend that lives in the memory of the worker, see `TTLCache`."""
+    name = "memory"
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.entries: TTLCache[bytes] = TTLCache(max_entries, clock=clock)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes, float] | None:
+        return self.entries.get_with_ttl(key)
+
+    async def ttl(self, key: str) -> float | None:
+        return self.entries.ttl(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self.entries.delete(key)
+
+    async def stats(self) -> CacheStats:
+        return self.entries.stats()
@@ -0,0 +1,56 @@
+from loguru import logger
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+from movie_scrapper_api.cache.base import CacheBackend
+
+
+class RedisBackend(CacheBackend):
+    """
+    A cache backend stored in a server that speaks the Redis protocol, shared by the workers of
+    every node. The server is in charge of the expiration and the eviction of the entries.
+    """
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "", client: redis.Redis | None = None):
+        super().__init__()
+        self.__client = client if client is not None else redis.Redis.from_url(url)
+        self.__prefix = prefix
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes, float] | None:
+        try:
+            async with self.__client.pipeline(transaction=False) as pipeline:
+                value, ttl = await pipeline.get(self.__prefix + key).pttl(self.__prefix + key).execute()
+        except RedisError as err:
+            logger.warning("The Redis cache failed: {}", err)
+            value = None
+        if value is None:
+            return self._count(None)
+        return self._count((value, ttl / 1000 if ttl > 0 else float("inf")))
+
+    async def ttl(self, key: str) -> float | None:
+        try:
+            ttl = await self.__client.pttl(self.__prefix + key)
+        except RedisError as err:
+            logger.warning("The Redis cache failed: {}", err)
+            return None
+        if ttl == -2:
+            return None
+        return ttl / 1000 if ttl > 0 else float("inf")
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        try:
+            await self.__client.set(self.__prefix + key, value, px=max(int(ttl * 1000), 1))
+        except RedisError as err:
+            logger.warning("The Redis cache failed: {}", err)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.__client.delete(self.__prefix + key)
+        except RedisError as err:
+            logger.warning("The Redis cache failed: {}", err)
+
+    async def close(self) -> None:
+        await self.__client.aclose()
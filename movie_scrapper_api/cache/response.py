@@ -0,0 +1,31 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def make_etag(body: bytes) -> str:
+    """A strong ETag of the body, the same in every worker that renders the same body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse(Generic[M]):
+    """
+    An answer of OMDB rendered as the JSON body of the API.
+
+    The body is what the cache stores, so a route can send it as is without validating and
+    serializing a model again. The model is only built by those who ask for it.
+    """
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedResponse[M]":
+        return cls(body=body, etag=make_etag(body))
+
+    def to_model(self, model: type[M]) -> M:
+        return model.model_validate_json(self.body)
@@ -0,0 +1,142 @@
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from movie_scrapper_api.cache.base import CacheBackend
+from movie_scrapper_api.models.stats import CacheStats
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    A cache backend stored in an SQLite database on the disk of the node.
+
+    The database is opened in WAL mode, so every worker of the node can read and write it at the
+    same time. Each backend keeps its entries in its own table. The queries run in a dedicated
+    thread so that they never block the event loop. When the table is over its maximum entries,
+    the entries that expire first are evicted.
+    """
+    name = "sqlite"
+
+    def __init__(
+            self,
+            path: str | Path,
+            table: str,
+            max_entries: int,
+            clock: Callable[[], float] = time.time
+    ):
+        super().__init__()
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.expirations = 0
+        self.__table = table
+        self.__clock = clock
+        self.__sets = 0
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sqlite-cache-{table}")
+        self.__connection = self.__executor.submit(self.__connect, Path(path)).result()
+
+    def __connect(self, path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.__table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {self.__table}_expires_at ON {self.__table} (expires_at)")
+        return connection
+
+    async def __run(self, fn: Callable, *args):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.__executor, fn, *args)
+        except sqlite3.Error as err:
+            logger.warning("The SQLite cache {} failed: {}", self.__table, err)
+            return None
+
+    def __get(self, key: str) -> tuple[bytes, float] | None:
+        row = self.__connection.execute(
+            f"SELECT value, expires_at FROM {self.__table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        ttl = row[1] - self.__clock()
+        if ttl <= 0:
+            self.__connection.execute(f"DELETE FROM {self.__table} WHERE key = ?", (key,))
+            self.expirations += 1
+            return None
+        return row[0], ttl
+
+    def __ttl(self, key: str) -> float | None:
+        row = self.__connection.execute(
+            f"SELECT expires_at FROM {self.__table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] <= self.__clock():
+            return None
+        return row[0] - self.__clock()
+
+    def __set(self, key: str, value: bytes, ttl: float) -> None:
+        self.__connection.execute(
+            f"INSERT OR REPLACE INTO {self.__table} (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, self.__clock() + ttl)
+        )
+        self.__sets += 1
+        if self.__sets % 100 == 0:
+            self.__trim()
+
+    def __trim(self) -> None:
+        expired = self.__connection.execute(
+            f"DELETE FROM {self.__table} WHERE expires_at <= ?", (self.__clock(),)
+        ).rowcount
+        self.expirations += expired
+
+        (entries,) = self.__connection.execute(f"SELECT COUNT(*) FROM {self.__table}").fetchone()
+        if entries > self.max_entries:
+            self.evictions += self.__connection.execute(
+                f"DELETE FROM {self.__table} WHERE key IN "
+                f"(SELECT key FROM {self.__table} ORDER BY expires_at LIMIT ?)",
+                (entries - self.max_entries,)
+            ).rowcount
+
+    def __delete(self, key: str) -> None:
+        self.__connection.execute(f"DELETE FROM {self.__table} WHERE key = ?", (key,))
+
+    def __entries(self) -> int:
+        (entries,) = self.__connection.execute(f"SELECT COUNT(*) FROM {self.__table}").fetchone()
+        return entries
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes, float] | None:
+        return self._count(await self.__run(self.__get, key))
+
+    async def ttl(self, key: str) -> float | None:
+        return await self.__run(self.__ttl, key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        await self.__run(self.__set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.__run(self.__delete, key)
+
+    async def close(self) -> None:
+        await self.__run(self.__connection.close)
+        self.__executor.shutdown(wait=False)
+
+    async def stats(self) -> CacheStats:
+        return CacheStats(
+            backend=self.name,
+            entries=await self.__run(self.__entries),
+            max_entries=self.max_entries,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations
+        )
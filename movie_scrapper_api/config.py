@@ -1,34 +1,180 @@
 import logging
 import sys
+from typing import Literal
 
 from loguru import logger
 from pydantic.v1 import BaseSettings
 
-from movie_scrapper_api.logging import InterceptHandler
+from movie_scrapper_api.logging import InterceptHandler, add_request_id, json_format
 
 
 class Settings(BaseSettings):
     LOG_LEVEL: int = logging.INFO
+    # Write the logs as JSON lines, from a background thread, and keep this share of the access logs
+    LOG_JSON: bool = False
+    LOG_ENQUEUE: bool = False
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0
     BIND_HOST: str = "0.0.0.0"
     BIND_PORT: int = 9101
+    # Processes serving the API, forked once the application is loaded, with uvloop and
+    # httptools when they are installed
+    WORKERS: int = 1
+    SERVER_LOOP: Literal["auto", "asyncio", "uvloop"] = "auto"
+    SERVER_HTTP: Literal["auto", "h11", "httptools"] = "auto"
+    # Seconds the API may take to import and load, see `python -m movie_scrapper_api.startup`
+    STARTUP_BUDGET: float = 2.0
+    # Build the response models of a route on its first request, and the OpenAPI schema and
+    # the documentation on their first request, instead of when the API is loaded (relies on
+    # internals of FastAPI, only works with FastAPI 0.101)
+    FAST_START: bool = False
+    # One or more keys, separated by commas
     OMDB_API_KEY: str
+    # The OMDB API, or a stand-in of it like `tests/fake_omdb.py`
+    OMDB_BASE_URL: str = "https://omdbapi.com"
+
+    # Rate limit and daily quota of every OMDB API key
+    OMDB_RATE_LIMIT: float = 10.0
+    OMDB_BURST: int = 10
+    OMDB_DAILY_QUOTA: int = 1000
+    OMDB_QUEUE_TIMEOUT: float = 5.0
+
+    # Resilience of the calls to OMDB: a deadline for every call, retries of the failed ones,
+    # second calls when the first one is slower than usual and a circuit breaker
+    OMDB_DEADLINE: float = 15.0
+    OMDB_RETRIES: int = 2
+    OMDB_RETRY_BACKOFF: float = 0.2
+    OMDB_RETRY_BACKOFF_MAX: float = 2.0
+    OMDB_HEDGE: bool = False
+    OMDB_HEDGE_PERCENTILE: float = 0.95
+    OMDB_HEDGE_MIN_DELAY: float = 0.05
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIME: float = 30.0
+
+    # Connection pool of the shared OMDB client
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2: bool = False
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+
+    # Cache of the OMDB answers, the times to live are in seconds
+    CACHE_BACKEND: Literal["memory", "sqlite", "redis"] = "memory"
+    CACHE_SQLITE_PATH: str = ".cache/movie-scrapper-api.sqlite3"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "movie-scrapper-api:"
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MEDIA_TTL: float = 24 * 60 * 60
+    CACHE_SEARCH_TTL: float = 60 * 60
+    CACHE_SEASON_TTL: float = 24 * 60 * 60
+    CACHE_NOT_FOUND_MAX_ENTRIES: int = 10000
+    CACHE_NOT_FOUND_TTL: float = 10 * 60
+    # The IMDB IDs of the titles, so that a lookup by title shares the cached answer of its ID
+    CACHE_ALIAS_MAX_ENTRIES: int = 50000
+    CACHE_ALIAS_TTL: float = 7 * 24 * 60 * 60
+
+    # Refreshes of the cached answers in the background
+    CACHE_STALE_TTL: float = 24 * 60 * 60
+    REFRESH_BUDGET: float = 1.0
+    REFRESH_BURST: int = 10
+    REFRESH_TOP_N: int = 100
+    REFRESH_INTERVAL: float = 60
+    REFRESH_MAX_TRACKED: int = 10000
+
+    # Searches of many pages at once
+    SEARCH_MAX_PAGES: int = 10
+    SEARCH_MAX_CONCURRENCY: int = 5
+
+    # Seasons of a series at once, and the lookups of its seasons and episodes made at the same time
+    SERIES_MAX_SEASONS: int = 50
+    SERIES_MAX_CONCURRENCY: int = 10
+
+    # Local index of the titles seen, to answer the searches without OMDB
+    SEARCH_INDEX_ENABLED: bool = False
+    SEARCH_INDEX_PATH: str | None = None
+    SEARCH_INDEX_DUMP: str | None = None
+    SEARCH_INDEX_MAX_PENDING: int = 1000
+    SEARCH_INDEX_MIN_SCORE: float = 0.9
+    SEARCH_INDEX_MIN_RESULTS: int = 10
+    SEARCH_INDEX_MIN_SIMILARITY: float = 0.4
+
+    # Store of the media on the disk, that outlives the restarts (disabled when empty), and the
+    # number of the most used media loaded from it into the cache on startup
+    MEDIA_STORE_PATH: str | None = None
+    MEDIA_STORE_MAX_AGE: float = 24 * 60 * 60
+    MEDIA_STORE_PRELOAD: int = 1000
+
+    # Posters of the media kept on the disk up to a size, with their thumbnails of these widths,
+    # separated by commas (disabled when empty), and revalidated with their server when too old
+    POSTER_CACHE_PATH: str | None = None
+    POSTER_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    POSTER_MAX_AGE: float = 7 * 24 * 60 * 60
+    POSTER_THUMBNAIL_WIDTHS: str = "100"
+
+    # Seconds the clients and the proxies may cache the answers of the API
+    HTTP_CACHE_MEDIA_MAX_AGE: int = 60 * 60
+    HTTP_CACHE_SEARCH_MAX_AGE: int = 5 * 60
+    HTTP_CACHE_POSTER_MAX_AGE: int = 24 * 60 * 60
+
+    # Admission control of every worker: the requests answered at once, and the ones waiting in
+    # line and for how long, before the others are answered with 503 (disabled with 0), and the
+    # most seconds a client may set as the deadline of its request with `X-Request-Timeout`
+    ADMISSION_MAX_IN_FLIGHT: int = 200
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    REQUEST_MAX_TIMEOUT: float = 60.0
+
+    # Metrics for Prometheus at `/metrics`, summed over the workers when the
+    # PROMETHEUS_MULTIPROC_DIR environment variable is set
+    METRICS_ENABLED: bool = False
+
+    # Spans of the stages of the requests, in the format of OpenTelemetry, for this share of the
+    # requests, written as JSON lines to a file, or to the console when it is empty
+    TRACING_ENABLED: bool = False
+    TRACING_PATH: str | None = None
+    TRACING_SAMPLE_RATE: float = 1.0
+
+    # Reports of the profiler for single requests, asked for with `X-Profile` and the admin
+    # token, through `POST /admin/profile`, or for this share of the requests
+    PROFILING_ENABLED: bool = False
+    PROFILER: Literal["cprofile", "pyinstrument"] = "cprofile"
+    PROFILE_PATH: str = ".cache/profiles"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    # The token of the `/admin` endpoints, that are not served without it
+    ADMIN_TOKEN: str | None = None
+
+    # Batches of media
+    BATCH_MAX_SIZE: int = 200
+    BATCH_MAX_CONCURRENCY: int = 10
+
+    @property
+    def omdb_api_keys(self) -> list[str]:
+        return [key.strip() for key in self.OMDB_API_KEY.split(",") if key.strip()]
+
+    @property
+    def poster_thumbnail_widths(self) -> list[int]:
+        return [int(width) for width in self.POSTER_THUMBNAIL_WIDTHS.split(",") if width.strip()]
 
 
 def setup_app_logging(config: Settings) -> None:
-    LOGGERS = ("uvicorn.asgi", "uvicorn.access")
     logging.getLogger().handlers = [InterceptHandler()]
-    for logger_name in LOGGERS:
-        logging_logger = logging.getLogger(logger_name)
-        logging_logger.handlers = [InterceptHandler(level=config.LOG_LEVEL)]
-
-    logger.configure(
-        handlers=[
-            {
-                "sink": sys.stderr,
-                "level": config.LOG_LEVEL
-            }
-        ]
-    )
+    logging.getLogger("uvicorn.asgi").handlers = [InterceptHandler(level=config.LOG_LEVEL)]
+    # Every request is logged by uvicorn.access, so its records are not attributed to their caller.
+    logging.getLogger("uvicorn.access").handlers = [
+        InterceptHandler(level=config.LOG_LEVEL, walk_frames=False, sample_rate=config.LOG_ACCESS_SAMPLE_RATE)
+    ]
+    # Otherwise the records dropped by the sampling would still be logged by the root handler.
+    logging.getLogger("uvicorn.access").propagate = False
+
+    handler = {
+        "sink": sys.stderr,
+        "level": config.LOG_LEVEL,
+        "enqueue": config.LOG_ENQUEUE
+    }
+    if config.LOG_JSON:
+        handler["format"] = json_format
+    logger.configure(handlers=[handler], patcher=add_request_id)
 
 
 settings = Settings()
@@ -0,0 +1,22 @@
+class UpstreamError(Exception):
+    """OMDB can not answer right now. `retry_after` is the number of seconds to wait, if known."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitedError(UpstreamError):
+    """No OMDB API key could be used before the deadline of the request."""
+
+
+class QuotaExceededError(RateLimitedError):
+    """Every OMDB API key has used its daily quota."""
+
+
+class UpstreamFailedError(UpstreamError):
+    """OMDB did not answer in time, could not be reached or answered with an error."""
+
+
+class CircuitOpenError(UpstreamError):
+    """OMDB has failed too many times in a row, so it is not called until it has had time to recover."""
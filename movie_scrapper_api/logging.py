@@ -1,21 +1,46 @@
+import inspect
+import json
 import logging
-from types import FrameType
-from typing import cast
+import random
+import uuid
+from contextvars import ContextVar
 
 from loguru import logger
 
+# The ID of the request being answered, if any
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
 
 class InterceptHandler(logging.Handler):
+    """
+    Sends the records of the standard `logging` to loguru.
+
+    To attribute a record to the code that logged it, the frames of `logging` are walked up,
+    which is too costly for the loggers of every request: with `walk_frames=False` the records
+    are attributed to the handler. With a `sample_rate` under 1, only this share of the records
+    of `uvicorn.access` is kept, but the ones of the failed requests.
+    """
+
+    def __init__(self, level: int | str = logging.NOTSET, walk_frames: bool = True, sample_rate: float = 1.0):
+        super().__init__(level)
+        self.walk_frames = walk_frames
+        self.sample_rate = sample_rate
+
     def emit(self, record: logging.LogRecord):
+        if self.sample_rate < 1 and not is_failed_access(record) and random.random() >= self.sample_rate:
+            return
+
         try:
             level = logger.level(record.levelname).name
         except ValueError:
             level = str(record.levelno)
 
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame = cast(FrameType, frame.f_back)
-            depth += 1
+        depth = 0
+        if self.walk_frames:
+            frame = inspect.currentframe()
+            while frame is not None and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+                frame = frame.f_back
+                depth += 1
 
         logger.opt(
             depth=depth,
@@ -24,3 +49,64 @@ class InterceptHandler(logging.Handler):
             level,
             record.getMessage()
         )
+
+
+def is_failed_access(record: logging.LogRecord) -> bool:
+    """Whether the record is the access log of a request answered with an error."""
+    args = record.args
+    return isinstance(args, tuple) and len(args) == 5 and isinstance(args[4], int) and args[4] >= 400
+
+
+def add_request_id(record: dict) -> None:
+    """A patcher of loguru that adds the ID of the request being answered to the records."""
+    record["extra"]["request_id"] = request_id.get()
+
+
+def json_format(record: dict) -> str:
+    """A format of loguru that writes every record as a line of JSON."""
+    extra = dict(record["extra"])
+    line = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+        "request_id": extra.pop("request_id", None)
+    }
+    extra.pop("json", None)
+    if extra:
+        line["extra"] = extra
+    if record["exception"] is not None:
+        line["exception"] = repr(record["exception"].value)
+    record["extra"]["json"] = json.dumps(line, default=str)
+    return "{extra[json]}\n"
+
+
+class RequestIDMiddleware:
+    """
+    Gives every request an ID, the one of its `X-Request-ID` header if it has one, that is
+    added to the records logged while it is answered and sent back in `X-Request-ID`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = dict(scope["headers"]).get(b"x-request-id", b"")
+        current = header.decode("latin-1") if 0 < len(header) <= 128 else uuid.uuid4().hex
+
+        async def send_request_id(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", current.encode("latin-1"))]
+            await send(message)
+
+        token = request_id.set(current)
+        try:
+            await self.app(scope, receive, send_request_id)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,136 @@
+import asyncio
+import sqlite3
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from movie_scrapper_api.models.stats import MediaStoreStats
+
+# The lookups counted in memory before they are written to the store
+MAX_PENDING_USES = 1000
+
+
+class MediaStore:
+    """
+    The media found in OMDB, kept by IMDB ID and plot in an SQLite database on the disk of the node.
+
+    Unlike the cache, the store outlives the restarts and the deploys of the API. Every media
+    found in OMDB is written to it, and the lookups by IMDB ID are answered from it as long as
+    the media was stored less than `max_age` seconds ago. The lookups of every media are counted,
+    so that the most used ones can be loaded back into the cache when the API starts.
+
+    The database is opened in WAL mode, so that every worker of the node shares it, and the
+    queries run in a dedicated thread so that they never block the event loop. A store that
+    fails behaves as an empty one instead of failing the request.
+    """
+
+    def __init__(self, path: str | Path, max_age: float, clock: Callable[[], float] = time.time):
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.preloaded = 0
+        self.__clock = clock
+        self.__uses: Counter[tuple[str, str]] = Counter()
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-store")
+        self.__connection = self.__executor.submit(self.__connect, Path(path)).result()
+
+    @staticmethod
+    def __connect(path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            "imdb_id TEXT NOT NULL, plot TEXT NOT NULL, body BLOB NOT NULL, stored_at REAL NOT NULL, "
+            "uses INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (imdb_id, plot))"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS media_uses ON media (uses)")
+        return connection
+
+    async def __run(self, fn: Callable, *args):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.__executor, fn, *args)
+        except sqlite3.Error as err:
+            logger.warning("The media store failed: {}", err)
+            return None
+
+    def __get(self, imdb_id: str, plot: str) -> bytes | None:
+        row = self.__connection.execute(
+            "SELECT body FROM media WHERE imdb_id = ? AND plot = ? AND stored_at > ?",
+            (imdb_id, plot, self.__clock() - self.max_age)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def __put(self, imdb_id: str, plot: str, body: bytes) -> None:
+        self.__connection.execute(
+            "INSERT INTO media (imdb_id, plot, body, stored_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (imdb_id, plot) DO UPDATE SET body = excluded.body, stored_at = excluded.stored_at",
+            (imdb_id, plot, body, self.__clock())
+        )
+
+    def __write_uses(self, uses: list[tuple[int, str, str]]) -> None:
+        self.__connection.executemany("UPDATE media SET uses = uses + ? WHERE imdb_id = ? AND plot = ?", uses)
+
+    def __hottest(self, limit: int) -> list[tuple[str, str, bytes, float]]:
+        now = self.__clock()
+        return self.__connection.execute(
+            "SELECT imdb_id, plot, body, stored_at + ? - ? FROM media WHERE stored_at > ? "
+            "ORDER BY uses DESC, stored_at DESC LIMIT ?",
+            (self.max_age, now, now - self.max_age, limit)
+        ).fetchall()
+
+    def __entries(self) -> int:
+        (entries,) = self.__connection.execute("SELECT COUNT(*) FROM media").fetchone()
+        return entries
+
+    async def get(self, imdb_id: str, plot: str) -> bytes | None:
+        """Returns the rendered JSON of the media, or `None` if it is not stored or is too old."""
+        body = await self.__run(self.__get, imdb_id, plot)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def put(self, imdb_id: str, plot: str, body: bytes) -> None:
+        """Stores the rendered JSON of the media, replacing the one stored before, if any."""
+        await self.__run(self.__put, imdb_id, plot, body)
+
+    async def used(self, imdb_id: str, plot: str) -> None:
+        """Counts a lookup of the media. The lookups are written to the store in batches."""
+        self.__uses[imdb_id, plot] += 1
+        if len(self.__uses) >= MAX_PENDING_USES:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Writes the lookups counted since the last time to the store."""
+        uses, self.__uses = self.__uses, Counter()
+        if uses:
+            await self.__run(self.__write_uses, [(count, *media) for media, count in uses.items()])
+
+    async def hottest(self, limit: int) -> list[tuple[str, str, bytes, float]]:
+        """
+        The IMDB ID, the plot and the rendered JSON of the `limit` most used media that are fresh,
+        with the seconds they are still fresh for.
+        """
+        if limit <= 0:
+            return []
+        return await self.__run(self.__hottest, limit) or []
+
+    async def close(self) -> None:
+        await self.flush()
+        await self.__run(self.__connection.close)
+        self.__executor.shutdown(wait=False)
+
+    async def stats(self) -> MediaStoreStats:
+        return MediaStoreStats(
+            entries=await self.__run(self.__entries) or 0,
+            hits=self.hits,
+            misses=self.misses,
+            preloaded=self.preloaded
+        )
@@ -0,0 +1,203 @@
+import os
+import tempfile
+import time
+
+from movie_scrapper_api.config import Settings
+
+# The buckets of the latencies, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    """
+    The metrics of the API, that do nothing unless they are enabled, see `PrometheusMetrics`.
+    """
+    enabled = False
+
+    def request_started(self) -> None:
+        pass
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        pass
+
+    def request_shed(self, reason: str) -> None:
+        pass
+
+    def omdb_started(self) -> None:
+        pass
+
+    def omdb_finished(self, status: str, seconds: float) -> None:
+        pass
+
+    def pool_usage(self, active: int, idle: int) -> None:
+        pass
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        pass
+
+    def render(self) -> tuple[bytes, str] | None:
+        """The metrics in the text format of Prometheus, with its content type, if they are enabled."""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class PrometheusMetrics(Metrics):
+    """
+    The metrics of the API in the format of Prometheus.
+
+    Recording a value only takes an uncontended lock of the metric. When the
+    `PROMETHEUS_MULTIPROC_DIR` environment variable is set, every worker writes its values in
+    its own memory-mapped files in that folder, and `render()` sums the ones of every worker,
+    whichever worker is scraped.
+    """
+    enabled = True
+
+    def __init__(self):
+        from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+        self.registry = CollectorRegistry()
+        self.requests = Histogram(
+            "http_request_duration_seconds",
+            "The latency of the requests to the API",
+            ["method", "route", "status"],
+            buckets=BUCKETS,
+            registry=self.registry
+        )
+        self.requests_in_flight = Gauge(
+            "http_requests_in_flight",
+            "The requests to the API being answered",
+            multiprocess_mode="livesum",
+            registry=self.registry
+        )
+        self.requests_shed = Counter(
+            "http_requests_shed_total",
+            "The requests to the API answered at once, by reason: `overloaded` or `deadline`",
+            ["reason"],
+            registry=self.registry
+        )
+        self.omdb_requests = Histogram(
+            "omdb_request_duration_seconds",
+            "The latency of the calls to OMDB, by HTTP status, `timeout` or `error`",
+            ["status"],
+            buckets=BUCKETS,
+            registry=self.registry
+        )
+        self.omdb_requests_in_flight = Gauge(
+            "omdb_requests_in_flight",
+            "The calls to OMDB waiting for their answer",
+            multiprocess_mode="livesum",
+            registry=self.registry
+        )
+        self.pool_connections = Gauge(
+            "omdb_pool_connections",
+            "The connections of the pools to OMDB, by state",
+            ["state"],
+            multiprocess_mode="livesum",
+            registry=self.registry
+        )
+        self.cache_lookups = Counter(
+            "cache_lookups_total",
+            "The lookups of the caches, by result",
+            ["cache", "result"],
+            registry=self.registry
+        )
+
+    def request_started(self) -> None:
+        self.requests_in_flight.inc()
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        self.requests_in_flight.dec()
+        self.requests.labels(method, route, str(status)).observe(seconds)
+
+    def request_shed(self, reason: str) -> None:
+        self.requests_shed.labels(reason).inc()
+
+    def omdb_started(self) -> None:
+        self.omdb_requests_in_flight.inc()
+
+    def omdb_finished(self, status: str, seconds: float) -> None:
+        self.omdb_requests_in_flight.dec()
+        self.omdb_requests.labels(status).observe(seconds)
+
+    def pool_usage(self, active: int, idle: int) -> None:
+        self.pool_connections.labels("active").set(active)
+        self.pool_connections.labels("idle").set(idle)
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        self.cache_lookups.labels(cache, "hit" if hit else "miss").inc()
+
+    def render(self) -> tuple[bytes, str]:
+        from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
+
+        if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+            return generate_latest(self.registry), CONTENT_TYPE_LATEST
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    def close(self) -> None:
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            from prometheus_client import multiprocess
+            multiprocess.mark_process_dead(os.getpid())
+
+
+def create_metrics(config: Settings) -> Metrics:
+    """
+    Creates the metrics of the API, that are recorded only if they are enabled in the settings.
+
+    With many workers, the metrics of every worker are summed in a temporary folder, unless the
+    `PROMETHEUS_MULTIPROC_DIR` environment variable sets another one.
+    """
+    if not config.METRICS_ENABLED:
+        return Metrics()
+    if config.WORKERS > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        # Before prometheus_client is imported, so that the workers share the folder of their metrics.
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="movie-scrapper-api-metrics-")
+    try:
+        return PrometheusMetrics()
+    except ImportError as err:
+        raise RuntimeError("The metrics require the metrics extra: poetry install -E metrics") from err
+
+
+class MetricsMiddleware:
+    """
+    Records the latency and the status of every request to the API, by route.
+
+    It is a plain ASGI middleware, so that it adds nothing but the recording to every request.
+    The route is the path template of the endpoint that answered, so that the paths with
+    parameters, like a search, are one route.
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+        self.__routes: dict | None = None
+
+    def __route(self, scope: dict) -> str:
+        if self.__routes is None:
+            self.__routes = {
+                route.endpoint: route.path for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+        return self.__routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_status(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.request_started()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            self.metrics.request_finished(scope["method"], self.__route(scope), status, time.perf_counter() - started_at)
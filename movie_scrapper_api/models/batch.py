@@ -0,0 +1,90 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from movie_scrapper_api.models.media import GetMediaMode, MediaModel, MediaType, PlotType
+
+
+class BatchMediaRequest(BaseModel):
+    """
+    The body of `POST /api/v1/media/batch`.
+
+    Fields:
+
+    - **queries**: The IDs (or the titles) of the media to find.
+    - **mode**: Whether the queries are IDs or titles. It is of type `GetMediaMode`.
+    - **type**: The type of the media to find. It is of type `MediaType`.
+    - **plot**: The plot to return for every media. It is of type `PlotType`.
+    """
+    queries: List[str] = Field(
+        title="The Queries",
+        min_length=1,
+        example=["tt0068646", "tt0071562", "tt0436992"],
+        description="The IDs (or the titles) of the media to find"
+    )
+    mode: GetMediaMode = Field(
+        default=GetMediaMode.ID,
+        title="The Mode",
+        example="i",
+        description="Whether the queries are IDs (`i`) or titles (`t`)"
+    )
+    type: Optional[MediaType] = Field(
+        default=None,
+        title="The Type of the Media",
+        example="movie",
+        description="The type of the media to find"
+    )
+    plot: PlotType = Field(
+        default=PlotType.Short,
+        title="The Plot",
+        example="short",
+        description="The plot to return for every media"
+    )
+
+
+class BatchMediaResult(BaseModel):
+    """
+    The result of a single query of a batch.
+
+    Fields:
+
+    - **index**: The position of the query in the batch.
+    - **query**: The query itself.
+    - **status**: The HTTP status the query would have had on `GET /api/v1/media`.
+    - **media**: The media found, if any. It is of type `MediaModel`.
+    - **error**: The reason the media was not found, if it was not.
+    """
+    index: int = Field(
+        title="The Index",
+        example=0,
+        description="The position of the query in the batch"
+    )
+    query: str = Field(
+        title="The Query",
+        example="tt0068646",
+        description="The query itself"
+    )
+    status: int = Field(
+        title="The Status",
+        example=200,
+        description="The HTTP status the query would have had on `GET /api/v1/media`"
+    )
+    media: Optional[MediaModel] = Field(
+        default=None,
+        title="The Media",
+        description="The media found, if any"
+    )
+    error: Optional[str] = Field(
+        default=None,
+        title="The Error",
+        example="Movie not found!",
+        description="The reason the media was not found, if it was not"
+    )
+
+
+class BatchMediaModel(BaseModel):
+    """The return object of `POST /api/v1/media/batch`"""
+    results: List[BatchMediaResult] = Field(
+        title="The Results",
+        description="The result of every query, in the order of the queries"
+    )
@@ -143,7 +143,7 @@ class MediaModel(BaseModel):
         example="Won 4 BAFTA 119 wins & 219 nominations total",
         description="The awards of the media"
     )
-    poster: HttpUrl = Field(
+    poster: Optional[HttpUrl] = Field(
         title="The Post of the Media",
         example="https://m.media-amazon.com/images/M/MV5B"
                 "ZWJhYjFmZDEtNTVlYy00NGExLWJhZWItNTAxODY5YTc3MDFmXkEyXkFqcGdeQXVyMTkxNjUyNQ@@._V1_SX300.jpg",
@@ -319,3 +319,9 @@ class SearchModel(BaseModel):
             ]
         }
     )
+    total_results: Optional[int] = Field(
+        default=None,
+        title="The Total Results",
+        example=21,
+        description="How many media match the title given, on every page"
+    )
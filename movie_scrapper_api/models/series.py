@@ -0,0 +1,120 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from movie_scrapper_api.models.media import MediaModel
+
+
+class EpisodeModel(BaseModel):
+    """
+    An episode of a season of a series.
+
+    Fields:
+
+    - **season**: The season of the episode.
+    - **episode**: The number of the episode in its season.
+    - **title**: The title of the episode.
+    - **released**: The date the episode was first aired.
+    - **imdbID**: The ID given by IMDB.
+    - **imdb_rating**: The rating of the episode in IMDB.
+    - **media**: The info of the episode, when asked for. It is of type `MediaModel`.
+    """
+    season: int = Field(
+        title="The Season",
+        example=1,
+        description="The season of the episode"
+    )
+    episode: int = Field(
+        title="The Episode",
+        example=1,
+        description="The number of the episode in its season"
+    )
+    title: str = Field(
+        title="The Title of the Episode",
+        example="Rose",
+        description="The official title of the episode"
+    )
+    released: str = Field(
+        title="The Release Date of the Episode",
+        example="2005-03-26",
+        description="The date the episode was first aired"
+    )
+    imdbID: str = Field(
+        title="The ID from IMDB",
+        example="tt0562992",
+        description="The ID from the IMDB of the episode"
+    )
+    imdb_rating: str = Field(
+        title="IMDB Rating",
+        example="7.5",
+        description="The rating of the episode in IMDB"
+    )
+    media: Optional[MediaModel] = Field(
+        default=None,
+        title="The Media",
+        description="The info of the episode, with `details`, unless it could not be found"
+    )
+
+
+class SeasonModel(BaseModel):
+    """
+    The return object of `GET /api/v1/media/{imdb_id}/seasons/{season}`.
+
+    Fields:
+
+    - **title**: The title of the series.
+    - **season**: The number of the season.
+    - **total_seasons**: How many seasons the series has.
+    - **episodes**: The episodes of the season. They are of type `EpisodeModel`.
+    """
+    title: str = Field(
+        title="The Title of the Series",
+        example="Doctor Who",
+        description="The official title of the series"
+    )
+    season: int = Field(
+        title="The Season",
+        example=1,
+        description="The number of the season"
+    )
+    total_seasons: int = Field(
+        title="The Total Seasons",
+        example=13,
+        description="How many seasons the series has"
+    )
+    episodes: List[EpisodeModel] = Field(
+        title="The Episodes",
+        description="The episodes of the season, in their order"
+    )
+
+
+class SeriesModel(BaseModel):
+    """
+    The return object of `GET /api/v1/media/{imdb_id}/seasons`.
+
+    Fields:
+
+    - **title**: The title of the series.
+    - **imdbID**: The ID given by IMDB.
+    - **total_seasons**: How many seasons the series has.
+    - **seasons**: The seasons of the series. They are of type `SeasonModel`.
+    """
+    title: str = Field(
+        title="The Title of the Series",
+        example="Doctor Who",
+        description="The official title of the series"
+    )
+    imdbID: str = Field(
+        title="The ID from IMDB",
+        example="tt0436992",
+        description="The ID from the IMDB of the series"
+    )
+    total_seasons: int = Field(
+        title="The Total Seasons",
+        example=13,
+        description="How many seasons the series has"
+    )
+    seasons: List[SeasonModel] = Field(
+        title="The Seasons",
+        description="The seasons of the series, in their order, without the ones OMDB could not find"
+    )
@@ -0,0 +1,511 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    """
+    The counters of a cache.
+
+    Fields:
+
+    - **backend**: The storage of the cache.
+    - **entries**: The number of entries currently cached, if the backend knows it.
+    - **max_entries**: The maximum number of entries of the cache, if the backend has one.
+    - **hits**: How many lookups were answered by the cache.
+    - **misses**: How many lookups were not found in the cache.
+    - **evictions**: How many entries were dropped to make room for new ones, if the backend knows it.
+    - **expirations**: How many entries were dropped because their time to live was over, if the backend
+      knows it.
+
+    The counters are the ones of the worker that answered.
+    """
+    backend: str = Field(
+        title="The Backend",
+        example="memory",
+        description="The storage of the cache"
+    )
+    entries: Optional[int] = Field(
+        default=None,
+        title="The Entries",
+        example=120,
+        description="The number of entries currently cached"
+    )
+    max_entries: Optional[int] = Field(
+        default=None,
+        title="The Maximum Entries",
+        example=10000,
+        description="The maximum number of entries of the cache"
+    )
+    hits: int = Field(
+        title="The Hits",
+        example=1450,
+        description="How many lookups were answered by the cache"
+    )
+    misses: int = Field(
+        title="The Misses",
+        example=130,
+        description="How many lookups were not found in the cache"
+    )
+    evictions: Optional[int] = Field(
+        default=None,
+        title="The Evictions",
+        example=0,
+        description="How many entries were dropped to make room for new ones"
+    )
+    expirations: Optional[int] = Field(
+        default=None,
+        title="The Expirations",
+        example=10,
+        description="How many entries were dropped because their time to live was over"
+    )
+
+
+class SingleFlightStats(BaseModel):
+    """
+    The counters of the coalescing of the identical calls to OMDB.
+
+    Fields:
+
+    - **in_flight**: The number of calls to OMDB currently in flight.
+    - **flights**: How many calls to OMDB were made.
+    - **callers**: How many callers were served by those calls.
+    - **max_callers**: The most callers served by a single call.
+    - **abandoned**: How many calls were cancelled as every caller had given up on them.
+    """
+    in_flight: int = Field(
+        title="The Calls In Flight",
+        example=2,
+        description="The number of calls to OMDB currently in flight"
+    )
+    flights: int = Field(
+        title="The Calls",
+        example=130,
+        description="How many calls to OMDB were made"
+    )
+    callers: int = Field(
+        title="The Callers",
+        example=410,
+        description="How many callers were served by those calls"
+    )
+    max_callers: int = Field(
+        title="The Maximum Callers",
+        example=57,
+        description="The most callers served by a single call"
+    )
+    abandoned: int = Field(
+        default=0,
+        title="The Abandoned Calls",
+        example=3,
+        description="How many calls were cancelled as every caller had given up on them"
+    )
+
+
+class RefreshStats(BaseModel):
+    """
+    The counters of the refreshes of the cached answers in the background.
+
+    Fields:
+
+    - **tracked**: The number of lookups tracked for their popularity.
+    - **in_flight**: The number of refreshes currently in flight.
+    - **revalidations**: How many stale answers were served while being refreshed.
+    - **refreshes**: How many popular answers were refreshed ahead of time.
+    - **skipped**: How many refreshes were skipped because they were over the budget.
+    - **failures**: How many refreshes failed.
+    """
+    tracked: int = Field(
+        title="The Tracked Lookups",
+        example=800,
+        description="The number of lookups tracked for their popularity"
+    )
+    in_flight: int = Field(
+        title="The Refreshes In Flight",
+        example=1,
+        description="The number of refreshes currently in flight"
+    )
+    revalidations: int = Field(
+        title="The Revalidations",
+        example=25,
+        description="How many stale answers were served while being refreshed"
+    )
+    refreshes: int = Field(
+        title="The Refreshes",
+        example=140,
+        description="How many popular answers were refreshed ahead of time"
+    )
+    skipped: int = Field(
+        title="The Skipped Refreshes",
+        example=3,
+        description="How many refreshes were skipped because they were over the budget"
+    )
+    failures: int = Field(
+        title="The Failures",
+        example=0,
+        description="How many refreshes failed"
+    )
+
+
+class APIKeyStats(BaseModel):
+    """
+    The usage of an OMDB API key.
+
+    Fields:
+
+    - **key**: The last characters of the key.
+    - **used_today**: How many calls the key has made today (UTC).
+    - **remaining_today**: How many calls the key can still make today (UTC).
+    - **tokens**: How many calls the key can make right now without waiting.
+    """
+    key: str = Field(
+        title="The Key",
+        example="****1a2b",
+        description="The last characters of the key"
+    )
+    used_today: int = Field(
+        title="The Calls Made Today",
+        example=120,
+        description="How many calls the key has made today (UTC)"
+    )
+    remaining_today: int = Field(
+        title="The Calls Left Today",
+        example=880,
+        description="How many calls the key can still make today (UTC)"
+    )
+    tokens: float = Field(
+        title="The Tokens",
+        example=9.5,
+        description="How many calls the key can make right now without waiting"
+    )
+
+
+class RateLimitStats(BaseModel):
+    """
+    The state of the rate limiter of the calls to OMDB.
+
+    Fields:
+
+    - **keys**: The usage of every OMDB API key. It is a list of `APIKeyStats`.
+    - **waiting**: The number of calls currently waiting in line for a key.
+    - **throttled**: How many calls had to wait in line for a key.
+    - **rejected**: How many calls were rejected because no key could be used in time.
+    """
+    keys: List[APIKeyStats] = Field(
+        title="The Keys",
+        description="The usage of every OMDB API key"
+    )
+    waiting: int = Field(
+        title="The Waiting Calls",
+        example=0,
+        description="The number of calls currently waiting in line for a key"
+    )
+    throttled: int = Field(
+        title="The Throttled Calls",
+        example=12,
+        description="How many calls had to wait in line for a key"
+    )
+    rejected: int = Field(
+        title="The Rejected Calls",
+        example=0,
+        description="How many calls were rejected because no key could be used in time"
+    )
+
+
+class UpstreamStats(BaseModel):
+    """
+    The health of OMDB, as seen by the calls made to it.
+
+    Fields:
+
+    - **circuit**: The state of the circuit breaker, `closed`, `open` or `half_open`.
+    - **consecutive_failures**: The number of calls that have failed in a row.
+    - **trips**: How many times the circuit breaker has opened.
+    - **rejected**: How many calls failed fast because the circuit breaker was open.
+    - **retries**: How many calls were made again after a failure.
+    - **hedges**: How many second calls were made because the first one was slow.
+    - **hedge_wins**: How many of the second calls answered first.
+    - **latency_p50**: The median latency of the last calls, in seconds, if any.
+    - **latency_p95**: The 95th percentile of the latency of the last calls, in seconds, if any.
+    """
+    circuit: str = Field(
+        title="The Circuit",
+        example="closed",
+        description="The state of the circuit breaker"
+    )
+    consecutive_failures: int = Field(
+        title="The Consecutive Failures",
+        example=0,
+        description="The number of calls that have failed in a row"
+    )
+    trips: int = Field(
+        title="The Trips",
+        example=1,
+        description="How many times the circuit breaker has opened"
+    )
+    rejected: int = Field(
+        title="The Rejected Calls",
+        example=0,
+        description="How many calls failed fast because the circuit breaker was open"
+    )
+    retries: int = Field(
+        title="The Retries",
+        example=3,
+        description="How many calls were made again after a failure"
+    )
+    hedges: int = Field(
+        title="The Hedges",
+        example=14,
+        description="How many second calls were made because the first one was slow"
+    )
+    hedge_wins: int = Field(
+        title="The Hedge Wins",
+        example=9,
+        description="How many of the second calls answered first"
+    )
+    latency_p50: Optional[float] = Field(
+        default=None,
+        title="The Median Latency",
+        example=0.18,
+        description="The median latency of the last calls, in seconds"
+    )
+    latency_p95: Optional[float] = Field(
+        default=None,
+        title="The 95th Percentile of the Latency",
+        example=0.61,
+        description="The 95th percentile of the latency of the last calls, in seconds"
+    )
+
+
+class SearchIndexStats(BaseModel):
+    """
+    The counters of the local index of the titles.
+
+    Fields:
+
+    - **entries**: The number of media in the index, of the frozen segment and of the ones added since.
+    - **pending**: The number of media added since the segment was built.
+    - **hits**: How many searches were answered by the index.
+    - **misses**: How many searches were sent to OMDB, as the index was not confident enough.
+    """
+    entries: int = Field(
+        title="The Entries",
+        example=25000,
+        description="The number of media in the index"
+    )
+    pending: int = Field(
+        title="The Pending Entries",
+        example=12,
+        description="The number of media added since the segment was built"
+    )
+    hits: int = Field(
+        title="The Hits",
+        example=830,
+        description="How many searches were answered by the index"
+    )
+    misses: int = Field(
+        title="The Misses",
+        example=95,
+        description="How many searches were sent to OMDB"
+    )
+
+
+class MediaStoreStats(BaseModel):
+    """
+    The counters of the store of the media on the disk of the node.
+
+    Fields:
+
+    - **entries**: The number of media stored, of every worker.
+    - **hits**: How many lookups by IMDB ID were answered by the store.
+    - **misses**: How many lookups by IMDB ID were not found in the store, or were too old.
+    - **preloaded**: How many media were loaded into the cache when the API started.
+    """
+    entries: int = Field(
+        title="The Entries",
+        example=4200,
+        description="The number of media stored"
+    )
+    hits: int = Field(
+        title="The Hits",
+        example=310,
+        description="How many lookups by IMDB ID were answered by the store"
+    )
+    misses: int = Field(
+        title="The Misses",
+        example=45,
+        description="How many lookups by IMDB ID were not found in the store, or were too old"
+    )
+    preloaded: int = Field(
+        title="The Preloaded Media",
+        example=1000,
+        description="How many media were loaded into the cache when the API started"
+    )
+
+
+class PosterCacheStats(BaseModel):
+    """
+    The counters of the cache of the posters on the disk of the node.
+
+    Fields:
+
+    - **entries**: The number of posters kept.
+    - **bytes**: The size of the posters kept, with their thumbnails.
+    - **hits**: How many posters were served from the disk.
+    - **misses**: How many posters were not kept and were downloaded.
+    - **revalidations**: How many posters too old were still the same on their server.
+    - **evictions**: How many posters were removed to keep the cache under its size.
+    """
+    entries: int = Field(
+        title="The Entries",
+        example=850,
+        description="The number of posters kept"
+    )
+    bytes: int = Field(
+        title="The Bytes",
+        example=31457280,
+        description="The size of the posters kept, with their thumbnails"
+    )
+    hits: int = Field(
+        title="The Hits",
+        example=12400,
+        description="How many posters were served from the disk"
+    )
+    misses: int = Field(
+        title="The Misses",
+        example=900,
+        description="How many posters were not kept and were downloaded"
+    )
+    revalidations: int = Field(
+        title="The Revalidations",
+        example=35,
+        description="How many posters too old were still the same on their server"
+    )
+    evictions: int = Field(
+        title="The Evictions",
+        example=50,
+        description="How many posters were removed to keep the cache under its size"
+    )
+
+
+class AdmissionStats(BaseModel):
+    """
+    The counters of the admission control of the requests of the worker.
+
+    Fields:
+
+    - **in_flight**: The number of requests being answered.
+    - **waiting**: The number of requests waiting in line to be answered.
+    - **admitted**: How many requests were answered.
+    - **shed**: How many requests were answered with `503` as the worker was overloaded.
+    - **timed_out**: How many requests were cancelled as they were not over by their deadline.
+    """
+    in_flight: int = Field(
+        title="The Requests In Flight",
+        example=12,
+        description="The number of requests being answered"
+    )
+    waiting: int = Field(
+        title="The Waiting Requests",
+        example=0,
+        description="The number of requests waiting in line to be answered"
+    )
+    admitted: int = Field(
+        title="The Admitted Requests",
+        example=25400,
+        description="How many requests were answered"
+    )
+    shed: int = Field(
+        title="The Shed Requests",
+        example=120,
+        description="How many requests were answered with `503` as the worker was overloaded"
+    )
+    timed_out: int = Field(
+        title="The Timed Out Requests",
+        example=8,
+        description="How many requests were cancelled as they were not over by their deadline"
+    )
+
+
+class ProfilerStats(BaseModel):
+    """
+    The state of the profiler of the requests, the return object of `POST /admin/profile`.
+
+    Fields:
+
+    - **engine**: The profiler used, `cprofile` or `pyinstrument`.
+    - **armed**: How many of the next requests will be profiled.
+    - **profiled**: How many requests were profiled.
+    - **busy**: Whether a request is being profiled.
+    """
+    engine: str = Field(
+        title="The Engine",
+        example="cprofile",
+        description="The profiler used, `cprofile` or `pyinstrument`"
+    )
+    armed: int = Field(
+        title="The Armed Requests",
+        example=1,
+        description="How many of the next requests will be profiled"
+    )
+    profiled: int = Field(
+        title="The Profiled Requests",
+        example=3,
+        description="How many requests were profiled"
+    )
+    busy: bool = Field(
+        title="Busy",
+        example=False,
+        description="Whether a request is being profiled"
+    )
+
+
+class StatsModel(BaseModel):
+    """The return object of `GET /api/v1/stats`"""
+    cache: CacheStats = Field(
+        title="The Response Cache",
+        description="The counters of the cache of the media and the searches found in OMDB"
+    )
+    not_found_cache: CacheStats = Field(
+        title="The Not Found Cache",
+        description="The counters of the cache of the lookups OMDB could not find"
+    )
+    alias_cache: CacheStats = Field(
+        title="The Alias Cache",
+        description="The counters of the cache of the IMDB IDs of the titles"
+    )
+    coalescing: SingleFlightStats = Field(
+        title="The Coalescing",
+        description="The counters of the identical calls to OMDB that were made once"
+    )
+    refresh: RefreshStats = Field(
+        title="The Refreshes",
+        description="The counters of the refreshes of the cached answers in the background"
+    )
+    rate_limit: RateLimitStats = Field(
+        title="The Rate Limit",
+        description="The state of the rate limiter of the calls to OMDB"
+    )
+    upstream: UpstreamStats = Field(
+        title="The Upstream",
+        description="The health of OMDB, as seen by the calls made to it"
+    )
+    search_index: Optional[SearchIndexStats] = Field(
+        default=None,
+        title="The Search Index",
+        description="The counters of the local index of the titles, if it is enabled"
+    )
+    media_store: Optional[MediaStoreStats] = Field(
+        default=None,
+        title="The Media Store",
+        description="The counters of the store of the media on the disk, if it is enabled"
+    )
+    posters: Optional[PosterCacheStats] = Field(
+        default=None,
+        title="The Posters",
+        description="The counters of the cache of the posters on the disk, if it is enabled"
+    )
+    admission: Optional[AdmissionStats] = Field(
+        default=None,
+        title="The Admission Control",
+        description="The counters of the admission control of the requests of the worker, if it is enabled"
+    )
@@ -0,0 +1,158 @@
+import json
+
+from pydantic import HttpUrl, TypeAdapter
+
+from movie_scrapper_api.models.media import MediaModel, MediaType, SearchModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_http_url = TypeAdapter(HttpUrl)
+
+# The media of every page of a search
+PAGE_SIZE = 10
+
+
+def loads(content: bytes) -> dict:
+    """Decodes the raw body of an answer of OMDB, with `orjson` when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps(data: dict) -> bytes:
+    """Encodes a body of the API exactly as pydantic's `model_dump_json` would."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _check(data: dict) -> dict:
+    if "Error" in data:
+        raise ValueError(data['Error'])
+    return data
+
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(',')]
+
+
+def _url(value: str) -> str:
+    return str(_http_url.validate_python(value))
+
+
+def _poster(value: str | None) -> str | None:
+    if not value or value == "N/A":
+        return None
+    return _url(value)
+
+
+def to_search_media(media: dict) -> dict:
+    """Converts a media of a search of OMDB to the JSON of a `SearchMedia`."""
+    return {
+        'title': media['Title'],
+        'year': media['Year'],
+        'imdbID': media['imdbID'],
+        'type': MediaType(media['Type']).value,
+        'poster': _poster(media.get('Poster'))
+    }
+
+
+def render_media(content: bytes) -> bytes:
+    """
+    Renders the raw body of `GET /?i=` or `GET /?t=` as the JSON body of a `MediaModel`.
+
+    The body is built without going through the model: the strings OMDB returns are already
+    of the right type, so only the values that can be wrong are validated, the URLs and the
+    type of the media. Raises `ValueError` with the message of OMDB when it did not find the
+    media.
+    """
+    data = _check(loads(content))
+    media_type = MediaType(data['Type']).value
+
+    return dumps({
+        'title': data['Title'],
+        'year': data['Year'],
+        'rated': data['Rated'],
+        'released': data['Released'],
+        'genres': _split(data['Genre']),
+        'director': data['Director'],
+        'writers': _split(data['Writer']),
+        'actors': _split(data['Actors']),
+        'plot': data['Plot'],
+        'languages': _split(data['Language']),
+        'countries': _split(data['Country']),
+        'awards': data['Awards'],
+        'poster': _poster(data['Poster']),
+        'ratings': [{'source': rating['Source'], 'value': rating['Value']} for rating in data['Ratings']],
+        'imdb': {
+            'rating': data['imdbRating'],
+            'votes': data['imdbVotes'],
+            'id': data['imdbID']
+        },
+        'type': media_type,
+        'embed': _url(f"https://vidsrc.to/embed/{media_type}/{data['imdbID']}")
+    })
+
+
+def render_search(content: bytes) -> bytes:
+    """
+    Renders the raw body of `GET /?s=` as the JSON body of a `SearchModel`, see `render_media`.
+
+    Raises `ValueError` with the message of OMDB when it did not find any media.
+    """
+    data = _check(loads(content))
+
+    return dumps({
+        'search': [to_search_media(media) for media in data['Search']],
+        'total_results': int(data.get('totalResults', len(data['Search'])))
+    })
+
+
+def render_season(content: bytes) -> bytes:
+    """
+    Renders the raw body of `GET /?i=&Season=` as the JSON body of a `SeasonModel`, see
+    `render_media`. The episodes do not have their `media`, they are found on their own.
+
+    Raises `ValueError` with the message of OMDB when it did not find the season.
+    """
+    data = _check(loads(content))
+    season = int(data['Season'])
+    total_seasons = data.get('totalSeasons', "")
+
+    return dumps({
+        'title': data['Title'],
+        'season': season,
+        'total_seasons': int(total_seasons) if total_seasons.isdigit() else season,
+        'episodes': [
+            {
+                'season': season,
+                'episode': int(episode['Episode']),
+                'title': episode['Title'],
+                'released': episode['Released'],
+                'imdbID': episode['imdbID'],
+                'imdb_rating': episode['imdbRating'],
+                'media': None
+            }
+            for episode in data['Episodes']
+        ]
+    })
+
+
+def build_media(body: bytes) -> MediaModel:
+    """
+    Builds the `MediaModel` of a body rendered by `render_media`, as `Scrapper.find_media` does
+    for every lookup, cached or not.
+
+    The body is decoded once and the dict is validated by pydantic-core, which is faster than
+    validating the JSON itself, and than `model_construct`, whose loop over the fields of every
+    model and nested model runs in Python.
+    """
+    return MediaModel.model_validate(loads(body))
+
+
+def build_search(body: bytes) -> SearchModel:
+    """Builds the `SearchModel` of a body rendered by `render_search`, see `build_media`."""
+    return SearchModel.model_validate(loads(body))
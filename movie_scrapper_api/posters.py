@@ -0,0 +1,189 @@
+import asyncio
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from functools import cache
+from io import BytesIO
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from movie_scrapper_api.models.stats import PosterCacheStats
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+IMDB_ID = re.compile(r"tt\d{7,10}")
+
+
+@cache
+def _warn_without_pillow() -> None:
+    """Warns once, not for every cache of the posters, that the thumbnails can not be made."""
+    logger.warning("The thumbnails of the posters require the images extra: poetry install -E images")
+
+
+@dataclass(frozen=True, slots=True)
+class Poster:
+    """A poster kept on the disk, with the validators its server sent, and the bytes of its files."""
+    url: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    size: int
+
+
+class PosterCache:
+    """
+    The posters of the media, kept in a folder on the disk of the node up to `max_bytes`, the
+    least recently used ones being removed first.
+
+    Every poster is written as `<imdbID>.jpg`, with its thumbnails of `widths` as
+    `<imdbID>.<width>.jpg`, made once when it is stored, and the validators its server sent in
+    `<imdbID>.json`, so that a poster older than `max_age` is revalidated with a conditional
+    request instead of being downloaded again. The files are written under a temporary name and
+    renamed, so that they are never served half written, and the posters of the folder are found
+    again when the cache is created, the most recently fetched ones being the most recently used.
+
+    The thumbnails are made with Pillow (`poetry install -E images`). Without it, the poster
+    itself is served for every width.
+    """
+
+    def __init__(
+            self,
+            path: str | Path,
+            max_bytes: int,
+            max_age: float,
+            widths: list[int] | None = None,
+            clock: Callable[[], float] = time.time
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.widths = widths or []
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.__clock = clock
+        self.__posters: OrderedDict[str, Poster] = OrderedDict()
+        self.__bytes = 0
+        if self.widths and Image is None:
+            _warn_without_pillow()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        found = []
+        for meta in self.path.glob("*.json"):
+            try:
+                found.append((meta.stem, Poster(**json.loads(meta.read_text()))))
+            except (OSError, ValueError, TypeError):
+                continue
+        for imdb_id, poster in sorted(found, key=lambda item: item[1].fetched_at):
+            if self.file(imdb_id).exists():
+                self.__posters[imdb_id] = poster
+                self.__bytes += poster.size
+
+    def __len__(self) -> int:
+        return len(self.__posters)
+
+    def file(self, imdb_id: str, width: int | None = None) -> Path:
+        """
+        The file of the poster, or of its thumbnail of this width when there is one, that may not
+        exist. Raises `ValueError` when the IMDB ID is not one, as it is a part of the name.
+        """
+        if not IMDB_ID.fullmatch(imdb_id):
+            raise ValueError(f"{imdb_id!r} is not an IMDB ID.")
+        if width is not None:
+            thumbnail = self.path / f"{imdb_id}.{width}.jpg"
+            if thumbnail.exists():
+                return thumbnail
+        return self.path / f"{imdb_id}.jpg"
+
+    def get(self, imdb_id: str) -> Poster | None:
+        """The poster, fresh or not, as the most recently used one, or `None` if it is not kept."""
+        poster = self.__posters.get(imdb_id)
+        if poster is None or not self.file(imdb_id).exists():
+            # Another worker may have removed it.
+            self.misses += 1
+            return None
+        self.__posters.move_to_end(imdb_id)
+        self.hits += 1
+        return poster
+
+    def is_fresh(self, poster: Poster) -> bool:
+        return self.__clock() - poster.fetched_at < self.max_age
+
+    def __thumbnail(self, content: bytes, width: int) -> bytes:
+        image = Image.open(BytesIO(content))
+        # The height is not bounded, the thumbnail keeps the ratio of the poster.
+        image.thumbnail((width, image.height))
+        thumbnail = BytesIO()
+        image.convert("RGB").save(thumbnail, "JPEG", quality=85, optimize=True)
+        return thumbnail.getvalue()
+
+    def __write(self, name: str, content: bytes) -> int:
+        temporary = self.path / f".{name}.{os.getpid()}.tmp"
+        temporary.write_bytes(content)
+        os.replace(temporary, self.path / name)
+        return len(content)
+
+    def __write_poster(self, imdb_id: str, poster: Poster, content: bytes) -> Poster:
+        size = self.__write(f"{imdb_id}.jpg", content)
+        if Image is not None:
+            for width in self.widths:
+                try:
+                    size += self.__write(f"{imdb_id}.{width}.jpg", self.__thumbnail(content, width))
+                except OSError as err:
+                    logger.warning("The thumbnail {} of the poster of {} could not be made: {}", width, imdb_id, err)
+        poster = replace(poster, size=size)
+        self.__write(f"{imdb_id}.json", json.dumps(asdict(poster)).encode())
+        return poster
+
+    def __remove(self, imdb_id: str) -> None:
+        for file in self.path.glob(f"{imdb_id}.*"):
+            file.unlink(missing_ok=True)
+
+    async def put(
+            self,
+            imdb_id: str,
+            url: str,
+            content: bytes,
+            etag: str | None = None,
+            last_modified: str | None = None
+    ) -> Poster:
+        """Stores the poster and its thumbnails, then removes the least recently used posters over `max_bytes`."""
+        self.file(imdb_id)
+        poster = Poster(url=url, etag=etag, last_modified=last_modified, fetched_at=self.__clock(), size=0)
+        poster = await asyncio.to_thread(self.__write_poster, imdb_id, poster, content)
+
+        previous = self.__posters.pop(imdb_id, None)
+        self.__bytes += poster.size - (previous.size if previous is not None else 0)
+        self.__posters[imdb_id] = poster
+        while self.__bytes > self.max_bytes and len(self.__posters) > 1:
+            evicted, evicted_poster = self.__posters.popitem(last=False)
+            self.__bytes -= evicted_poster.size
+            self.evictions += 1
+            await asyncio.to_thread(self.__remove, evicted)
+        return poster
+
+    async def revalidated(self, imdb_id: str) -> None:
+        """Marks the poster as fetched now, its server having answered that it has not changed."""
+        poster = replace(self.__posters[imdb_id], fetched_at=self.__clock())
+        self.__posters[imdb_id] = poster
+        self.revalidations += 1
+        await asyncio.to_thread(self.__write, f"{imdb_id}.json", json.dumps(asdict(poster)).encode())
+
+    def stats(self) -> PosterCacheStats:
+        return PosterCacheStats(
+            entries=len(self.__posters),
+            bytes=self.__bytes,
+            hits=self.hits,
+            misses=self.misses,
+            revalidations=self.revalidations,
+            evictions=self.evictions
+        )
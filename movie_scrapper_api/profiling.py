@@ -0,0 +1,168 @@
+import asyncio
+import cProfile
+import io
+import pstats
+import random
+import re
+import secrets
+import time
+from pathlib import Path
+from typing import Literal
+
+from loguru import logger
+
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.models.stats import ProfilerStats
+
+# Asks for the report of the profiler for the request, with the admin token
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+# The name of the report of the request, to get from `GET /admin/profiles/{name}`
+REPORT_HEADER = b"x-profile-report"
+
+REPORT_NAME = re.compile(r"profile-\d+-[0-9a-f]{8}\.txt")
+
+
+def is_admin(token: str | bytes | None, admin_token: str | None) -> bool:
+    """Whether the token is the admin token, compared in constant time. Nobody is without an admin token."""
+    if token is None or not admin_token:
+        return False
+    if isinstance(token, str):
+        token = token.encode()
+    return secrets.compare_digest(token, admin_token.encode())
+
+
+class Profiler:
+    """
+    Profiles single requests and writes a text report of each to the folder `path`.
+
+    A request is profiled when it asks for it, when the profiler has been armed for the next
+    requests with `arm()`, or for a share `sample_rate` of the requests, but never while
+    another one is: the profilers of Python record the whole thread, so the report of a
+    request also shows the ones answered at the same time.
+
+    The `cprofile` engine counts every call, with the profiler of the standard library. The
+    `pyinstrument` engine samples the stack instead, which slows the request much less, and
+    follows it across its awaits (`poetry install -E profiling`).
+    """
+
+    def __init__(
+            self,
+            path: str | Path,
+            engine: Literal["cprofile", "pyinstrument"] = "cprofile",
+            sample_rate: float = 0.0
+    ):
+        self.path = Path(path)
+        self.engine = engine
+        self.sample_rate = sample_rate
+        self.armed = 0
+        self.profiled = 0
+        self.busy = False
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def arm(self, requests: int = 1) -> None:
+        """Profiles the next `requests` requests, one at a time."""
+        self.armed = requests
+
+    def should_profile(self, requested: bool = False) -> bool:
+        if self.busy:
+            return False
+        if self.armed > 0:
+            self.armed -= 1
+            return True
+        return requested or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def stats(self) -> ProfilerStats:
+        return ProfilerStats(engine=self.engine, armed=self.armed, profiled=self.profiled, busy=self.busy)
+
+    def report(self, name: str) -> Path | None:
+        """The file of the report, if it exists. Raises `ValueError` when the name is not the one of a report."""
+        if not REPORT_NAME.fullmatch(name):
+            raise ValueError(f"{name!r} is not the name of a report.")
+        file = self.path / name
+        return file if file.exists() else None
+
+    def start(self) -> tuple[str, object]:
+        """Starts profiling a request, returns the name of its report and the running profiler."""
+        self.busy = True
+        name = f"profile-{time.time_ns() // 1_000_000}-{secrets.token_hex(4)}.txt"
+        if self.engine == "pyinstrument":
+            from pyinstrument import Profiler as Pyinstrument
+
+            profile = Pyinstrument(async_mode="enabled")
+            profile.start()
+        else:
+            profile = cProfile.Profile()
+            profile.enable()
+        return name, profile
+
+    async def stop(self, name: str, profile, title: str) -> None:
+        """Stops profiling the request and writes its report."""
+        try:
+            if self.engine == "pyinstrument":
+                profile.stop()
+                text = profile.output_text(unicode=True)
+            else:
+                profile.disable()
+                stream = io.StringIO()
+                pstats.Stats(profile, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+                text = stream.getvalue()
+        finally:
+            self.busy = False
+        self.profiled += 1
+        await asyncio.to_thread((self.path / name).write_text, f"{title}\n\n{text}")
+        logger.info("The profile of {} is in {}", title, self.path / name)
+
+
+def create_profiler(config: Settings) -> Profiler | None:
+    """Creates the profiler of the requests, if it is enabled in the settings."""
+    if not config.PROFILING_ENABLED:
+        return None
+    if config.PROFILER == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError as err:
+            raise RuntimeError(
+                "The pyinstrument profiler requires the profiling extra: poetry install -E profiling"
+            ) from err
+    return Profiler(config.PROFILE_PATH, config.PROFILER, config.PROFILE_SAMPLE_RATE)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests the `Profiler` picks, and names their report in `X-Profile-Report`.
+
+    A client asks for the report of its request with `X-Profile` and the admin token in
+    `X-Admin-Token`, so that nobody else can slow the API down with the profiler. The report is
+    written once the request is over, and is read with `GET /admin/profiles/{name}`.
+    """
+
+    def __init__(self, app, profiler: Profiler, admin_token: str | None = None):
+        self.app = app
+        self.profiler = profiler
+        self.admin_token = admin_token
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith("/admin"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        requested = PROFILE_HEADER in headers and is_admin(headers.get(ADMIN_TOKEN_HEADER), self.admin_token)
+        if not self.profiler.should_profile(requested):
+            await self.app(scope, receive, send)
+            return
+
+        name, profile = self.profiler.start()
+
+        async def send_report(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (REPORT_HEADER, name.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_report)
+        finally:
+            query = scope.get("query_string", b"").decode()
+            title = f"{scope['method']} {scope['path']}" + (f"?{query}" if query else "")
+            await self.profiler.stop(name, profile, title)
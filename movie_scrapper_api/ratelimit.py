@@ -0,0 +1,172 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+from movie_scrapper_api.exceptions import QuotaExceededError, RateLimitedError
+from movie_scrapper_api.models.stats import APIKeyStats, RateLimitStats
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def seconds_until_tomorrow() -> float:
+    now = datetime.now(timezone.utc)
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return (tomorrow - now).total_seconds()
+
+
+class TokenBucket:
+    """
+    A token bucket that holds up to `burst` tokens and is refilled by `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.__clock = clock
+        self.__tokens = float(burst)
+        self.__updated_at = clock()
+
+    @property
+    def tokens(self) -> float:
+        self.__refill()
+        return self.__tokens
+
+    def __refill(self) -> None:
+        now = self.__clock()
+        self.__tokens = min(self.burst, self.__tokens + (now - self.__updated_at) * self.rate)
+        self.__updated_at = now
+
+    def try_acquire(self) -> bool:
+        self.__refill()
+        if self.__tokens < 1:
+            return False
+        self.__tokens -= 1
+        return True
+
+    def wait_time(self) -> float:
+        """The seconds until the next token."""
+        self.__refill()
+        if self.__tokens >= 1:
+            return 0
+        if self.rate <= 0:
+            return float("inf")
+        return (1 - self.__tokens) / self.rate
+
+
+class APIKey:
+    """An OMDB API key with its own rate limit and daily quota."""
+
+    def __init__(self, key: str, bucket: TokenBucket, daily_quota: int):
+        self.key = key
+        self.bucket = bucket
+        self.daily_quota = daily_quota
+        self.used = 0
+        self.day: date | None = None
+        self.exhausted = False
+
+    def remaining(self, today: date) -> int:
+        if self.day != today:
+            self.day, self.used, self.exhausted = today, 0, False
+        if self.exhausted:
+            return 0
+        return max(self.daily_quota - self.used, 0)
+
+    def stats(self, today: date) -> APIKeyStats:
+        return APIKeyStats(
+            key="****" + self.key[-4:],
+            used_today=self.used if self.day == today else 0,
+            remaining_today=self.remaining(today),
+            tokens=round(self.bucket.tokens, 2)
+        )
+
+
+class QuotaManager:
+    """
+    Spreads the calls to OMDB over the API keys, within their rate limits and daily quotas.
+
+    Every key has a token bucket of `rate` calls per second, up to `burst` at once, and can make
+    `daily_quota` calls per UTC day. A call takes the key with the most quota left that has a
+    token. When no key has one, the call waits in line for the next token, unless that takes
+    longer than `queue_timeout` seconds (or the deadline of the request), in which case it is
+    rejected with `RateLimitedError`. When every key has used its quota, the call is rejected
+    at once with `QuotaExceededError`. The quotas are counted by every worker on its own.
+    """
+
+    def __init__(
+            self,
+            keys: list[str],
+            rate: float,
+            burst: int,
+            daily_quota: int,
+            queue_timeout: float,
+            clock: Callable[[], float] = time.monotonic,
+            today: Callable[[], date] = utc_today
+    ):
+        if not keys:
+            raise ValueError("At least one OMDB API key is required")
+        self.keys = [APIKey(key, TokenBucket(rate, burst, clock=clock), daily_quota) for key in keys]
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.__clock = clock
+        self.__today = today
+
+    async def acquire(self, deadline: float | None = None) -> str:
+        """
+        Returns the API key to use for a call to OMDB.
+
+        `deadline` is the `time.monotonic()` by which the call must have been made.
+        """
+        timeout = self.__clock() + self.queue_timeout
+        deadline = timeout if deadline is None else min(deadline, timeout)
+        throttled = False
+        while True:
+            today = self.__today()
+            keys = sorted(
+                (key for key in self.keys if key.remaining(today) > 0),
+                key=lambda key: key.remaining(today),
+                reverse=True
+            )
+            if not keys:
+                self.rejected += 1
+                raise QuotaExceededError("The daily quota of OMDB has been reached.", seconds_until_tomorrow())
+
+            for key in keys:
+                if key.bucket.try_acquire():
+                    key.used += 1
+                    return key.key
+
+            wait = min(key.bucket.wait_time() for key in keys)
+            if self.__clock() + wait > deadline:
+                self.rejected += 1
+                raise RateLimitedError("Too many requests to OMDB, try again later.", wait)
+
+            if not throttled:
+                throttled = True
+                self.throttled += 1
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.waiting -= 1
+
+    def exhaust(self, key: str) -> None:
+        """Marks the key as out of quota for the rest of the day, e.g. when OMDB has refused it."""
+        today = self.__today()
+        for api_key in self.keys:
+            if api_key.key == key:
+                api_key.remaining(today)
+                api_key.exhausted = True
+
+    def stats(self) -> RateLimitStats:
+        today = self.__today()
+        return RateLimitStats(
+            keys=[key.stats(today) for key in self.keys],
+            waiting=self.waiting,
+            throttled=self.throttled,
+            rejected=self.rejected
+        )
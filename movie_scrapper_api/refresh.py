@@ -0,0 +1,135 @@
+import asyncio
+import contextvars
+import heapq
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable
+
+from loguru import logger
+
+from movie_scrapper_api.cache.base import CacheBackend
+from movie_scrapper_api.models.stats import RefreshStats
+from movie_scrapper_api.ratelimit import TokenBucket
+
+Refresh = Callable[[], Awaitable]
+
+
+class Refresher:
+    """
+    Keeps the cached answers of the popular lookups fresh.
+
+    Every lookup is tracked with the way to refresh it. A cached answer that is past its time
+    to live, but still in its stale window, is served as is while it is refreshed in the
+    background (stale-while-revalidate). Every `interval` seconds, the `top_n` most requested
+    lookups that would go stale before the next round are refreshed ahead of time. All the
+    refreshes share the same budget, a `TokenBucket` of refreshes.
+    """
+    __refreshes: OrderedDict[Hashable, Refresh]
+    __scores: dict[Hashable, float]
+    __tasks: dict[Hashable, asyncio.Task]
+
+    def __init__(
+            self,
+            cache: CacheBackend,
+            budget: TokenBucket,
+            stale_ttl: float,
+            top_n: int,
+            interval: float,
+            max_tracked: int
+    ):
+        self.cache = cache
+        self.budget = budget
+        self.stale_ttl = stale_ttl
+        self.top_n = top_n
+        self.interval = interval
+        self.max_tracked = max_tracked
+        self.revalidations = 0
+        self.refreshes = 0
+        self.skipped = 0
+        self.failures = 0
+        self.__refreshes = OrderedDict()
+        self.__scores = {}
+        self.__tasks = {}
+        self.__scheduler: asyncio.Task | None = None
+
+    def track(self, key: Hashable, refresh: Refresh) -> None:
+        """Counts a lookup of the key, remembering how to refresh it."""
+        self.__refreshes[key] = refresh
+        self.__refreshes.move_to_end(key)
+        self.__scores[key] = self.__scores.get(key, 0) + 1
+        while len(self.__refreshes) > self.max_tracked:
+            forgotten, _ = self.__refreshes.popitem(last=False)
+            self.__scores.pop(forgotten, None)
+
+    def is_stale(self, ttl: float) -> bool:
+        """Whether an entry with `ttl` seconds left to live is past its own time to live."""
+        return ttl <= self.stale_ttl
+
+    def revalidate(self, key: Hashable) -> None:
+        """Refreshes a stale key in the background, if the budget allows it."""
+        if self.__refresh(key):
+            self.revalidations += 1
+
+    def __refresh(self, key: Hashable) -> bool:
+        refresh = self.__refreshes.get(key)
+        if refresh is None or key in self.__tasks:
+            return False
+        if not self.budget.try_acquire():
+            self.skipped += 1
+            return False
+
+        # Not in the context of the lookup that asked for it, with the deadline of its request.
+        task = contextvars.Context().run(asyncio.ensure_future, refresh())
+        self.__tasks[key] = task
+        task.add_done_callback(lambda _: self.__refreshed(key, task))
+        return True
+
+    def __refreshed(self, key: Hashable, task: asyncio.Task) -> None:
+        del self.__tasks[key]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.failures += 1
+            logger.warning("The refresh of a cached answer failed: {!r}", task.exception())
+
+    async def refresh_hot(self) -> None:
+        """Refreshes the most requested keys that would go stale before the next round."""
+        hot = heapq.nlargest(self.top_n, self.__scores, key=self.__scores.__getitem__)
+        for key in hot:
+            ttl = await self.cache.ttl(key)
+            if ttl is not None and ttl - self.stale_ttl <= self.interval and self.__refresh(key):
+                self.refreshes += 1
+
+        # Halve the scores, so that the popularity follows the recent lookups.
+        for key in list(self.__scores):
+            self.__scores[key] /= 2
+
+    async def __schedule(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_hot()
+            except Exception:
+                logger.exception("The refresh of the hot keys failed")
+
+    def start(self) -> None:
+        if self.top_n > 0 and self.__scheduler is None:
+            self.__scheduler = asyncio.ensure_future(self.__schedule())
+
+    async def stop(self) -> None:
+        tasks = list(self.__tasks.values())
+        if self.__scheduler is not None:
+            tasks.append(self.__scheduler)
+            self.__scheduler = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> RefreshStats:
+        return RefreshStats(
+            tracked=len(self.__refreshes),
+            in_flight=len(self.__tasks),
+            revalidations=self.revalidations,
+            refreshes=self.refreshes,
+            skipped=self.skipped,
+            failures=self.failures
+        )
@@ -0,0 +1,83 @@
+import random
+import time
+from collections import deque
+from typing import Callable
+
+from movie_scrapper_api.exceptions import CircuitOpenError
+
+# The latencies needed before the hedging delay is known
+MIN_SAMPLES = 20
+
+
+def backoff(attempt: int, base: float, cap: float) -> float:
+    """The seconds to wait before the retry `attempt + 1`, with full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Stops calling OMDB after `failure_threshold` failures in a row (`0` disables it).
+
+    While the circuit is open, the calls fail fast with `CircuitOpenError`. Every
+    `recovery_time` seconds, a single call is let through to probe OMDB: the circuit is closed
+    again when it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_time: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.__clock = clock
+        self.__opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.__opened_at is None:
+            return "closed"
+        if self.__clock() - self.__opened_at >= self.recovery_time:
+            return "half_open"
+        return "open"
+
+    def check(self) -> None:
+        """Raises `CircuitOpenError` if OMDB must not be called now."""
+        if self.__opened_at is None:
+            return
+        waited = self.__clock() - self.__opened_at
+        if waited >= self.recovery_time:
+            # Let this call probe OMDB, and hold the others until the next probe.
+            self.__opened_at = self.__clock()
+            return
+        self.rejected += 1
+        raise CircuitOpenError("OMDB is unavailable, try again later.", self.recovery_time - waited)
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.__opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if 0 < self.failure_threshold <= self.failures:
+            if self.__opened_at is None:
+                self.trips += 1
+            self.__opened_at = self.__clock()
+
+
+class LatencyTracker:
+    """Keeps the latencies of the last `window` calls to OMDB, to know their percentiles."""
+
+    def __init__(self, window: int = 1000):
+        self.__latencies: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self.__latencies)
+
+    def observe(self, latency: float) -> None:
+        self.__latencies.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        if not self.__latencies:
+            return None
+        latencies = sorted(self.__latencies)
+        return latencies[min(int(percentile * len(latencies)), len(latencies) - 1)]
@@ -1,84 +1,847 @@
+import asyncio
+import itertools
+import math
+import time
+from contextlib import aclosing
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator
+
 import httpx
+from loguru import logger
+
+from movie_scrapper_api.admission import request_deadline
+from movie_scrapper_api.cache.base import CacheBackend
+from movie_scrapper_api.cache.factory import create_cache_backend
+from movie_scrapper_api.cache.keys import (
+    MEDIA_PARAMS,
+    NOT_FOUND_ERRORS,
+    alias_cache_key,
+    media_cache_key,
+    normalize_params,
+    search_cache_key,
+    season_cache_key
+)
+from movie_scrapper_api.cache.response import CachedResponse
+from movie_scrapper_api.config import Settings, settings
+from movie_scrapper_api.exceptions import QuotaExceededError, UpstreamError, UpstreamFailedError
+from movie_scrapper_api.metrics import Metrics
+from movie_scrapper_api.models.media import MediaModel, MediaType, PlotType, SearchModel
+from movie_scrapper_api.models.series import SeasonModel, SeriesModel
+from movie_scrapper_api.models.stats import UpstreamStats
+from movie_scrapper_api.omdb import (
+    PAGE_SIZE,
+    build_media,
+    build_search,
+    dumps,
+    loads,
+    render_media,
+    render_search,
+    render_season
+)
+from movie_scrapper_api.ratelimit import QuotaManager, TokenBucket
+from movie_scrapper_api.refresh import Refresher
+from movie_scrapper_api.resilience import MIN_SAMPLES, CircuitBreaker, LatencyTracker, backoff
+from movie_scrapper_api.search_index import TitleIndex, normalize_title, score, to_index_entry
+from movie_scrapper_api.singleflight import SingleFlight
+from movie_scrapper_api.tracing import Tracer
+
+if TYPE_CHECKING:
+    from movie_scrapper_api.media_store import MediaStore
+    from movie_scrapper_api.posters import Poster, PosterCache
 
-from movie_scrapper_api.config import settings
-from movie_scrapper_api.models.media import MediaModel, SearchModel
+KEY_ERRORS = ("Request limit reached!", "Invalid API key!")
 
 
 class Scrapper:
+    """
+    The client of the OMDB API.
+
+    A single instance is meant to be shared by the whole application, as it owns a pooled
+    `httpx.AsyncClient` that keeps the connections to OMDB alive between requests. Close it
+    with `aclose()` (or use it as an async context manager) when the application shuts down.
+
+    The media and the searches found are cached as JSON in the cache backend of the settings,
+    and so are the lookups OMDB could not find, for the time to live set in the settings.
+    The IMDB ID of every title found is remembered, so that a lookup by title is answered
+    as the lookup by its ID, sharing its cached answer.
+    Every media found is added to the local index of the titles, that answers the searches
+    it is confident about without calling OMDB. With a media store, every media found is also
+    stored on the disk, the lookups by IMDB ID are answered from it while it is fresh, and the
+    most used media are loaded from it into the cache when the scrapper starts. The posters of
+    the media are downloaded with the same client and kept on the disk, with their thumbnails.
+
+    Every call to OMDB has a deadline. The calls that fail are made again after a jittered
+    backoff, and with `OMDB_HEDGE`, a second call is made when the first one is slower than
+    the usual ones. After too many failures in a row, the circuit breaker fails the calls fast
+    until OMDB has had time to recover, while the cached answers are still served. The calls
+    made for a request with a deadline, see `AdmissionMiddleware`, end by then too; a call shared
+    by many requests ends by the deadline of the one that made it.
+
+    With a tracer, the stages of every lookup are recorded as spans: the lookups of the caches,
+    the calls to OMDB, the rendering of their answers and the validation of the models.
+    """
     __client: httpx.AsyncClient
+    __config: Settings
+    cache: CacheBackend
+    not_found_cache: CacheBackend
+    alias_cache: CacheBackend
+    flights: SingleFlight
+    refresher: Refresher
+    quota: QuotaManager
+    breaker: CircuitBreaker
+    latency: LatencyTracker
+    metrics: Metrics
+    tracer: Tracer
+    index: TitleIndex | None
+    store: "MediaStore | None"
+    posters: "PosterCache | None"
 
-    def __init__(self):
+    def __init__(
+            self,
+            config: Settings | None = None,
+            transport: httpx.AsyncBaseTransport | None = None,
+            cache: CacheBackend | None = None,
+            not_found_cache: CacheBackend | None = None,
+            alias_cache: CacheBackend | None = None,
+            metrics: Metrics | None = None,
+            tracer: Tracer | None = None
+    ):
+        self.__config = config or settings
+        self.metrics = metrics or Metrics()
+        self.tracer = tracer or Tracer()
+        self.quota = QuotaManager(
+            self.__config.omdb_api_keys,
+            rate=self.__config.OMDB_RATE_LIMIT,
+            burst=self.__config.OMDB_BURST,
+            daily_quota=self.__config.OMDB_DAILY_QUOTA,
+            queue_timeout=self.__config.OMDB_QUEUE_TIMEOUT
+        )
+        self.breaker = CircuitBreaker(
+            self.__config.CIRCUIT_FAILURE_THRESHOLD,
+            self.__config.CIRCUIT_RECOVERY_TIME
+        )
+        self.latency = LatencyTracker()
+        self.__retries = 0
+        self.__hedges = 0
+        self.__hedge_wins = 0
         self.__client = httpx.AsyncClient(
-            base_url="https://omdbapi.com"
+            base_url=self.__config.OMDB_BASE_URL,
+            limits=httpx.Limits(
+                max_connections=self.__config.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.__config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.__config.HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                self.__config.HTTP_READ_TIMEOUT,
+                connect=self.__config.HTTP_CONNECT_TIMEOUT,
+                pool=self.__config.HTTP_POOL_TIMEOUT
+            ),
+            http2=self.__config.HTTP2,
+            transport=transport
+        )
+        self.__owned_caches = []
+        if cache is None:
+            cache = create_cache_backend(self.__config, "responses", self.__config.CACHE_MAX_ENTRIES)
+            self.__owned_caches.append(cache)
+        if not_found_cache is None:
+            not_found_cache = create_cache_backend(
+                self.__config, "not_found", self.__config.CACHE_NOT_FOUND_MAX_ENTRIES
+            )
+            self.__owned_caches.append(not_found_cache)
+        if alias_cache is None:
+            alias_cache = create_cache_backend(self.__config, "aliases", self.__config.CACHE_ALIAS_MAX_ENTRIES)
+            self.__owned_caches.append(alias_cache)
+        self.cache = cache
+        self.not_found_cache = not_found_cache
+        self.alias_cache = alias_cache
+        self.flights = SingleFlight()
+        self.refresher = Refresher(
+            self.cache,
+            TokenBucket(self.__config.REFRESH_BUDGET, self.__config.REFRESH_BURST),
+            stale_ttl=self.__config.CACHE_STALE_TTL,
+            top_n=self.__config.REFRESH_TOP_N,
+            interval=self.__config.REFRESH_INTERVAL,
+            max_tracked=self.__config.REFRESH_MAX_TRACKED
         )
+        self.index = None
+        if self.__config.SEARCH_INDEX_ENABLED:
+            self.index = TitleIndex(
+                self.__config.SEARCH_INDEX_PATH,
+                max_pending=self.__config.SEARCH_INDEX_MAX_PENDING,
+                min_score=self.__config.SEARCH_INDEX_MIN_SCORE,
+                min_results=self.__config.SEARCH_INDEX_MIN_RESULTS,
+                min_similarity=self.__config.SEARCH_INDEX_MIN_SIMILARITY
+            )
+        self.store = None
+        if self.__config.MEDIA_STORE_PATH:
+            from movie_scrapper_api.media_store import MediaStore
+            self.store = MediaStore(self.__config.MEDIA_STORE_PATH, self.__config.MEDIA_STORE_MAX_AGE)
+        self.posters = None
+        if self.__config.POSTER_CACHE_PATH:
+            from movie_scrapper_api.posters import PosterCache
+            self.posters = PosterCache(
+                self.__config.POSTER_CACHE_PATH,
+                max_bytes=self.__config.POSTER_CACHE_MAX_BYTES,
+                max_age=self.__config.POSTER_MAX_AGE,
+                widths=self.__config.poster_thumbnail_widths
+            )
+
+    async def __aenter__(self) -> "Scrapper":
+        if self.index is not None and self.__config.SEARCH_INDEX_DUMP and not len(self.index):
+            await self.index.load_dump(self.__config.SEARCH_INDEX_DUMP)
+        await self.preload()
+        self.refresher.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__client.is_closed
+
+    async def aclose(self) -> None:
+        """
+        Stops the refreshes, writes the index of the titles and closes the pooled connections to
+        OMDB, the media store and the caches it has created.
+        """
+        await self.refresher.stop()
+        if self.index is not None:
+            await self.index.close()
+        if self.store is not None:
+            await self.store.close()
+        await self.__client.aclose()
+        for cache in self.__owned_caches:
+            await cache.close()
+
+    async def preload(self) -> int:
+        """
+        Loads the `MEDIA_STORE_PRELOAD` most used media of the store into the cache, so that the
+        lookups by IMDB ID are answered from the cache right after a restart. Every media is
+        cached only for the time it is still fresh in the store, then it is stale and refreshed
+        from OMDB like any other. Returns how many media were loaded.
+        """
+        if self.store is None or self.__config.CACHE_MEDIA_TTL <= 0:
+            return 0
+
+        started_at = time.monotonic()
+        hottest = await self.store.hottest(self.__config.MEDIA_STORE_PRELOAD)
+        for imdb_id, plot, body, fresh_for in hottest:
+            key = media_cache_key({'i': imdb_id, 'plot': plot})
+            ttl = min(fresh_for, self.__config.CACHE_MEDIA_TTL)
+            await self.cache.set(key, body, ttl + self.__config.CACHE_STALE_TTL)
+        self.store.preloaded += len(hottest)
+        logger.info("Preloaded {} media from the store in {:.2f}s", len(hottest), time.monotonic() - started_at)
+        return len(hottest)
 
     async def find_media(self, params: dict) -> MediaModel:
-        params['apiKey'] = settings.OMDB_API_KEY
-        response = await self.__client.get(
-            "",
-            params=params
+        found = await self.find_media_json(params)
+        with self.tracer.span("validate", model="MediaModel"):
+            return build_media(found.body)
+
+    async def find_media_json(self, params: dict) -> CachedResponse[MediaModel]:
+        """
+        Finds the media as its rendered JSON body, that a route can send without serializing it.
+
+        A lookup by title whose IMDB ID is known is made by that ID instead, so that both share
+        the same cached answer.
+        """
+        if 'i' not in params:
+            alias = alias_cache_key(params.get('t', ''), params.get('type'), params.get('y'))
+            with self.tracer.span("cache.get", cache="aliases") as span:
+                imdb_id = await self.alias_cache.get(alias)
+                span.set_attribute("cache.hit", imdb_id is not None)
+            self.metrics.cache_lookup("aliases", imdb_id is not None)
+            if imdb_id is None:
+                return await self.__find_by_title(params)
+            params = {'i': imdb_id.decode(), 'plot': params.get('plot', 'short')}
+
+        key = media_cache_key(params)
+        found = await self.__cached(
+            key, self.__config.CACHE_MEDIA_TTL, self.__fetch_media, params,
+            refresh=partial(self.__fetch_media, from_store=False)
+        )
+        stored = self.__stored_media(params)
+        if stored is not None:
+            await self.store.used(*stored)
+        return found
+
+    async def find_many(
+            self,
+            params: list[dict],
+            concurrency: int | None = None
+    ) -> AsyncIterator[tuple[int, MediaModel | Exception]]:
+        """
+        Finds many media at once, with at most `concurrency` lookups running at the same time.
+
+        Yields the index of every lookup together with its media, or the error that prevented
+        finding it, in the order they complete.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.__config.BATCH_MAX_CONCURRENCY)
+
+        async def find(index: int, media_params: dict) -> tuple[int, MediaModel | Exception]:
+            async with semaphore:
+                try:
+                    return index, await self.find_media(media_params)
+                except (ValueError, UpstreamError, httpx.HTTPError) as err:
+                    return index, err
+
+        tasks = [asyncio.ensure_future(find(index, media_params)) for index, media_params in enumerate(params)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def search_media(
+            self,
+            media_name: str,
+            page: int = 1,
+            type: MediaType | None = None,
+            year: str | None = None,
+            limit: int | None = None
+    ) -> SearchModel:
+        found = await self.search_media_json(media_name, page, type, year, limit)
+        with self.tracer.span("validate", model="SearchModel"):
+            return build_search(found.body)
+
+    async def search_media_json(
+            self,
+            media_name: str,
+            page: int = 1,
+            type: MediaType | None = None,
+            year: str | None = None,
+            limit: int | None = None
+    ) -> CachedResponse[SearchModel]:
+        """
+        Searches a page of the media as the rendered JSON body, that a route can send without
+        serializing it. Every page is cached on its own, and only its first `limit` media are kept.
+
+        A first page that is not cached is answered by the index of the titles when it is confident
+        it knows the answer, before calling OMDB. Its answers are not cached, they are only the
+        media the index has seen, and the answers of OMDB cached for the same search are the ones
+        of OMDB.
+        """
+        params = {'s': media_name}
+        if page != 1: params['page'] = str(page)
+        if type is not None: params['type'] = type.value
+        if year is not None: params['y'] = year
+        key = search_cache_key(params)
+        found = await self.__cached(
+            key, self.__config.CACHE_SEARCH_TTL, self.__fetch_search, params,
+            answer=partial(self.__indexed_search, params)
         )
+        if limit is None:
+            return found
+
+        data = loads(found.body)
+        if len(data['search']) <= limit:
+            return found
+        return CachedResponse.from_body(dumps({**data, 'search': data['search'][:limit]}))
+
+    async def search_pages(
+            self,
+            media_name: str,
+            pages: int,
+            type: MediaType | None = None,
+            year: str | None = None,
+            limit: int | None = None,
+            concurrency: int | None = None
+    ) -> CachedResponse[SearchModel]:
+        """
+        Searches the first `pages` pages of the media and merges them in a single list, without
+        the media found twice, ranked by how well their title matches the name.
+
+        The first page tells how many pages there are, then the others are searched at the same
+        time, with at most `concurrency` of them at once. The pages after the last one are empty.
+        """
+        first = loads((await self.search_media_json(media_name, 1, type, year)).body)
+        total = first.get('total_results')
+        if total is not None:
+            pages = min(pages, math.ceil(total / PAGE_SIZE))
+        semaphore = asyncio.Semaphore(concurrency or self.__config.SEARCH_MAX_CONCURRENCY)
+
+        async def search_page(page: int) -> list[dict]:
+            async with semaphore:
+                try:
+                    return loads((await self.search_media_json(media_name, page, type, year)).body)['search']
+                except ValueError:
+                    return []
+
+        found = {}
+        for search in [first['search'], *await asyncio.gather(*map(search_page, range(2, pages + 1)))]:
+            for media in search:
+                found.setdefault(media['imdbID'], media)
+
+        # The sort is stable, so the media that match as well keep the order of OMDB.
+        text = normalize_title(media_name)
+        ranked = sorted(found.values(), key=lambda media: -score(text, normalize_title(media['title']), 0))
+        return CachedResponse.from_body(dumps({'search': ranked[:limit], 'total_results': total}))
+
+    async def stream_search(
+            self,
+            media_name: str,
+            pages: int = 1,
+            type: MediaType | None = None,
+            year: str | None = None,
+            limit: int | None = None,
+            first_page: int = 1,
+            concurrency: int | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        Searches `pages` pages of the media from `first_page` on, and yields every media, as the
+        JSON of a `SearchMedia`, as soon as its page is found, without the media found twice,
+        until `limit` media.
+
+        Unlike `search_pages`, the media are neither kept nor ranked: the ones of the first page
+        are yielded before the other pages are searched, and the ones of the other pages, searched
+        at the same time, in the order the pages are found.
+        """
+        found = set()
+        async with aclosing(self.__searched_media(media_name, first_page, pages, type, year, concurrency)) as searched:
+            async for media in searched:
+                if media['imdbID'] in found:
+                    continue
+                found.add(media['imdbID'])
+                yield media
+                if limit is not None and len(found) >= limit:
+                    return
+
+    async def __searched_media(
+            self,
+            media_name: str,
+            first_page: int,
+            pages: int,
+            type: MediaType | None,
+            year: str | None,
+            concurrency: int | None
+    ) -> AsyncIterator[dict]:
+        """The media of the pages of a search, see `stream_search`, with the ones found twice."""
+        first = loads((await self.search_media_json(media_name, first_page, type, year)).body)
+        for media in first['search']:
+            yield media
+
+        last = first_page + pages - 1
+        if first.get('total_results') is not None:
+            last = min(last, math.ceil(first['total_results'] / PAGE_SIZE))
+        semaphore = asyncio.Semaphore(concurrency or self.__config.SEARCH_MAX_CONCURRENCY)
+
+        async def search_page(page: int) -> list[dict]:
+            async with semaphore:
+                try:
+                    return loads((await self.search_media_json(media_name, page, type, year)).body)['search']
+                except ValueError:
+                    return []
 
-        media_data = response.json()
-        if "Error" in media_data:
-            raise ValueError(media_data['Error'])
-
-        ratings = []
-        for rating in media_data['Ratings']:
-            ratings.append(
-                {
-                    'source': rating['Source'],
-                    'value': rating['Value']
-                }
+        tasks = [asyncio.ensure_future(search_page(page)) for page in range(first_page + 1, last + 1)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                for media in await task:
+                    yield media
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def find_season_json(
+            self,
+            imdb_id: str,
+            season: int,
+            details: PlotType | None = None,
+            concurrency: int | None = None
+    ) -> CachedResponse[SeasonModel]:
+        """
+        Finds a season of a series as the rendered JSON body, that a route can send without
+        serializing it. Every season is cached on its own.
+
+        With `details`, the media of every episode is found too, with this plot, with at most
+        `concurrency` lookups running at the same time. The episodes are cached as any other media.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.__config.SERIES_MAX_CONCURRENCY)
+        return await self.__find_season(imdb_id, season, details, semaphore)
+
+    async def find_seasons(
+            self,
+            imdb_id: str,
+            details: PlotType | None = None,
+            concurrency: int | None = None
+    ) -> AsyncIterator[CachedResponse[SeasonModel]]:
+        """
+        Finds every season of a series, up to `SERIES_MAX_SEASONS`, see `find_season_json`, and
+        yields them in the order they are found.
+
+        The first season tells how many there are, then the others are found at the same time.
+        The seasons and the episodes of the series share the same `concurrency` lookups. The
+        seasons after the first one that OMDB can not find are skipped.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.__config.SERIES_MAX_CONCURRENCY)
+        first = await self.__find_season(imdb_id, 1, details, semaphore)
+        yield first
+
+        async def find(season: int) -> CachedResponse[SeasonModel] | None:
+            try:
+                return await self.__find_season(imdb_id, season, details, semaphore)
+            except ValueError:
+                return None
+
+        total = min(loads(first.body)['total_seasons'], self.__config.SERIES_MAX_SEASONS)
+        tasks = [asyncio.ensure_future(find(season)) for season in range(2, total + 1)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                found = await task
+                if found is not None:
+                    yield found
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def find_series_json(
+            self,
+            imdb_id: str,
+            details: PlotType | None = None,
+            concurrency: int | None = None
+    ) -> CachedResponse[SeriesModel]:
+        """Finds every season of a series, see `find_seasons`, in a single body, in their order."""
+        seasons = [loads(season.body) async for season in self.find_seasons(imdb_id, details, concurrency)]
+        seasons.sort(key=lambda season: season['season'])
+        return CachedResponse.from_body(dumps({
+            'title': seasons[0]['title'],
+            'imdbID': imdb_id,
+            'total_seasons': seasons[0]['total_seasons'],
+            'seasons': seasons
+        }))
+
+    async def __find_season(
+            self,
+            imdb_id: str,
+            season: int,
+            details: PlotType | None,
+            semaphore: asyncio.Semaphore
+    ) -> CachedResponse[SeasonModel]:
+        params = {'i': imdb_id, 'Season': str(season)}
+        async with semaphore:
+            found = await self.__cached(
+                season_cache_key(params), self.__config.CACHE_SEASON_TTL, self.__fetch_season, params
             )
+        if details is None:
+            return found
+
+        async def find_episode(episode: dict) -> dict:
+            # The episodes not aired yet may not have an IMDB ID.
+            if not episode['imdbID'].startswith("tt"):
+                return episode
+            async with semaphore:
+                try:
+                    media = await self.find_media_json({'i': episode['imdbID'], 'plot': details.value})
+                except (ValueError, UpstreamError, httpx.HTTPError):
+                    return episode
+            return {**episode, 'media': loads(media.body)}
+
+        data = loads(found.body)
+        episodes = await asyncio.gather(*map(find_episode, data['episodes']))
+        return CachedResponse.from_body(dumps({**data, 'episodes': episodes}))
+
+    async def find_poster(self, imdb_id: str, width: int | None = None) -> Path:
+        """
+        The file of the poster of the media, or of its thumbnail of this width, downloaded from
+        the URL of the media with the pooled client when it is not kept on the disk yet.
 
-        return MediaModel.model_validate({
-            'title': media_data['Title'],
-            'year': media_data['Year'],
-            'rated': media_data['Rated'],
-            'released': media_data['Released'],
-            'runtime': media_data['Runtime'],
-            'genres': [genre.strip() for genre in media_data['Genre'].split(',')],
-            'director': media_data['Director'],
-            'writers': [writer.strip() for writer in media_data['Writer'].split(',')],
-            'actors': [actor.strip() for actor in media_data['Actors'].split(',')],
-            'plot': media_data['Plot'],
-            'languages': [language.strip() for language in media_data['Language'].split(',')],
-            'countries': [country.strip() for country in media_data['Country'].split(',')],
-            'awards': media_data['Awards'],
-            'poster': media_data['Poster'],
-            'ratings': ratings,
-            'imdb': {
-                'rating': media_data['imdbRating'],
-                'votes': media_data['imdbVotes'],
-                'id': media_data['imdbID']
-            },
-            'type': media_data['Type'],
-            'embed': f"https://vidsrc.to/embed/{media_data['Type']}/{media_data['imdbID']}"
-        })
-
-    async def search_media(self, media_name: str) -> SearchModel:
-        response = await self.__client.get(
-            "",
-            params={
-                "apikey": settings.OMDB_API_KEY,
-                "s": media_name
-            }
+        A poster older than `POSTER_MAX_AGE` is revalidated with a conditional request, and is
+        still served when its server can not be reached. Raises `ValueError` when the media or its
+        poster can not be found.
+        """
+        poster = self.posters.get(imdb_id)
+        if poster is None or not self.posters.is_fresh(poster):
+            await self.__shared(f"poster:{imdb_id}", self.__fetch_poster, imdb_id, poster)
+        return self.posters.file(imdb_id, width)
+
+    async def __fetch_poster(self, imdb_id: str, poster: "Poster | None") -> None:
+        if poster is not None:
+            url = poster.url
+        else:
+            url = loads((await self.find_media_json({'i': imdb_id})).body)['poster']
+            if url is None:
+                raise ValueError("The media has no poster.")
+
+        headers = {}
+        if poster is not None and poster.etag:
+            headers['If-None-Match'] = poster.etag
+        if poster is not None and poster.last_modified:
+            headers['If-Modified-Since'] = poster.last_modified
+        try:
+            response = await self.__client.get(url, headers=headers)
+        except httpx.HTTPError as err:
+            if poster is not None:
+                logger.warning("The poster of {} could not be revalidated: {}", imdb_id, err)
+                return
+            raise UpstreamFailedError("The server of the poster could not be reached.") from err
+
+        if response.status_code == 304 and poster is not None:
+            await self.posters.revalidated(imdb_id)
+        elif response.status_code == 200 and response.headers.get('content-type', '').startswith("image/"):
+            await self.posters.put(
+                imdb_id, url, response.content, response.headers.get('etag'), response.headers.get('last-modified')
+            )
+        elif poster is None and response.status_code == 404:
+            raise ValueError("The poster was not found.")
+        elif poster is None:
+            raise UpstreamFailedError(f"The server of the poster answered with an error ({response.status_code}).")
+
+    async def __cached(self, key: str, ttl: float, fetch, *args, refresh=None, answer=None) -> CachedResponse:
+        """
+        The cached answer of the key, or the one `fetch` finds, cached for `ttl` seconds. The
+        refreshes of the answer in the background find it with `refresh`, `fetch` by default.
+        When the key is not cached, `answer` may answer it without `fetch`, and is not cached.
+        """
+        self.refresher.track(
+            key, partial(self.flights.do, key, self.__fetch_and_cache, key, ttl, refresh or fetch, *args)
         )
 
-        media_data = response.json()
-        if "Error" in media_data:
-            raise ValueError(media_data['Error'])
-
-        search_data = []
-        for media in media_data['Search']:
-            search_data.append({
-                "title": media['Title'],
-                "year": media["Year"],
-                "imdbID": media["imdbID"],
-                "type": media["Type"],
-                "poster": media["Poster"] if media['Poster'] != "N/A" else None
-            })
-        return SearchModel.model_validate({
-            "search": search_data
-        })
+        with self.tracer.span("cache.get", cache="responses") as span:
+            cached = await self.cache.get_with_ttl(key)
+            span.set_attribute("cache.hit", cached is not None)
+        self.metrics.cache_lookup("responses", cached is not None)
+        if cached is not None:
+            body, ttl_left = cached
+            if self.refresher.is_stale(ttl_left):
+                self.refresher.revalidate(key)
+            return CachedResponse.from_body(body)
+
+        with self.tracer.span("cache.get", cache="not_found") as span:
+            error = await self.not_found_cache.get(key)
+            span.set_attribute("cache.hit", error is not None)
+        self.metrics.cache_lookup("not_found", error is not None)
+        if error is not None:
+            raise ValueError(error.decode())
+
+        found = answer() if answer is not None else None
+        if found is not None:
+            return found
+        with self.tracer.span("fetch", key=key):
+            return await self.__shared(key, self.__fetch_and_cache, key, ttl, fetch, *args)
+
+    async def __find_by_title(self, params: dict) -> CachedResponse[MediaModel]:
+        key = media_cache_key(params)
+        error = await self.not_found_cache.get(key)
+        self.metrics.cache_lookup("not_found", error is not None)
+        if error is not None:
+            raise ValueError(error.decode())
+
+        # The answer is cached under the IMDB ID of the media by `__fetch_title`, not under the title.
+        return await self.__shared(key, self.__fetch_and_cache, key, 0, self.__fetch_title, params)
+
+    async def __shared(self, key: str, fetch, *args):
+        """
+        Waits for the call of the key shared by the identical lookups, until the deadline of the
+        request when it has one. The call itself is not bound to the deadline of any request, as
+        the other lookups that share it may wait longer, and is cancelled once none of them waits.
+        """
+        deadline = request_deadline.get()
+        if deadline is None:
+            return await self.flights.do(key, fetch, *args)
+        return await asyncio.wait_for(self.flights.do(key, fetch, *args), max(deadline - time.monotonic(), 0))
+
+    async def __fetch_and_cache(self, key: str, ttl: float, fetch, *args) -> CachedResponse:
+        try:
+            result = CachedResponse.from_body(await fetch(*args))
+        except ValueError as err:
+            if str(err) in NOT_FOUND_ERRORS:
+                await self.not_found_cache.set(key, str(err).encode(), self.__config.CACHE_NOT_FOUND_TTL)
+            raise
+
+        if ttl > 0:
+            await self.cache.set(key, result.body, ttl + self.__config.CACHE_STALE_TTL)
+        return result
+
+    async def __get(self, params: dict) -> bytes:
+        """
+        Calls OMDB before the deadline of the call, making it again after a jittered backoff when
+        it fails, as long as the circuit breaker lets it through. The deadlines of the requests are
+        not the ones of OMDB: they end the wait of their lookups, not the call, nor count as failures.
+        """
+        deadline = time.monotonic() + self.__config.OMDB_DEADLINE
+        for attempt in itertools.count():
+            self.breaker.check()
+            try:
+                content = await self.__hedged(params, deadline)
+            except UpstreamFailedError:
+                self.breaker.record_failure()
+                delay = backoff(attempt, self.__config.OMDB_RETRY_BACKOFF, self.__config.OMDB_RETRY_BACKOFF_MAX)
+                if attempt >= self.__config.OMDB_RETRIES or time.monotonic() + delay >= deadline:
+                    raise
+                self.__retries += 1
+                await asyncio.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return content
+
+    def __hedge_delay(self) -> float | None:
+        if not self.__config.OMDB_HEDGE or len(self.latency) < MIN_SAMPLES:
+            return None
+        return max(self.latency.percentile(self.__config.OMDB_HEDGE_PERCENTILE), self.__config.OMDB_HEDGE_MIN_DELAY)
+
+    async def __hedged(self, params: dict, deadline: float) -> bytes:
+        """Makes a second call when the first one is slower than usual, and takes the first answer."""
+        first = asyncio.ensure_future(self.__call(params, deadline))
+        tasks = {first}
+        try:
+            delay = self.__hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self.__hedges += 1
+                    # The second call does not wait in line for a key, the first one already does.
+                    tasks.add(asyncio.ensure_future(self.__call(params, deadline, hedge=True)))
+
+            errors = {}
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.__hedge_wins += 1
+                        return task.result()
+                    errors[task] = task.exception()
+            raise errors.get(first) or next(iter(errors.values()))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __call(self, params: dict, deadline: float, hedge: bool = False) -> bytes:
+        """Calls OMDB with the first API key available, moving to the next one if OMDB refuses it."""
+        for _ in self.quota.keys:
+            key = await self.quota.acquire(time.monotonic() if hedge else deadline)
+            started_at = time.monotonic()
+            status = "error"
+            self.metrics.omdb_started()
+            with self.tracer.span("omdb.call", hedge=hedge) as span:
+                try:
+                    response = await asyncio.wait_for(
+                        self.__client.get("", params={**params, 'apikey': key}),
+                        max(deadline - started_at, 0)
+                    )
+                    status = str(response.status_code)
+                except (asyncio.TimeoutError, httpx.TimeoutException) as err:
+                    status = "timeout"
+                    raise UpstreamFailedError("OMDB did not answer in time.") from err
+                except httpx.HTTPError as err:
+                    raise UpstreamFailedError("OMDB could not be reached.") from err
+                finally:
+                    span.set_attribute("omdb.status", status)
+                    self.metrics.omdb_finished(status, time.monotonic() - started_at)
+                    self.__record_pool_usage()
+            self.latency.observe(time.monotonic() - started_at)
+
+            # The errors of the servers of OMDB are HTML pages, not JSON.
+            content_type = response.headers.get('content-type', '')
+            if response.status_code >= 500 or not content_type.startswith("application/json"):
+                raise UpstreamFailedError(f"OMDB answered with an error ({response.status_code}).")
+            if response.status_code == 401 and loads(response.content).get('Error') in KEY_ERRORS:
+                self.quota.exhaust(key)
+                continue
+            return response.content
+        raise QuotaExceededError("OMDB refused every API key.")
+
+    def __record_pool_usage(self) -> None:
+        if not self.metrics.enabled:
+            return
+        # The pool of httpx's transport is not public, and there is none with a mocked transport.
+        pool = getattr(getattr(self.__client, '_transport', None), '_pool', None)
+        connections = getattr(pool, 'connections', None)
+        if connections is not None:
+            idle = sum(connection.is_idle() for connection in connections)
+            self.metrics.pool_usage(len(connections) - idle, idle)
+
+    def upstream_stats(self) -> UpstreamStats:
+        return UpstreamStats(
+            circuit=self.breaker.state,
+            consecutive_failures=self.breaker.failures,
+            trips=self.breaker.trips,
+            rejected=self.breaker.rejected,
+            retries=self.__retries,
+            hedges=self.__hedges,
+            hedge_wins=self.__hedge_wins,
+            latency_p50=self.latency.percentile(0.5),
+            latency_p95=self.latency.percentile(0.95)
+        )
+
+    def __stored_media(self, params: dict) -> tuple[str, str] | None:
+        """The IMDB ID and the plot of a lookup the store can answer, only by IMDB ID."""
+        if self.store is None:
+            return None
+        normalized = dict(normalize_params({'plot': 'short', **params}, MEDIA_PARAMS))
+        if normalized.keys() != {'i', 'plot'}:
+            return None
+        return normalized['i'], normalized['plot']
+
+    async def __fetch_media(self, params: dict, from_store: bool = True) -> bytes:
+        """
+        Finds the media in the store, or in OMDB, storing it. The refreshes of the cached media do
+        not read the store, that would answer them with the body they are refreshing.
+        """
+        stored = self.__stored_media(params)
+        if stored is not None and from_store:
+            body = await self.store.get(*stored)
+            if body is not None:
+                return body
+
+        content = await self.__get(params)
+        with self.tracer.span("render", renderer="render_media"):
+            body = render_media(content)
+        data = loads(body)
+        await self.__learn_alias(data['title'], data['type'], data['year'], data['imdb']['id'])
+        # The episodes are found by the hundreds with their series, and would crowd the searches.
+        if self.index is not None and data['type'] != MediaType.Episode.value:
+            self.index.add(to_index_entry(data))
+        if self.store is not None:
+            plot = dict(normalize_params({'plot': 'short', **params}, ('plot',)))['plot']
+            await self.store.put(data['imdb']['id'], plot, body)
+        return body
+
+    async def __fetch_title(self, params: dict) -> bytes:
+        body = await self.__fetch_media(params)
+        imdb_id = loads(body)['imdb']['id']
+        alias = alias_cache_key(params['t'], params.get('type'), params.get('y'))
+        await self.alias_cache.set(alias, imdb_id.encode(), self.__config.CACHE_ALIAS_TTL)
+
+        key = media_cache_key({'i': imdb_id, 'plot': params.get('plot', 'short')})
+        if self.__config.CACHE_MEDIA_TTL > 0:
+            await self.cache.set(key, body, self.__config.CACHE_MEDIA_TTL + self.__config.CACHE_STALE_TTL)
+        return body
+
+    async def __learn_alias(self, title: str, type: str, year: str, imdb_id: str) -> None:
+        """
+        Remembers the IMDB ID of a media for the lookups by its title with its year, and with or
+        without its type. Without a year, a title may be the one of many media, and an episode is
+        only remembered with its type, a lookup of "Pilot" is seldom looking for an episode.
+        """
+        keys = [alias_cache_key(title, type, year[:4])]
+        if type != MediaType.Episode.value:
+            keys.append(alias_cache_key(title, None, year[:4]))
+        for key in keys:
+            await self.alias_cache.set(key, imdb_id.encode(), self.__config.CACHE_ALIAS_TTL)
+
+    async def __fetch_season(self, params: dict) -> bytes:
+        content = await self.__get(params)
+        with self.tracer.span("render", renderer="render_season"):
+            return render_season(content)
+
+    def __indexed_search(self, params: dict) -> CachedResponse[SearchModel] | None:
+        if self.index is None or 'page' in params:
+            return None
+        found = self.index.answer(params['s'], type=params.get('type'), year=params.get('y'))
+        if found is None:
+            return None
+        # The index does not know how many media OMDB would have found.
+        return CachedResponse.from_body(dumps({'search': found, 'total_results': None}))
+
+    async def __fetch_search(self, params: dict) -> bytes:
+        content = await self.__get(params)
+        with self.tracer.span("render", renderer="render_search"):
+            body = render_search(content)
+        for media in loads(body)['search']:
+            await self.__learn_alias(media['title'], media['type'], media['year'], media['imdbID'])
+            if self.index is not None:
+                self.index.add(media)
+        return body
@@ -0,0 +1,377 @@
+import asyncio
+import bisect
+import mmap
+import os
+import re
+import struct
+import unicodedata
+from array import array
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+from movie_scrapper_api.models.media import MediaType
+from movie_scrapper_api.models.stats import SearchIndexStats
+from movie_scrapper_api.omdb import dumps, loads, to_search_media
+
+MAGIC = b"MSAIDX01"
+_COUNT = struct.Struct("=I")
+MAX_COUNTED = 20000
+_WORD = re.compile(r"\w+")
+
+
+def normalize_title(title: str) -> str:
+    """Lowercases the title, strips its accents and its punctuation and collapses its spaces."""
+    decomposed = unicodedata.normalize("NFKD", title.casefold())
+    return " ".join(_WORD.findall("".join(char for char in decomposed if not unicodedata.combining(char))))
+
+
+def trigrams(text: str, complete: bool = True) -> set[str]:
+    """
+    The trigrams of a normalized text, padded with spaces so that the starts of the words count.
+
+    The end of an incomplete text, like a query that is still being typed, is not padded.
+    """
+    padded = f" {text} " if complete else f" {text}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def to_index_entry(media: dict) -> dict:
+    """
+    Converts a media to the JSON of a `SearchMedia`, whether it is a media of a search of OMDB,
+    a `SearchMedia` or a `MediaModel`.
+    """
+    if 'Title' in media:
+        return to_search_media(media)
+    return {
+        'title': media['title'],
+        'year': media['year'],
+        'imdbID': media['imdbID'] if 'imdbID' in media else media['imdb']['id'],
+        'type': MediaType(media['type']).value,
+        'poster': media.get('poster')
+    }
+
+
+# The words of the titles repeat a lot, so are their trigrams.
+_word_trigrams = lru_cache(maxsize=2 ** 16)(trigrams)
+
+
+def _similarity(grams: set[str], other: set[str]) -> float:
+    return 2 * len(grams & other) / (len(grams) + len(other))
+
+
+def score(text: str, key: str, min_similarity: float) -> float:
+    """
+    How well the normalized title `key` matches the normalized query `text`, from 0 to 1.
+
+    The same title scores 1, a title that starts with the query at least 0.9, a title whose
+    words start with the words of the query at least 0.7, the longer the query the higher. Any
+    other title scores the similarity of the trigrams of the words of the query with the ones
+    of its closest words, scaled to 0.7, or 0 when it is under `min_similarity`.
+    """
+    if key == text:
+        return 1.0
+    if not key:
+        return 0
+    coverage = len(text) / len(key)
+    if key.startswith(text):
+        return 0.9 + 0.1 * coverage
+    words = key.split()
+    tokens = text.split()
+    if all(any(word.startswith(token) for word in words) for token in tokens):
+        return 0.7 + 0.2 * coverage
+
+    word_grams = [_word_trigrams(word) for word in words]
+    similarity = sum(
+        max(_similarity(_word_trigrams(token, index < len(tokens) - 1), grams) for grams in word_grams)
+        for index, token in enumerate(tokens)
+    ) / len(tokens)
+    return 0.7 * similarity if similarity >= min_similarity else 0
+
+
+def _align(size: int) -> int:
+    return size + -size % 4
+
+
+def _table(items: list[bytes]) -> bytes:
+    """Packs byte strings as their count, their offsets and their contents, padded to 4 bytes."""
+    offsets = array("I", [0])
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+    data = _COUNT.pack(len(items)) + offsets.tobytes() + b"".join(items)
+    return data + bytes(_align(len(data)) - len(data))
+
+
+class _Table:
+    """A table of byte strings packed by `_table`, read in place from a buffer."""
+
+    def __init__(self, buffer: memoryview, start: int):
+        (self.count,) = _COUNT.unpack_from(buffer, start)
+        start += _COUNT.size
+        self.offsets = buffer[start:start + 4 * (self.count + 1)].cast("I")
+        start += 4 * (self.count + 1)
+        self.blob = buffer[start:start + self.offsets[self.count]]
+        self.end = _align(start + self.offsets[self.count])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.view(index).tobytes()
+
+    def view(self, index: int) -> memoryview:
+        return self.blob[self.offsets[index]:self.offsets[index + 1]]
+
+
+class Segment:
+    """
+    The frozen part of a `TitleIndex`, read in place from a memory-mapped file or a buffer.
+
+    The media are sorted by normalized title, so that the titles that start with a query are a
+    range found by binary search. The trigrams of the titles are sorted as well, each with the
+    sorted IDs of the media that have it.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap):
+        view = memoryview(buffer)
+        if view[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a title index")
+        self.media = _Table(view, len(MAGIC))
+        self.keys = _Table(view, self.media.end)
+        self.grams = _Table(view, self.keys.end)
+        self.postings = _Table(view, self.grams.end)
+
+    @staticmethod
+    def build(media: Iterable[dict]) -> bytes:
+        entries = sorted(
+            ((normalize_title(entry['title']).encode(), entry) for entry in media),
+            key=lambda entry: entry[0]
+        )
+        postings: dict[bytes, array] = {}
+        for media_id, (key, _) in enumerate(entries):
+            for gram in trigrams(key.decode()):
+                postings.setdefault(gram.encode(), array("I")).append(media_id)
+        grams = sorted(postings)
+
+        return b"".join((
+            MAGIC,
+            _table([dumps(entry) for _, entry in entries]),
+            _table([key for key, _ in entries]),
+            _table(grams),
+            _table([postings[gram].tobytes() for gram in grams])
+        ))
+
+    def __len__(self) -> int:
+        return len(self.media)
+
+    def get(self, media_id: int) -> dict:
+        return loads(self.media[media_id])
+
+    def key(self, media_id: int) -> str:
+        return self.keys[media_id].decode()
+
+    def starting_with(self, text: str) -> range:
+        """The IDs of the media whose normalized title starts with the text."""
+        prefix = text.encode()
+        # No UTF-8 string has a 0xff byte, so it sorts after every title that has the prefix.
+        return range(bisect.bisect_left(self.keys, prefix), bisect.bisect_left(self.keys, prefix + b"\xff"))
+
+    def posting(self, gram: str) -> memoryview | None:
+        """The IDs of the media whose normalized title has the trigram."""
+        encoded = gram.encode()
+        index = bisect.bisect_left(self.grams, encoded)
+        if index < len(self.grams) and self.grams[index] == encoded:
+            return self.postings.view(index).cast("I")
+        return None
+
+
+def _map(path: Path) -> Segment | None:
+    try:
+        with path.open("rb") as file:
+            return Segment(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError) as err:
+        logger.warning("The title index {} could not be read: {}", path, err)
+        return None
+
+
+class TitleIndex:
+    """
+    A local index of the titles of the media seen in OMDB, to answer the searches without it.
+
+    The index is made of a frozen `Segment` and of the media added since it was built. When
+    `max_pending` media have been added, they are merged into a new segment in a thread. When
+    the index has a path, the segment is written to it and memory-mapped, so that the workers of
+    a node share the same pages, and every worker merges the segment last written by the others
+    into its own.
+
+    A search is answered when the index is confident it knows the answer: its best title is the
+    query itself, and it has found at least `min_results` titles that score at least `min_score`.
+    An index that has only seen a few of the titles matching a query, like the one media looked
+    up, or a query still being typed, is never confident, so that the search is made by OMDB.
+    """
+    __pending: dict[str, tuple[str, dict]]
+
+    def __init__(
+            self,
+            path: str | Path | None = None,
+            max_pending: int = 1000,
+            min_score: float = 0.9,
+            min_results: int = 10,
+            min_similarity: float = 0.4
+    ):
+        self.path = Path(path) if path else None
+        self.max_pending = max_pending
+        self.min_score = min_score
+        self.min_results = min_results
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.misses = 0
+        self.__pending = {}
+        self.__segment = _map(self.path) if self.path is not None and self.path.exists() else None
+        self.__lock = asyncio.Lock()
+        self.__flush: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        segment = len(self.__segment) if self.__segment is not None else 0
+        return segment + len(self.__pending)
+
+    def add(self, media: dict) -> None:
+        """Adds a media, as the JSON of a `SearchMedia`, in place of the one with the same IMDB ID."""
+        self.__pending[media['imdbID']] = (normalize_title(media['title']), media)
+        if len(self.__pending) >= self.max_pending and self.__flush is None:
+            self.__flush = asyncio.ensure_future(self.flush())
+            self.__flush.add_done_callback(self.__flushed)
+
+    def __flushed(self, task: asyncio.Task) -> None:
+        self.__flush = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("The flush of the title index failed: {!r}", task.exception())
+
+    async def load_dump(self, path: str | Path) -> None:
+        """Adds the media of a dump, a file with the JSON of a media on every line."""
+        def read() -> list[dict]:
+            with Path(path).open("rb") as file:
+                return [to_index_entry(loads(line)) for line in file if line.strip()]
+
+        for media in await asyncio.to_thread(read):
+            self.__pending[media['imdbID']] = (normalize_title(media['title']), media)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Merges the media added since the last flush into a new segment."""
+        async with self.__lock:
+            if not self.__pending:
+                return
+            pending = dict(self.__pending)
+            self.__segment = await asyncio.to_thread(self.__merge, [media for _, media in pending.values()])
+            for imdb_id, entry in pending.items():
+                if self.__pending.get(imdb_id) is entry:
+                    del self.__pending[imdb_id]
+
+    def __merge(self, pending: list[dict]) -> Segment:
+        # Another worker may have written a newer segment than the one of this worker.
+        segment = _map(self.path) if self.path is not None and self.path.exists() else None
+        if segment is None:
+            segment = self.__segment
+        media = {}
+        if segment is not None:
+            for media_id in range(len(segment)):
+                entry = segment.get(media_id)
+                media[entry['imdbID']] = entry
+        media.update((entry['imdbID'], entry) for entry in pending)
+
+        data = Segment.build(media.values())
+        if self.path is None:
+            return Segment(data)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, self.path)
+        segment = _map(self.path)
+        return segment if segment is not None else Segment(data)
+
+    async def close(self) -> None:
+        """Writes the media added since the last flush."""
+        if self.__flush is not None:
+            await asyncio.gather(self.__flush, return_exceptions=True)
+        await self.flush()
+
+    def search(
+            self,
+            query: str,
+            limit: int = 10,
+            type: str | None = None,
+            year: str | None = None
+    ) -> list[tuple[float, dict]]:
+        """
+        Finds the media whose titles best match the query, with their score, see `score`.
+
+        Like OMDB, the media can be filtered by type and by the year they came out.
+        """
+        text = normalize_title(query)
+        if not text:
+            return []
+        grams = trigrams(text, complete=False)
+
+        candidates = {}
+        if self.__segment is not None:
+            for media_id in self.__candidates(self.__segment, text, grams, limit):
+                media = self.__segment.get(media_id)
+                candidates[media['imdbID']] = (self.__segment.key(media_id), media)
+        candidates.update(self.__pending)
+
+        results = []
+        for key, media in candidates.values():
+            if type is not None and media['type'] != type or year is not None and media['year'][:4] != year:
+                continue
+            value = score(text, key, self.min_similarity)
+            if value > 0:
+                results.append((value, media))
+        results.sort(key=lambda result: (-result[0], result[1]['title']))
+        return results[:limit]
+
+    def __candidates(self, segment: Segment, text: str, grams: set[str], limit: int) -> set[int]:
+        starting_with = segment.starting_with(text)
+        candidates = set(starting_with[:limit * 5])
+        if len(starting_with) >= limit:
+            # The titles that start with the query outrank any other one.
+            return candidates
+
+        # The rarest trigrams of the query tell the most about the titles that have them, so their
+        # postings are counted first, until `MAX_COUNTED` IDs have been counted.
+        counts = Counter()
+        counted = 0
+        for posting in sorted(filter(None, map(segment.posting, grams)), key=len):
+            if counts and counted + len(posting) > MAX_COUNTED:
+                break
+            counts.update(posting)
+            counted += len(posting)
+        candidates.update(media_id for media_id, _ in counts.most_common(limit * 5))
+        return candidates
+
+    def answer(
+            self,
+            query: str,
+            limit: int = 10,
+            type: str | None = None,
+            year: str | None = None
+    ) -> list[dict] | None:
+        """The media matching the query, or `None` when the index is not confident it knows them."""
+        results = self.search(query, limit, type, year)
+        confident = [value for value, _ in results if value >= self.min_score]
+        if confident and confident[0] == 1.0 and len(confident) >= self.min_results:
+            self.hits += 1
+            return [media for _, media in results]
+        self.misses += 1
+        return None
+
+    def stats(self) -> SearchIndexStats:
+        return SearchIndexStats(
+            entries=len(self),
+            pending=len(self.__pending),
+            hits=self.hits,
+            misses=self.misses
+        )
@@ -0,0 +1,168 @@
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+from loguru import logger
+
+from movie_scrapper_api.config import Settings
+
+
+def event_loop(config: Settings) -> str:
+    """The event loop of the workers, uvloop when it is installed unless another one is set."""
+    if config.SERVER_LOOP != "auto":
+        return config.SERVER_LOOP
+    return "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio"
+
+
+def http_protocol(config: Settings) -> str:
+    """The HTTP parser of the workers, httptools when it is installed unless another one is set."""
+    if config.SERVER_HTTP != "auto":
+        return config.SERVER_HTTP
+    return "httptools" if importlib.util.find_spec("httptools") is not None else "h11"
+
+
+class Prefork:
+    """
+    Runs `workers` processes of the API that accept the connections of the same socket.
+
+    The application is loaded once, before the workers are forked, so that they share its
+    imported modules instead of importing them again, and start faster. Every worker runs its
+    own lifespan, with its own `Scrapper`. A worker that dies is forked again, until the
+    supervisor is asked to stop with `SIGINT` or `SIGTERM`, which it sends on to the workers.
+
+    A worker that dies within `min_uptime` seconds of being forked, like one whose lifespan
+    fails, is forked again after a delay that doubles up to `max_delay`, and once `max_failures`
+    of them have died in a row the supervisor stops the others and gives up with a failure.
+    """
+
+    def __init__(
+            self,
+            config: uvicorn.Config,
+            sock: socket.socket,
+            workers: int,
+            min_uptime: float = 10.0,
+            max_failures: int = 5,
+            delay: float = 0.1,
+            max_delay: float = 10.0
+    ):
+        self.config = config
+        self.socket = sock
+        self.workers = workers
+        self.min_uptime = min_uptime
+        self.max_failures = max_failures
+        self.delay = delay
+        self.max_delay = max_delay
+        # The workers running, with the time they were forked at
+        self.__pids: dict[int, float] = {}
+        self.__failures = 0
+        self.__stopping = False
+
+    def __fork(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # The worker stops on the signals, until uvicorn handles them.
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                server = uvicorn.Server(self.config)
+                server.run(sockets=[self.socket])
+                if not server.started:
+                    # The lifespan failed, uvicorn has logged why.
+                    code = 3
+            except BaseException:
+                logger.exception("The worker {} failed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        self.__pids[pid] = time.monotonic()
+
+    def __stop(self, signum: int, _frame) -> None:
+        self.__stopping = True
+        for pid in list(self.__pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        """Runs the workers until the supervisor is stopped, and returns its exit code."""
+        signal.signal(signal.SIGINT, self.__stop)
+        signal.signal(signal.SIGTERM, self.__stop)
+        for _ in range(self.workers):
+            self.__fork()
+
+        exit_code = 0
+        while self.__pids:
+            pid, status = os.wait()
+            forked_at = self.__pids.pop(pid)
+            if self.__stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if time.monotonic() - forked_at >= self.min_uptime:
+                self.__failures = 0
+                logger.warning("The worker {} exited with {}, forking another one", pid, code)
+                self.__fork()
+                continue
+
+            self.__failures += 1
+            if self.__failures >= self.max_failures:
+                logger.error(
+                    "The worker {} exited with {}, {} workers died after their start in a row, stopping",
+                    pid, code, self.__failures
+                )
+                exit_code = 1
+                self.__stop(signal.SIGTERM, None)
+                continue
+            delay = min(self.delay * 2 ** (self.__failures - 1), self.max_delay)
+            logger.warning(
+                "The worker {} exited with {} after its start, forking another one in {:.1f}s", pid, code, delay
+            )
+            time.sleep(delay)
+            if not self.__stopping:
+                self.__fork()
+        self.socket.close()
+        return exit_code
+
+
+def serve(app, config: Settings) -> None:
+    """
+    Serves the API, in a single process, or in `WORKERS` processes forked from this one.
+
+    Where processes can not be forked, the workers are started by uvicorn, and every one of
+    them imports the application again.
+    """
+    server_config = uvicorn.Config(
+        app,
+        host=config.BIND_HOST,
+        port=config.BIND_PORT,
+        log_level=config.LOG_LEVEL,
+        # Keep the handlers of `setup_app_logging` instead of the ones of uvicorn.
+        log_config=None,
+        loop=event_loop(config),
+        http=http_protocol(config)
+    )
+    logger.info(
+        "Serving with {} worker(s), the {} event loop and the {} HTTP parser",
+        config.WORKERS, server_config.loop, server_config.http
+    )
+
+    if config.WORKERS <= 1:
+        uvicorn.Server(server_config).run()
+    elif hasattr(os, "fork"):
+        sys.exit(Prefork(server_config, server_config.bind_socket(), config.WORKERS).run())
+    else:
+        uvicorn.run(
+            "movie_scrapper_api.__main__:app",
+            host=config.BIND_HOST,
+            port=config.BIND_PORT,
+            log_level=config.LOG_LEVEL,
+            log_config=None,
+            loop=server_config.loop,
+            http=server_config.http,
+            workers=config.WORKERS
+        )
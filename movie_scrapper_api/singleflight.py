@@ -0,0 +1,77 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from movie_scrapper_api.models.stats import SingleFlightStats
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "callers", "waiting")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.callers = 1
+        self.waiting = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces the identical calls that are in flight at the same time.
+
+    The first caller of a key starts the call, every other caller of the same key that arrives
+    before it is over waits for the same result (or error) instead of starting its own. The call
+    runs in its own task, so a caller that gives up does not cancel it for the rest, but once
+    every caller has given up, it is cancelled, as nobody is left for its result.
+    """
+    __flights: dict[Hashable, _Flight]
+
+    def __init__(self):
+        self.flights = 0
+        self.callers = 0
+        self.max_callers = 0
+        self.abandoned = 0
+        self.__flights = {}
+
+    def __len__(self) -> int:
+        return len(self.__flights)
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args) -> T:
+        flight = self.__flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn(*args)))
+            self.__flights[key] = flight
+            flight.task.add_done_callback(lambda _: self.__land(key, flight))
+        else:
+            flight.callers += 1
+
+        flight.waiting += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiting -= 1
+            if not flight.waiting and not flight.task.done():
+                self.abandoned += 1
+                # The next caller starts a new call instead of waiting for the cancelled one.
+                if self.__flights.get(key) is flight:
+                    del self.__flights[key]
+                flight.task.cancel()
+
+    def __land(self, key: Hashable, flight: _Flight) -> None:
+        if self.__flights.get(key) is flight:
+            del self.__flights[key]
+        self.flights += 1
+        self.callers += flight.callers
+        self.max_callers = max(self.max_callers, flight.callers)
+        if not flight.task.cancelled():
+            # Nobody may be left waiting for it, mark the error as retrieved.
+            flight.task.exception()
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            in_flight=len(self.__flights),
+            flights=self.flights,
+            callers=self.callers,
+            max_callers=self.max_callers,
+            abandoned=self.abandoned
+        )
@@ -0,0 +1,88 @@
+"""
+Reports how long the API takes to import and load, and checks it against `STARTUP_BUDGET`.
+
+The application is imported in a fresh interpreter with `-X importtime`, so that nothing is
+already imported, and the time of its parts is read from the timings of their modules: the
+import of FastAPI and of pydantic, of the models of the API, of the settings, that are loaded
+when their module is imported, and of the whole application.
+
+    poetry run python -m movie_scrapper_api.startup
+"""
+import argparse
+import subprocess
+import sys
+
+APPLICATION = "movie_scrapper_api.__main__"
+
+# The parts of the startup, and the prefix of the modules that make them up
+PARTS = (
+    ("fastapi", "fastapi"),
+    ("pydantic", "pydantic"),
+    ("models", "movie_scrapper_api.models"),
+    ("settings", "movie_scrapper_api.config"),
+    ("application", APPLICATION)
+)
+
+
+def import_times(module: str = APPLICATION) -> list[tuple[int, str, float]]:
+    """
+    The depth, the name and the seconds of every module imported with the module, including the
+    modules it imported, in the order `-X importtime` reports them: a module after its imports.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        name = name.rstrip()
+        times.append(((len(name) - len(name.lstrip())) // 2, name.strip(), int(cumulative) / 1e6))
+    return times
+
+
+def startup_report(times: list[tuple[int, str, float]]) -> list[tuple[str, float]]:
+    """
+    The seconds of every part of the startup, the last one being the whole application. A part
+    is the time of its outermost modules, as the time of a module includes the one of its imports,
+    and the parts overlap when one imports the other.
+    """
+    report = []
+    for part, prefix in PARTS:
+        seconds = 0.0
+        # Read backwards, every module comes before its imports.
+        outer: list[tuple[int, bool]] = []
+        for depth, name, cumulative in reversed(times):
+            while outer and outer[-1][0] >= depth:
+                outer.pop()
+            matches = name == prefix or name.startswith(prefix + ".")
+            if matches and not any(matched for _, matched in outer):
+                seconds += cumulative
+            outer.append((depth, matches))
+        report.append((part, seconds))
+    return report
+
+
+def main() -> None:
+    from movie_scrapper_api.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=settings.STARTUP_BUDGET, help="seconds allowed")
+    args = parser.parse_args()
+
+    report = startup_report(import_times())
+    for part, seconds in report:
+        print(f"{part:<12}{seconds * 1000:>10.1f} ms")
+    total = report[-1][1]
+    if total > args.budget:
+        print(f"The startup took {total:.2f}s, over its budget of {args.budget:.2f}s")
+        sys.exit(1)
+    print(f"The startup took {total:.2f}s, within its budget of {args.budget:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
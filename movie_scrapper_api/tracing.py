@@ -0,0 +1,108 @@
+import os
+import sys
+
+from movie_scrapper_api.config import Settings
+
+
+class NoSpan:
+    """The span of a disabled tracer, that records nothing and is shared by every stage."""
+
+    def __enter__(self) -> "NoSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+NO_SPAN = NoSpan()
+
+
+class Tracer:
+    """
+    The spans of the stages of the requests, that do nothing unless they are enabled, see
+    `OpenTelemetryTracer`. A disabled tracer hands out the same span to every stage, so that the
+    spans cost nothing to the requests when they are not recorded.
+    """
+    enabled = False
+
+    def span(self, name: str, **attributes) -> NoSpan:
+        """A context manager that records the stage it wraps, as a child of the current span."""
+        return NO_SPAN
+
+    def close(self) -> None:
+        pass
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    The spans of the stages of the requests, recorded with the SDK of OpenTelemetry for a share
+    `sample_rate` of the requests, and written as lines of JSON to the file `path`, or to the
+    console. The spans are written in batches, from a background thread.
+    """
+    enabled = True
+
+    def __init__(self, path: str | None = None, sample_rate: float = 1.0):
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        self.__out = open(path, "a") if path else sys.stdout
+        self.provider = TracerProvider(
+            resource=Resource.create({"service.name": "movie-scrapper-api"}),
+            sampler=ParentBased(TraceIdRatioBased(sample_rate))
+        )
+        self.provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter(
+            out=self.__out,
+            formatter=lambda span: span.to_json(indent=None) + os.linesep
+        )))
+        self.__tracer = self.provider.get_tracer("movie_scrapper_api")
+
+    def span(self, name: str, **attributes):
+        return self.__tracer.start_as_current_span(name, attributes=attributes)
+
+    def close(self) -> None:
+        self.provider.shutdown()
+        if self.__out is not sys.stdout:
+            self.__out.close()
+
+
+def create_tracer(config: Settings) -> Tracer:
+    """Creates the tracer of the API, that records the spans only if they are enabled in the settings."""
+    if not config.TRACING_ENABLED:
+        return Tracer()
+    try:
+        return OpenTelemetryTracer(config.TRACING_PATH, config.TRACING_SAMPLE_RATE)
+    except ImportError as err:
+        raise RuntimeError("The tracing requires the tracing extra: poetry install -E tracing") from err
+
+
+class TracingMiddleware:
+    """
+    Records a span for every request to the API, the parent of the spans of its stages, with its
+    method, its path and its status. The time between the start of this span and of the first
+    one of the route is the one of the middlewares and of the routing.
+    """
+
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.tracer.span(f"{scope['method']} {scope['path']}", **{
+            "http.method": scope["method"],
+            "http.target": scope["path"]
+        }) as span:
+            async def send_status(message: dict) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_status)
@@ -0,0 +1,78 @@
+import os
+
+import httpx
+import pytest
+
+from tests.fake_omdb import FIXTURES_PATH, RecordedPayloads
+
+os.environ.setdefault("OMDB_API_KEY", "test")
+
+
+class OMDBStub:
+    """
+    An in-process stand-in of the OMDB API that answers from the recorded payloads
+    of `tests/fixtures/omdb` and keeps every request it has received. It is also the
+    server of the posters, that answers every poster with `poster` and its `poster_etag`.
+    """
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.payloads = RecordedPayloads()
+        self.poster = b"\xff\xd8\xff\xe0 a poster \xff\xd9"
+        self.poster_etag = '"poster-1"'
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def add_series(self, imdb_id: str, seasons: int, episodes: int, missing: tuple[int, ...] = ()) -> None:
+        """
+        Adds a series with `episodes` episodes in each of its `seasons` seasons, but the `missing`
+        ones, and the media of its episodes, `tt9<series>SSEE`, based on the media of Doctor Who.
+        """
+        for season in range(1, seasons + 1):
+            if season in missing:
+                continue
+            listing = []
+            for episode in range(1, episodes + 1):
+                episode_id = f"tt9{imdb_id[-2:]}{season:02}{episode:02}"
+                title = f"Episode {season}x{episode}"
+                listing.append({
+                    "Title": title,
+                    "Released": "2005-03-26",
+                    "Episode": str(episode),
+                    "imdbRating": "7.5",
+                    "imdbID": episode_id
+                })
+                self.payloads.titles[episode_id] = {
+                    **self.payloads.titles['tt0436992'],
+                    "Title": title,
+                    "Year": "2005",
+                    "imdbID": episode_id,
+                    "Type": "episode"
+                }
+            self.payloads.seasons[(imdb_id, season)] = {
+                "Title": "A Series",
+                "Season": str(season),
+                "totalSeasons": str(seasons),
+                "Episodes": listing,
+                "Response": "True"
+            }
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path.endswith(".jpg"):
+            if request.headers.get('If-None-Match') == self.poster_etag:
+                return httpx.Response(304)
+            return httpx.Response(
+                200, content=self.poster, headers={'Content-Type': "image/jpeg", 'ETag': self.poster_etag}
+            )
+        payload = self.payloads.answer(request.url.params)
+        if payload is None:
+            return httpx.Response(200, json={"Response": "False", "Error": "Movie not found!"})
+        return httpx.Response(200, json=payload)
+
+
+@pytest.fixture
+def omdb() -> OMDBStub:
+    return OMDBStub()
@@ -0,0 +1,156 @@
+"""
+A stand-in of the OMDB API, that answers from the recorded payloads of `tests/fixtures/omdb`
+with the latency, the errors and the daily quota of the real one, so that the API can be
+tested and benchmarked offline.
+
+    poetry run python -m tests.fake_omdb --port 9102 --latency 0.05 --error-rate 0.01
+    OMDB_BASE_URL=http://localhost:9102 poetry run python -m movie_scrapper_api
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Mapping
+from urllib.parse import parse_qsl
+
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures" / "omdb"
+
+NOT_FOUND = {"Response": "False", "Error": "Movie not found!"}
+NO_KEY = {"Response": "False", "Error": "No API key provided."}
+LIMIT_REACHED = {"Response": "False", "Error": "Request limit reached!"}
+ERROR_PAGE = b"<html><body><h1>503 Service Unavailable</h1></body></html>"
+
+
+class RecordedPayloads:
+    """
+    The payloads of OMDB recorded in `tests/fixtures/omdb`: a media for every `<imdbID>.json`,
+    a page of a search for every `search-<name>[-page-<page>].json`, and a season of a series
+    for every `season-<imdbID>-<season>.json`.
+    """
+
+    def __init__(self, path: Path = FIXTURES_PATH):
+        self.titles = {}
+        self.searches = {}
+        self.seasons = {}
+        for fixture in path.glob("*.json"):
+            payload = json.loads(fixture.read_text())
+            if fixture.stem.startswith("season-"):
+                imdb_id, _, season = fixture.stem.removeprefix("season-").rpartition("-")
+                self.seasons[(imdb_id, int(season))] = payload
+            elif fixture.stem.startswith("search-"):
+                name, _, page = fixture.stem.removeprefix("search-").partition("-page-")
+                self.searches[(name.replace("-", " "), int(page or 1))] = payload
+            else:
+                self.titles[payload['imdbID']] = payload
+
+    def answer(self, params: Mapping[str, str]) -> dict | None:
+        """The payload OMDB answers to these query parameters, `None` when it has not found any."""
+        if 'i' in params and 'Season' in params:
+            return self.seasons.get((params['i'], int(params['Season'])))
+        if 'i' in params:
+            return self.titles.get(params['i'])
+        if 't' in params:
+            return next(
+                (media for media in self.titles.values() if media['Title'].lower() == params['t'].lower()),
+                None
+            )
+
+        payload = self.searches.get((params.get('s', '').lower(), int(params.get('page', 1))))
+        if payload is not None and ('type' in params or 'y' in params):
+            search = [
+                media for media in payload['Search']
+                if params.get('type', media['Type']) == media['Type']
+                and media['Year'].startswith(params.get('y', ''))
+            ]
+            payload = {**payload, 'Search': search, 'totalResults': str(len(search))} if search else None
+        return payload
+
+
+class FakeOMDB:
+    """
+    An ASGI application that answers like OMDB from the recorded payloads.
+
+    Every answer takes `latency` seconds, give or take up to `jitter`, a share `error_rate` of
+    the calls is answered with an error page, and every API key may make `daily_quota` calls
+    (unlimited with `0`) before it is answered with `Request limit reached!`. The errors and
+    the latencies are drawn from a generator seeded with `seed`, so that a run can be repeated.
+    """
+
+    def __init__(
+            self,
+            payloads: RecordedPayloads | None = None,
+            latency: float = 0,
+            jitter: float = 0,
+            error_rate: float = 0,
+            daily_quota: int = 0,
+            seed: int | None = None
+    ):
+        self.payloads = payloads or RecordedPayloads()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.daily_quota = daily_quota
+        self.random = random.Random(seed)
+        self.calls: Counter[str] = Counter()
+        self.errors = 0
+
+    def __answer(self, params: dict[str, str]) -> tuple[int, dict | bytes]:
+        key = params.get('apikey')
+        if not key:
+            return 401, NO_KEY
+        self.calls[key] += 1
+        if self.daily_quota and self.calls[key] > self.daily_quota:
+            return 401, LIMIT_REACHED
+        if self.random.random() < self.error_rate:
+            self.errors += 1
+            return 503, ERROR_PAGE
+        return 200, self.payloads.answer(params) or NOT_FOUND
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        status, payload = self.__answer(dict(parse_qsl(scope["query_string"].decode())))
+        if isinstance(payload, bytes):
+            body, content_type = payload, b"text/html"
+        else:
+            body, content_type = json.dumps(payload).encode(), b"application/json; charset=utf-8"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9102)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds every answer takes")
+    parser.add_argument("--jitter", type=float, default=0.01, help="seconds the latency varies by")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of the calls answered with an error")
+    parser.add_argument("--daily-quota", type=int, default=0, help="calls allowed for every key, 0 for unlimited")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    app = FakeOMDB(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        daily_quota=args.daily_quota,
+        seed=args.seed
+    )
+    uvicorn.run(app, host=args.host, port=args.port, lifespan="off", log_level="warning")
+
+
+if __name__ == '__main__':
+    main()
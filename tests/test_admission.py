@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from movie_scrapper_api.admission import AdmissionController, AdmissionMiddleware, request_deadline
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.scrapper import Scrapper
+
+
+def admission_api(controller: AdmissionController | None, release: asyncio.Event | None = None) -> FastAPI:
+    api = FastAPI()
+    api.add_middleware(AdmissionMiddleware, controller=controller, max_timeout=5)
+
+    @api.get("/slow")
+    async def slow():
+        await release.wait()
+        return {}
+
+    @api.get("/deadline")
+    async def deadline():
+        return {'left': request_deadline.get() - time.monotonic() if request_deadline.get() else None}
+
+    return api
+
+
+@pytest.mark.asyncio
+class TestAdmissionController:
+    async def test_requests_wait_in_line(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=1)
+
+        assert await controller.acquire()
+        second = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.waiting == 1
+        assert not await controller.acquire()
+        controller.release()
+
+        assert await second
+        assert (controller.in_flight, controller.waiting, controller.admitted, controller.shed) == (1, 0, 2, 1)
+
+    async def test_requests_wait_until_their_deadline(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=10, queue_timeout=10)
+        await controller.acquire()
+
+        started_at = time.monotonic()
+        assert not await controller.acquire(deadline=time.monotonic() + 0.02)
+        assert time.monotonic() - started_at < 1
+        assert controller.waiting == 0
+        controller.release()
+        assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+class TestAdmissionMiddleware:
+    async def test_overloaded_requests_are_shed(self):
+        release = asyncio.Event()
+        controller = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1.5)
+        api = admission_api(controller, release)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/slow"))
+            await asyncio.sleep(0.01)
+            shed = await client.get("/slow")
+            release.set()
+            assert (await first).status_code == 200
+
+        assert shed.status_code == 503
+        assert shed.headers['Retry-After'] == "2"
+        assert controller.stats().shed == 1
+        assert controller.in_flight == 0
+
+    async def test_deadline(self):
+        api = admission_api(None, asyncio.Event())
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+            timed_out = await client.get("/slow", headers={'X-Request-Timeout': "0.02"})
+            left = (await client.get("/deadline", headers={'X-Request-Timeout': "100"})).json()['left']
+            without = (await client.get("/deadline")).json()['left']
+
+        assert timed_out.status_code == 504
+        # Up to `max_timeout`.
+        assert 4 < left <= 5
+        assert without is None
+
+    async def test_calls_to_omdb_end_by_the_deadline(self, omdb):
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(1)
+            return omdb.handle(request)
+
+        config = Settings(OMDB_API_KEY="test", OMDB_RETRY_BACKOFF=0)
+        async with Scrapper(config, transport=httpx.MockTransport(slow_handler)) as scrapper:
+            token = request_deadline.set(time.monotonic() + 0.05)
+            started_at = time.monotonic()
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await scrapper.find_media({'i': 'tt0068646'})
+            finally:
+                request_deadline.reset(token)
+
+            # The deadline of the request is not a failure of OMDB.
+            assert scrapper.breaker.failures == 0
+        assert time.monotonic() - started_at < 0.5
+
+    async def test_coalesced_lookups_keep_their_own_deadline(self, omdb):
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.3)
+            return omdb.handle(request)
+
+        async def find_media(imdb_id: str, timeout: float | None):
+            request_deadline.set(time.monotonic() + timeout if timeout is not None else None)
+            return await scrapper.find_media({'i': imdb_id})
+
+        config = Settings(OMDB_API_KEY="test", OMDB_RETRY_BACKOFF=0, CIRCUIT_FAILURE_THRESHOLD=2)
+        async with Scrapper(config, transport=httpx.MockTransport(slow_handler)) as scrapper:
+            # Every task runs in a copy of the context, with its own deadline.
+            hurried, patient = await asyncio.gather(
+                asyncio.ensure_future(find_media('tt0068646', 0.05)), asyncio.ensure_future(find_media('tt0068646', None)),
+                return_exceptions=True
+            )
+            # Lookups given up on by their deadline do not open the circuit for the next ones.
+            for _ in range(2):
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.ensure_future(find_media('tt0436992', 0.01))
+            media = await scrapper.find_media({'i': 'tt0436992'})
+
+            assert isinstance(hurried, asyncio.TimeoutError)
+            assert patient.title == "The Godfather"
+            assert media.imdb.id == "tt0436992"
+            assert scrapper.breaker.failures == 0
@@ -0,0 +1,30 @@
+import asyncio
+
+import httpx
+import pytest
+
+from movie_scrapper_api.scrapper import Scrapper
+
+
+@pytest.mark.asyncio
+class TestScrapperBatch:
+    async def test_find_many_is_bounded(self, omdb):
+        running = 0
+        max_running = 0
+
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return omdb.handle(request)
+
+        params = [{'i': f'tt{index:07}'} for index in range(20)] + [{'i': 'tt0068646'}]
+        async with Scrapper(transport=httpx.MockTransport(slow_handler)) as scrapper:
+            results = dict([result async for result in scrapper.find_many(params, concurrency=4)])
+
+        assert max_running == 4
+        assert len(results) == 21
+        assert results[20].title == "The Godfather"
+        assert all(isinstance(results[index], ValueError) for index in range(20))
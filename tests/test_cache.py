@@ -0,0 +1,150 @@
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from movie_scrapper_api.cache.keys import alias_cache_key, media_cache_key
+from movie_scrapper_api.cache.memory import MemoryBackend, TTLCache
+from movie_scrapper_api.cache.redis import RedisBackend
+from movie_scrapper_api.cache.sqlite import SQLiteBackend
+from movie_scrapper_api.scrapper import Scrapper
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(max_entries=2)
+        cache.set('a', 1, ttl=60)
+        cache.set('b', 2, ttl=60)
+        assert cache.get('a') == 1
+        cache.set('c', 3, ttl=60)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.evictions == 1
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(max_entries=10, clock=clock)
+        cache.set('a', 1, ttl=5)
+        clock.now = 4.9
+        assert cache.get('a') == 1
+        clock.now = 5
+        assert cache.get('a') is None
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.expirations, stats.entries) == (1, 1, 1, 0)
+
+    @pytest.mark.parametrize("first, second", [
+        ({'i': 'tt0436992'}, {'i': ' TT0436992', 'plot': 'short'}),
+        ({'t': 'The Godfather', 'type': 'movie'}, {'type': 'movie', 't': 'the godfather', 'apikey': 'key'}),
+    ])
+    def test_media_keys_are_normalized(self, first, second):
+        assert media_cache_key(first) == media_cache_key(second)
+
+    def test_alias_keys_are_normalized(self):
+        assert alias_cache_key(" The Godfather", "movie", "1972") == alias_cache_key("the godfather", "MOVIE", "1972")
+        assert alias_cache_key("The Godfather") != alias_cache_key("The Godfather", year="1972")
+
+    def test_plot_is_part_of_the_key(self):
+        assert media_cache_key({'i': 'tt0436992'}) != media_cache_key({'i': 'tt0436992', 'plot': 'full'})
+
+
+@pytest_asyncio.fixture(params=["memory", "sqlite", "redis"])
+async def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryBackend(max_entries=100)
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(tmp_path / "cache.sqlite3", table="responses", max_entries=100)
+    else:
+        backend = RedisBackend(prefix="test:", client=fakeredis.FakeAsyncRedis())
+    yield backend
+    await backend.close()
+
+
+@pytest.mark.asyncio
+class TestCacheBackend:
+    async def test_set_get_delete(self, backend):
+        await backend.set("media:i=tt0436992", b'{"title":"Doctor Who"}', ttl=60)
+
+        assert await backend.get("media:i=tt0436992") == b'{"title":"Doctor Who"}'
+        await backend.delete("media:i=tt0436992")
+        assert await backend.get("media:i=tt0436992") is None
+        stats = await backend.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+    async def test_zero_ttl_is_not_cached(self, backend):
+        await backend.set("key", b"value", ttl=0)
+
+        assert await backend.get("key") is None
+
+    async def test_scrapper_shares_the_backend(self, backend, omdb):
+        async with Scrapper(transport=omdb.transport, cache=backend) as first:
+            await first.find_media({'i': 'tt0068646'})
+        async with Scrapper(transport=omdb.transport, cache=backend) as second:
+            media = await second.find_media({'i': 'tt0068646'})
+
+        assert media.title == "The Godfather"
+        assert len(omdb.requests) == 1
+
+
+class TestSQLiteBackend:
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, tmp_path):
+        clock = FakeClock()
+        backend = SQLiteBackend(tmp_path / "cache.sqlite3", table="responses", max_entries=10, clock=clock)
+        await backend.set("key", b"value", ttl=5)
+        clock.now = 5
+
+        assert await backend.get("key") is None
+        assert (await backend.stats()).expirations == 1
+        await backend.close()
+
+
+@pytest.mark.asyncio
+class TestScrapperCache:
+    async def test_find_media_is_cached(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            first = await scrapper.find_media({'i': 'tt0068646'})
+            second = await scrapper.find_media({'i': 'TT0068646', 'plot': 'short'})
+
+        assert first == second
+        assert len(omdb.requests) == 1
+        assert (await scrapper.cache.stats()).hits == 1
+
+    async def test_not_found_is_cached_separately(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            for _ in range(3):
+                with pytest.raises(ValueError):
+                    await scrapper.search_media("asddsadsa")
+
+        assert len(omdb.requests) == 1
+        assert len(scrapper.cache) == 0
+        assert (await scrapper.not_found_cache.stats()).hits == 2
+
+    async def test_titles_share_the_answer_of_their_id(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            by_title = await scrapper.find_media({'t': 'The Godfather', 'plot': 'short'})
+            by_id = await scrapper.find_media({'i': 'tt0068646', 'plot': 'short'})
+            again = await scrapper.find_media({'t': 'the godfather', 'plot': 'short'})
+
+        assert by_title == by_id == again
+        assert len(omdb.requests) == 1
+        assert len(scrapper.cache) == 1
+
+    async def test_aliases_are_learned_from_the_searches(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            await scrapper.search_media("The Godfather")
+            media = await scrapper.find_media({'t': 'The Godfather Part II', 'y': '1974', 'plot': 'full'})
+            await scrapper.find_media({'t': 'The Godfather Part II', 'y': '1974', 'plot': 'short'})
+
+        assert media.imdb.id == "tt0071562"
+        assert [request.url.params.get('i') for request in omdb.requests[1:]] == ["tt0071562", "tt0071562"]
+        assert (await scrapper.alias_cache.stats()).hits == 2
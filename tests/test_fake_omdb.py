@@ -0,0 +1,42 @@
+import httpx
+import pytest
+
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.exceptions import UpstreamFailedError
+from movie_scrapper_api.scrapper import Scrapper
+from tests.fake_omdb import FakeOMDB
+
+
+@pytest.mark.asyncio
+class TestFakeOMDB:
+    async def test_scrapper_is_answered(self):
+        config = Settings(OMDB_API_KEY="test", OMDB_BASE_URL="http://fake-omdb")
+        async with Scrapper(config=config, transport=httpx.ASGITransport(app=FakeOMDB())) as scrapper:
+            media = await scrapper.find_media({'i': 'tt0068646'})
+            found = await scrapper.search_media("The Godfather", page=2)
+            with pytest.raises(ValueError, match="Movie not found!"):
+                await scrapper.find_media({'t': 'asddsadsa'})
+
+        assert media.title == "The Godfather"
+        assert found.search
+
+    async def test_errors_and_quota(self):
+        fake = FakeOMDB(error_rate=1, daily_quota=2)
+        config = Settings(OMDB_API_KEY="test", OMDB_RETRIES=1, OMDB_RETRY_BACKOFF=0)
+        async with Scrapper(config=config, transport=httpx.ASGITransport(app=fake)) as scrapper:
+            with pytest.raises(UpstreamFailedError):
+                await scrapper.find_media({'i': 'tt0068646'})
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://fake-omdb") as client:
+            res = await client.get("/", params={'apikey': "test", 'i': "tt0068646"})
+
+        assert fake.errors == 2
+        assert res.status_code == 401
+        assert res.json()['Error'] == "Request limit reached!"
+
+    async def test_base_url(self, omdb):
+        config = Settings(OMDB_API_KEY="test", OMDB_BASE_URL="http://localhost:9102")
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+
+        assert str(omdb.requests[0].url).startswith("http://localhost:9102/?")
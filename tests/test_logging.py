@@ -0,0 +1,70 @@
+import json
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from loguru import logger
+
+from movie_scrapper_api.logging import InterceptHandler, RequestIDMiddleware, add_request_id, json_format
+
+
+@pytest.fixture
+def records():
+    lines = []
+    logger.configure(patcher=add_request_id)
+    sink = logger.add(lines.append, format=json_format, level="DEBUG")
+    yield lines
+    logger.remove(sink)
+    logger.configure(patcher=None)
+
+
+def access_record(status: int) -> logging.LogRecord:
+    return logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 1, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", "/api/v1/media", "1.1", status), None
+    )
+
+
+@pytest.mark.asyncio
+class TestRequestID:
+    async def test_records_have_the_request_id(self, records):
+        api = FastAPI()
+        api.add_middleware(RequestIDMiddleware)
+
+        @api.get("/")
+        async def root():
+            logger.info("Answering")
+            return {}
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+            given = await client.get("/", headers={'X-Request-ID': "abc"})
+            generated = await client.get("/")
+
+        assert given.headers['x-request-id'] == "abc"
+        assert len(generated.headers['x-request-id']) == 32
+        lines = [json.loads(line) for line in records]
+        assert [line['request_id'] for line in lines] == ["abc", generated.headers['x-request-id']]
+        assert lines[0]['message'] == "Answering"
+        assert lines[0]['function'] == "root"
+
+
+class TestInterceptHandler:
+    def test_access_logs_are_sampled(self, records):
+        handler = InterceptHandler(walk_frames=False, sample_rate=0)
+
+        handler.emit(access_record(200))
+        handler.emit(access_record(503))
+
+        assert len(records) == 1
+        assert json.loads(records[0])['message'].endswith("503")
+
+    def test_frames_are_walked(self, records):
+        logging.getLogger("test").addHandler(InterceptHandler())
+        logging.getLogger("test").warning("Walked")
+        logging.getLogger("test").handlers.clear()
+
+        line = json.loads(records[0])
+        assert line['function'] == "test_frames_are_walked"
+        assert line['level'] == "WARNING"
+        assert line['request_id'] is None
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from movie_scrapper_api.cache.memory import MemoryBackend
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.media_store import MediaStore
+from movie_scrapper_api.scrapper import Scrapper
+from tests.conftest import FIXTURES_PATH
+from tests.test_cache import FakeClock
+from tests.test_refresh import settle
+
+
+@pytest.mark.asyncio
+class TestMediaStore:
+    async def test_fresh_media_are_answered(self, tmp_path):
+        clock = FakeClock()
+        store = MediaStore(tmp_path / "media.sqlite3", max_age=60, clock=clock)
+        await store.put("tt0068646", "short", b'{"title": "The Godfather"}')
+
+        assert await store.get("tt0068646", "short") == b'{"title": "The Godfather"}'
+        assert await store.get("tt0068646", "full") is None
+        clock.now = 60
+        assert await store.get("tt0068646", "short") is None
+        stats = await store.stats()
+        assert (stats.entries, stats.hits, stats.misses) == (1, 1, 2)
+        await store.close()
+
+    async def test_hottest_outlive_the_store(self, tmp_path):
+        store = MediaStore(tmp_path / "media.sqlite3", max_age=60)
+        for imdb_id in ("tt0068646", "tt0071562", "tt0436992"):
+            await store.put(imdb_id, "short", imdb_id.encode())
+        await store.used("tt0436992", "short")
+        await store.used("tt0436992", "short")
+        await store.used("tt0071562", "short")
+        await store.close()
+
+        reopened = MediaStore(tmp_path / "media.sqlite3", max_age=60)
+        assert [imdb_id for imdb_id, _, _, _ in await reopened.hottest(2)] == ["tt0436992", "tt0071562"]
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+class TestScrapperMediaStore:
+    async def test_restart_is_warm(self, omdb, tmp_path):
+        config = Settings(OMDB_API_KEY="test", MEDIA_STORE_PATH=str(tmp_path / "media.sqlite3"))
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646', 'plot': 'full'})
+            await scrapper.find_media({'t': 'Doctor Who'})
+
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            media = await scrapper.find_media({'i': 'tt0068646', 'plot': 'full'})
+
+            assert media.title == "The Godfather"
+            assert len(omdb.requests) == 2
+            assert (await scrapper.store.stats()).preloaded == 2
+            assert (await scrapper.cache.stats()).hits == 1
+
+    async def test_lookups_by_id_are_answered_by_the_store(self, omdb, tmp_path):
+        config = Settings(OMDB_API_KEY="test", MEDIA_STORE_PATH=str(tmp_path / "media.sqlite3"), CACHE_MEDIA_TTL=0)
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            await scrapper.find_media({'t': 'Doctor Who'})
+            media = await scrapper.find_media({'i': 'tt0436992'})
+            await scrapper.find_media({'t': 'Doctor Who'})
+
+            assert media.imdb.id == "tt0436992"
+            assert len(omdb.requests) == 1
+            assert (await scrapper.store.stats()).hits == 2
+
+    async def test_preload_keeps_the_freshness_left(self, omdb, tmp_path):
+        path = tmp_path / "media.sqlite3"
+        store = MediaStore(path, max_age=60, clock=lambda: time.time() - 55)
+        await store.put("tt0068646", "short", (FIXTURES_PATH / "tt0068646.json").read_bytes())
+        await store.close()
+
+        config = Settings(
+            OMDB_API_KEY="test", MEDIA_STORE_PATH=str(path), MEDIA_STORE_MAX_AGE=60,
+            CACHE_MEDIA_TTL=3600, CACHE_STALE_TTL=100
+        )
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            assert await scrapper.preload() == 1
+            ttl = await scrapper.cache.ttl('media:i=tt0068646&plot=short')
+
+        # Fresh for the 5 seconds it has left in the store, then stale.
+        assert 100 < ttl <= 105
+
+    async def test_refreshes_do_not_read_the_store(self, omdb, tmp_path):
+        clock = FakeClock()
+        cache = MemoryBackend(max_entries=10, clock=clock)
+        config = Settings(
+            OMDB_API_KEY="test", MEDIA_STORE_PATH=str(tmp_path / "media.sqlite3"),
+            CACHE_MEDIA_TTL=10, CACHE_STALE_TTL=100
+        )
+        async with Scrapper(config=config, transport=omdb.transport, cache=cache) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            clock.now = 50
+            await scrapper.find_media({'i': 'tt0068646'})
+            await settle(scrapper)
+
+            assert len(omdb.requests) == 2
+            assert (await scrapper.store.stats()).hits == 0
+            assert await cache.ttl('media:i=tt0068646&plot=short') == 110
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from movie_scrapper_api.__main__ import app
+from movie_scrapper_api.api.dependencies import get_scrapper
+from movie_scrapper_api.api.metrics import metrics_router
+from movie_scrapper_api.api.v1.routes import v1_router
+from movie_scrapper_api.metrics import MetricsMiddleware, PrometheusMetrics
+from movie_scrapper_api.scrapper import Scrapper
+
+
+def sample(metrics: PrometheusMetrics, line: str) -> float | None:
+    content, _ = metrics.render()
+    for sample_line in content.decode().splitlines():
+        name, _, value = sample_line.rpartition(" ")
+        if name == line:
+            return float(value)
+    return None
+
+
+@pytest.mark.asyncio
+class TestMetrics:
+    async def test_scrapper_metrics(self, omdb):
+        metrics = PrometheusMetrics()
+        async with Scrapper(transport=omdb.transport, metrics=metrics) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            await scrapper.find_media({'i': 'tt0068646'})
+
+        assert sample(metrics, 'omdb_request_duration_seconds_count{status="200"}') == 1
+        assert sample(metrics, 'cache_lookups_total{cache="responses",result="hit"}') == 1
+        assert sample(metrics, 'cache_lookups_total{cache="responses",result="miss"}') == 1
+        assert sample(metrics, 'omdb_requests_in_flight') == 0
+
+    async def test_requests_by_route(self, omdb):
+        metrics = PrometheusMetrics()
+        api = FastAPI()
+        api.state.metrics = metrics
+        api.add_middleware(MetricsMiddleware, metrics=metrics)
+        api.include_router(v1_router, prefix="/api/v1")
+        api.include_router(metrics_router)
+
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            api.dependency_overrides[get_scrapper] = lambda: scrapper
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+                await client.get("/api/v1/search/media/The Godfather")
+                await client.get("/api/v1/search/media/Doctor Who")
+                await client.get("/api/v1/media", params={'q': 'tt0000000'})
+                await client.get("/nowhere")
+                res = await client.get("/metrics")
+
+        assert res.status_code == 200
+        assert res.headers['content-type'].startswith("text/plain")
+        route = 'route="/api/v1/search/media/{media_name}"'
+        assert sample(metrics, f'http_request_duration_seconds_count{{method="GET",{route},status="200"}}') == 2
+        assert sample(metrics, 'http_request_duration_seconds_count{method="GET",route="/api/v1/media",status="404"}') == 1
+        assert sample(metrics, 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}') == 1
+        assert sample(metrics, 'http_requests_in_flight') == 0
+
+    async def test_disabled(self):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            res = await client.get("/metrics")
+
+        assert res.status_code == 404
+
+
+class TestMultiprocessMetrics:
+    def test_workers_are_summed(self, tmp_path):
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}
+        record = (
+            "from movie_scrapper_api.metrics import PrometheusMetrics; "
+            "PrometheusMetrics().request_finished('GET', '/api/v1/media', 200, 0.1)"
+        )
+        render = "from movie_scrapper_api.metrics import PrometheusMetrics; print(PrometheusMetrics().render()[0].decode())"
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", record], env=env, check=True)
+        rendered = subprocess.run([sys.executable, "-c", render], env=env, check=True, capture_output=True, text=True)
+
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/media",status="200"} 2.0' in rendered.stdout
@@ -0,0 +1,34 @@
+import pytest
+
+from movie_scrapper_api.models.media import MediaModel, SearchModel
+from movie_scrapper_api.omdb import build_media, build_search, render_media, render_search
+from tests.conftest import FIXTURES_PATH
+
+
+class TestOMDBParsing:
+    @pytest.mark.parametrize("path", sorted(FIXTURES_PATH.glob("tt*.json")), ids=lambda path: path.stem)
+    def test_render_media_is_the_body_of_the_model(self, path):
+        body = render_media(path.read_bytes())
+
+        assert MediaModel.model_validate_json(body).model_dump_json().encode() == body
+        assert build_media(body) == MediaModel.model_validate_json(body)
+        assert build_media(body).model_dump_json().encode() == body
+
+    def test_build_media_without_poster(self):
+        media = build_media(render_media((FIXTURES_PATH / "tt0096548.json").read_bytes()))
+
+        assert media.poster is None
+        assert media.writers == ["Richard Curtis", "Ben Elton"]
+        assert str(media.embed) == "https://vidsrc.to/embed/series/tt0096548"
+
+    @pytest.mark.parametrize("path", sorted(FIXTURES_PATH.glob("search-*.json")), ids=lambda path: path.stem)
+    def test_render_search_is_the_body_of_the_model(self, path):
+        body = render_search(path.read_bytes())
+
+        assert SearchModel.model_validate_json(body).model_dump_json().encode() == body
+        assert build_search(body) == SearchModel.model_validate_json(body)
+
+    @pytest.mark.parametrize("parse", [render_media, render_search])
+    def test_errors_of_omdb(self, parse):
+        with pytest.raises(ValueError, match="Movie not found!"):
+            parse(b'{"Response":"False","Error":"Movie not found!"}')
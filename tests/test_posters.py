@@ -0,0 +1,146 @@
+import io
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from movie_scrapper_api.__main__ import app
+from movie_scrapper_api.api.dependencies import get_scrapper
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.posters import PosterCache
+from movie_scrapper_api.scrapper import Scrapper
+
+
+def poster_requests(omdb) -> list[httpx.Request]:
+    return [request for request in omdb.requests if request.url.path.endswith(".jpg")]
+
+
+@pytest.fixture
+def config(tmp_path) -> Settings:
+    return Settings(OMDB_API_KEY="test", POSTER_CACHE_PATH=str(tmp_path / "posters"), POSTER_THUMBNAIL_WIDTHS="")
+
+
+@pytest_asyncio.fixture
+async def client(omdb, config):
+    async with Scrapper(config, transport=omdb.transport) as scrapper:
+        app.dependency_overrides[get_scrapper] = lambda: scrapper
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+class TestPosterCache:
+    async def test_find_poster(self, omdb, config):
+        async with Scrapper(config, transport=omdb.transport) as scrapper:
+            path = await scrapper.find_poster("tt0068646")
+            again = await scrapper.find_poster("tt0068646")
+            stats = scrapper.posters.stats()
+
+        assert path == again
+        assert path.read_bytes() == omdb.poster
+        assert len(poster_requests(omdb)) == 1
+        assert poster_requests(omdb)[0].url.host == "m.media-amazon.com"
+        assert (stats.entries, stats.hits, stats.misses) == (1, 1, 1)
+
+    async def test_stale_poster_is_revalidated(self, omdb, config):
+        now = 1000.0
+        async with Scrapper(config, transport=omdb.transport) as scrapper:
+            scrapper.posters = PosterCache(config.POSTER_CACHE_PATH, 10_000, max_age=60, clock=lambda: now)
+            await scrapper.find_poster("tt0068646")
+            now += 120
+            await scrapper.find_poster("tt0068646")
+
+        assert poster_requests(omdb)[1].headers['If-None-Match'] == omdb.poster_etag
+        assert scrapper.posters.revalidations == 1
+        # Only the media of the first download was looked up in OMDB.
+        assert len(omdb.requests) == 3
+
+    async def test_least_recently_used_posters_are_removed(self, tmp_path):
+        cache = PosterCache(tmp_path, max_bytes=250, max_age=60)
+        for imdb_id in ("tt0000001", "tt0000002", "tt0000003"):
+            await cache.put(imdb_id, "https://posters/poster.jpg", b"x" * 100)
+        cache.get("tt0000002")
+        await cache.put("tt0000004", "https://posters/poster.jpg", b"x" * 100)
+
+        assert [cache.get(imdb_id) is not None for imdb_id in ("tt0000002", "tt0000004")] == [True, True]
+        assert not (tmp_path / "tt0000001.jpg").exists()
+        assert not (tmp_path / "tt0000003.jpg").exists()
+        assert cache.evictions == 2
+        # The posters on the disk are found again.
+        assert len(PosterCache(tmp_path, max_bytes=250, max_age=60)) == 2
+
+    async def test_thumbnails(self, tmp_path):
+        image = pytest.importorskip("PIL.Image")
+        poster = io.BytesIO()
+        image.new("RGB", (300, 450)).save(poster, "JPEG")
+        cache = PosterCache(tmp_path, max_bytes=1_000_000, max_age=60, widths=[100])
+
+        await cache.put("tt0068646", "https://posters/poster.jpg", poster.getvalue())
+
+        assert image.open(cache.file("tt0068646", 100)).size == (100, 150)
+
+    async def test_invalid_imdb_id(self, tmp_path):
+        with pytest.raises(ValueError):
+            PosterCache(tmp_path, max_bytes=1000, max_age=60).file("../secrets")
+
+
+@pytest.mark.asyncio
+class TestPosterRoutes:
+    async def test_get_poster(self, client, omdb):
+        res = await client.get("/poster/tt0068646")
+        not_modified = await client.get("/poster/tt0068646", headers={'If-None-Match': res.headers['etag']})
+
+        assert res.status_code == 200
+        assert res.headers['content-type'] == "image/jpeg"
+        assert res.content == omdb.poster
+        assert not_modified.status_code == 304
+        assert len(poster_requests(omdb)) == 1
+
+    @pytest.mark.parametrize("path, status", [
+        ("/poster/tt9999999", 404),
+        ("/poster/..%2Fconfig", 404),
+        ("/poster/tt0068646?width=123", 422)
+    ])
+    async def test_get_poster_errors(self, client, path, status):
+        res = await client.get(path)
+
+        assert res.status_code == status
+
+    async def test_poster_removed_before_it_is_sent(self, client, omdb, monkeypatch):
+        scrapper = app.dependency_overrides[get_scrapper]()
+        find_poster = scrapper.find_poster
+        removed = []
+
+        async def find_removed_poster(imdb_id, width=None):
+            path = await find_poster(imdb_id, width)
+            if not removed:
+                removed.append(path)
+                path.unlink()
+            return path
+
+        monkeypatch.setattr(scrapper, "find_poster", find_removed_poster)
+        res = await client.get("/poster/tt0068646")
+
+        assert res.status_code == 200
+        assert res.content == omdb.poster
+        assert len(poster_requests(omdb)) == 2
+
+    async def test_poster_always_removed_before_it_is_sent(self, client, monkeypatch):
+        scrapper = app.dependency_overrides[get_scrapper]()
+        find_poster = scrapper.find_poster
+
+        async def find_removed_poster(imdb_id, width=None):
+            path = await find_poster(imdb_id, width)
+            path.unlink()
+            return path
+
+        monkeypatch.setattr(scrapper, "find_poster", find_removed_poster)
+        res = await client.get("/poster/tt0068646")
+
+        assert res.status_code == 404
+
+
+class TestPosterSettings:
+    def test_disabled_by_default(self):
+        assert Settings(OMDB_API_KEY="test").POSTER_CACHE_PATH is None
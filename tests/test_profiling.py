@@ -0,0 +1,129 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from movie_scrapper_api.api.admin import admin_router
+from movie_scrapper_api.api.dependencies import get_scrapper
+from movie_scrapper_api.api.v1.routes import v1_router
+from movie_scrapper_api.config import Settings, settings
+from movie_scrapper_api.profiling import Profiler, ProfilingMiddleware, create_profiler, is_admin
+from movie_scrapper_api.scrapper import Scrapper
+
+
+def profiled_api(profiler: Profiler | None) -> FastAPI:
+    api = FastAPI()
+    api.state.profiler = profiler
+    if profiler is not None:
+        api.add_middleware(ProfilingMiddleware, profiler=profiler, admin_token="secret")
+    api.include_router(v1_router, prefix="/api/v1")
+    api.include_router(admin_router, prefix="/admin")
+    return api
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    return "secret"
+
+
+@pytest.mark.asyncio
+class TestProfiling:
+    async def test_requested_profile(self, omdb, tmp_path):
+        profiler = Profiler(tmp_path)
+        api = profiled_api(profiler)
+
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            api.dependency_overrides[get_scrapper] = lambda: scrapper
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+                res = await client.get(
+                    "/api/v1/media", params={'q': 'tt0068646'}, headers={'X-Profile': "1", 'X-Admin-Token': "secret"}
+                )
+                forbidden = await client.get(
+                    "/api/v1/media", params={'q': 'tt0068646'}, headers={'X-Profile': "1", 'X-Admin-Token': "wrong"}
+                )
+
+        assert res.status_code == 200
+        report = profiler.report(res.headers['x-profile-report'])
+        assert report.read_text().startswith("GET /api/v1/media?q=tt0068646")
+        assert "function calls" in report.read_text()
+        assert 'x-profile-report' not in forbidden.headers
+        assert (profiler.profiled, profiler.busy) == (1, False)
+
+    async def test_sampled_profiles(self, omdb, tmp_path):
+        api = profiled_api(Profiler(tmp_path, sample_rate=1.0))
+
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            api.dependency_overrides[get_scrapper] = lambda: scrapper
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+                res = await client.get("/api/v1/search/media/The Godfather")
+
+        assert (tmp_path / res.headers['x-profile-report']).exists()
+
+    async def test_armed_profiles(self, omdb, tmp_path, admin_token):
+        profiler = Profiler(tmp_path)
+        api = profiled_api(profiler)
+        headers = {'X-Admin-Token': admin_token}
+
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            api.dependency_overrides[get_scrapper] = lambda: scrapper
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+                armed = await client.post("/admin/profile", params={'requests': 2}, headers=headers)
+                responses = [await client.get("/api/v1/media", params={'q': 'tt0068646'}) for _ in range(3)]
+                name = responses[0].headers['x-profile-report']
+                report = await client.get(f"/admin/profiles/{name}", headers=headers)
+                traversal = await client.get("/admin/profiles/..%2Fsecret.txt", headers=headers)
+                missing = await client.get("/admin/profiles/profile-1-00000000.txt", headers=headers)
+
+        assert armed.json() == {'engine': "cprofile", 'armed': 2, 'profiled': 0, 'busy': False}
+        assert ['x-profile-report' in res.headers for res in responses] == [True, True, False]
+        assert report.status_code == 200
+        assert report.text.startswith("GET /api/v1/media")
+        assert traversal.status_code == 404
+        assert missing.status_code == 404
+
+    async def test_admin_endpoints_need_the_token(self, tmp_path, monkeypatch):
+        api = profiled_api(Profiler(tmp_path))
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+            monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+            without_token = await client.post("/admin/profile", headers={'X-Admin-Token': ""})
+            monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+            wrong_token = await client.post("/admin/profile", headers={'X-Admin-Token': "wrong"})
+            no_token = await client.post("/admin/profile")
+
+        assert without_token.status_code == 404
+        assert wrong_token.status_code == 403
+        assert no_token.status_code == 403
+
+    async def test_disabled_profiler(self, admin_token):
+        api = profiled_api(None)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+            res = await client.post("/admin/profile", headers={'X-Admin-Token': admin_token})
+
+        assert res.status_code == 404
+        assert res.json() == {'detail': "The profiler is not enabled."}
+
+
+class TestProfiler:
+    def test_one_request_at_a_time(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        profiler.arm(2)
+
+        assert profiler.should_profile()
+        _, profile = profiler.start()
+        profile.disable()
+        assert not profiler.should_profile(requested=True)
+        assert profiler.armed == 1
+
+    def test_is_admin(self):
+        assert is_admin(b"secret", "secret")
+        assert is_admin("secret", "secret")
+        assert not is_admin(b"wrong", "secret")
+        assert not is_admin(None, "secret")
+        assert not is_admin(b"", "")
+
+    def test_create_profiler(self, tmp_path):
+        assert create_profiler(Settings(OMDB_API_KEY="key")) is None
+        profiler = create_profiler(Settings(OMDB_API_KEY="key", PROFILING_ENABLED=True, PROFILE_PATH=str(tmp_path)))
+        assert profiler.engine == "cprofile"
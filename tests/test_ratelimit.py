@@ -0,0 +1,75 @@
+from datetime import date
+
+import httpx
+import pytest
+
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.exceptions import QuotaExceededError, RateLimitedError
+from movie_scrapper_api.ratelimit import QuotaManager, TokenBucket
+from movie_scrapper_api.scrapper import Scrapper
+from tests.test_cache import FakeClock
+
+
+class TestTokenBucket:
+    def test_bucket_is_refilled(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=2, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+        assert bucket.wait_time() == 1
+        clock.now = 1
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+
+@pytest.mark.asyncio
+class TestQuotaManager:
+    async def test_keys_are_rotated(self):
+        quota = QuotaManager(["first", "second"], rate=0, burst=10, daily_quota=100, queue_timeout=0)
+
+        keys = [await quota.acquire() for _ in range(4)]
+
+        assert sorted(keys) == ["first", "first", "second", "second"]
+
+    async def test_calls_wait_in_line(self):
+        quota = QuotaManager(["key"], rate=100, burst=1, daily_quota=100, queue_timeout=1)
+
+        assert [await quota.acquire() for _ in range(3)] == ["key"] * 3
+        assert quota.stats().throttled == 2
+
+    async def test_calls_are_rejected_after_the_timeout(self):
+        quota = QuotaManager(["key"], rate=0.1, burst=1, daily_quota=100, queue_timeout=1)
+        await quota.acquire()
+
+        with pytest.raises(RateLimitedError) as err:
+            await quota.acquire()
+        assert err.value.retry_after == pytest.approx(10, abs=0.1)
+        assert quota.stats().rejected == 1
+
+    async def test_daily_quota(self):
+        today = date(2023, 8, 18)
+        quota = QuotaManager(["key"], rate=0, burst=10, daily_quota=2, queue_timeout=0, today=lambda: today)
+        await quota.acquire()
+        await quota.acquire()
+
+        with pytest.raises(QuotaExceededError):
+            await quota.acquire()
+        today = date(2023, 8, 19)
+        assert await quota.acquire() == "key"
+
+
+@pytest.mark.asyncio
+class TestScrapperQuota:
+    async def test_refused_key_is_skipped(self, omdb):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.params['apikey'] == "spent":
+                return httpx.Response(401, json={"Response": "False", "Error": "Request limit reached!"})
+            return omdb.handle(request)
+
+        config = Settings(OMDB_API_KEY="spent, fresh", OMDB_BURST=100)
+        async with Scrapper(config=config, transport=httpx.MockTransport(handler)) as scrapper:
+            for imdb_id in ("tt0068646", "tt0071562", "tt0436992"):
+                await scrapper.find_media({'i': imdb_id})
+
+        stats = scrapper.quota.stats()
+        assert [key.remaining_today for key in stats.keys] == [0, 997]
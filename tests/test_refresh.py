@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from movie_scrapper_api.admission import request_deadline
+from movie_scrapper_api.cache.memory import MemoryBackend
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.scrapper import Scrapper
+from tests.test_cache import FakeClock
+
+
+async def settle(scrapper: Scrapper) -> None:
+    for _ in range(100):
+        await asyncio.sleep(0)
+        if scrapper.refresher.stats().in_flight == 0:
+            return
+
+
+@pytest.mark.asyncio
+class TestRefresher:
+    config = Settings(OMDB_API_KEY="test", CACHE_MEDIA_TTL=10, CACHE_STALE_TTL=100, REFRESH_INTERVAL=30)
+
+    async def test_stale_answer_is_served_and_revalidated(self, omdb):
+        clock = FakeClock()
+        cache = MemoryBackend(max_entries=10, clock=clock)
+        async with Scrapper(config=self.config, transport=omdb.transport, cache=cache) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            clock.now = 50
+            media = await scrapper.find_media({'i': 'tt0068646'})
+            await settle(scrapper)
+
+            assert media.title == "The Godfather"
+            assert len(omdb.requests) == 2
+            assert await cache.ttl('media:i=tt0068646&plot=short') == 110
+            assert scrapper.refresher.stats().revalidations == 1
+
+    async def test_revalidation_outlives_the_deadline_of_the_request(self, omdb):
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.2)
+            return omdb.handle(request)
+
+        clock = FakeClock()
+        cache = MemoryBackend(max_entries=10, clock=clock)
+        async with Scrapper(config=self.config, transport=httpx.MockTransport(slow_handler), cache=cache) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            clock.now = 50
+            token = request_deadline.set(time.monotonic() + 0.05)
+            try:
+                await scrapper.find_media({'i': 'tt0068646'})
+            finally:
+                request_deadline.reset(token)
+            await asyncio.sleep(0.5)
+
+            assert len(omdb.requests) == 2
+            assert scrapper.refresher.stats().failures == 0
+            assert scrapper.breaker.failures == 0
+
+    async def test_fresh_answer_is_not_revalidated(self, omdb):
+        async with Scrapper(config=self.config, transport=omdb.transport) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            await scrapper.find_media({'i': 'tt0068646'})
+            await settle(scrapper)
+
+        assert len(omdb.requests) == 1
+
+    async def test_hot_keys_are_refreshed_ahead(self, omdb):
+        clock = FakeClock()
+        cache = MemoryBackend(max_entries=10, clock=clock)
+        async with Scrapper(config=self.config, transport=omdb.transport, cache=cache) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            await scrapper.find_media({'i': 'tt0436992'})
+            await scrapper.refresher.refresh_hot()
+            await settle(scrapper)
+
+            assert len(omdb.requests) == 4
+            assert scrapper.refresher.stats().refreshes == 2
@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+import pytest
+
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.exceptions import CircuitOpenError, UpstreamFailedError
+from movie_scrapper_api.resilience import CircuitBreaker, LatencyTracker, backoff
+from movie_scrapper_api.scrapper import Scrapper
+from tests.test_cache import FakeClock
+
+
+class TestCircuitBreaker:
+    def test_opens_after_failures_and_probes(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, recovery_time=10, clock=clock)
+
+        breaker.record_failure()
+        breaker.check()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError) as err:
+            breaker.check()
+        assert err.value.retry_after == 10
+
+        clock.now = 10
+        assert breaker.state == "half_open"
+        breaker.check()
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.trips == 1
+        assert breaker.rejected == 2
+
+    def test_backoff_and_percentiles(self):
+        assert all(0 <= backoff(attempt, 0.1, 1) <= min(1, 0.1 * 2 ** attempt) for attempt in range(10))
+
+        latency = LatencyTracker(window=100)
+        assert latency.percentile(0.95) is None
+        for value in range(200):
+            latency.observe(value)
+        assert latency.percentile(0.5) == 150
+        assert latency.percentile(0.95) == 195
+
+
+@pytest.mark.asyncio
+class TestScrapperResilience:
+    config = Settings(OMDB_API_KEY="test", OMDB_RETRY_BACKOFF=0, CIRCUIT_FAILURE_THRESHOLD=3)
+
+    async def test_failures_are_retried(self, omdb):
+        answers = iter([
+            httpx.Response(502, text="<html>Bad Gateway</html>", headers={'content-type': "text/html"}),
+            httpx.ConnectError("Connection refused")
+        ])
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            answer = next(answers, None)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer or omdb.handle(request)
+
+        async with Scrapper(config=self.config, transport=httpx.MockTransport(handle)) as scrapper:
+            media = await scrapper.find_media({'i': 'tt0068646'})
+
+            assert media.title == "The Godfather"
+            assert scrapper.upstream_stats().retries == 2
+            assert scrapper.upstream_stats().consecutive_failures == 0
+
+    async def test_circuit_fails_fast(self):
+        requests = []
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text="<html>Down for maintenance</html>", headers={'content-type': "text/html"})
+
+        async with Scrapper(config=self.config, transport=httpx.MockTransport(handle)) as scrapper:
+            with pytest.raises(UpstreamFailedError):
+                await scrapper.find_media({'i': 'tt0068646'})
+            with pytest.raises(CircuitOpenError):
+                await scrapper.find_media({'i': 'tt0071562'})
+
+            assert len(requests) == 3
+            assert scrapper.upstream_stats().circuit == "open"
+
+    async def test_deadline(self, omdb):
+        async def handle(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(1)
+            return omdb.handle(request)
+
+        config = Settings(OMDB_API_KEY="test", OMDB_DEADLINE=0.05, OMDB_RETRIES=0)
+        async with Scrapper(config=config, transport=httpx.MockTransport(handle)) as scrapper:
+            with pytest.raises(UpstreamFailedError, match="in time"):
+                await scrapper.find_media({'i': 'tt0068646'})
+
+    async def test_slow_call_is_hedged(self, omdb):
+        calls = 0
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(1)
+            return omdb.handle(request)
+
+        config = Settings(OMDB_API_KEY="test", OMDB_HEDGE=True, OMDB_HEDGE_MIN_DELAY=0.01)
+        async with Scrapper(config=config, transport=httpx.MockTransport(handle)) as scrapper:
+            for _ in range(20):
+                scrapper.latency.observe(0.001)
+            media = await asyncio.wait_for(scrapper.find_media({'i': 'tt0068646'}), 0.5)
+
+            assert media.title == "The Godfather"
+            assert scrapper.upstream_stats().hedges == 1
+            assert scrapper.upstream_stats().hedge_wins == 1
@@ -0,0 +1,224 @@
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from movie_scrapper_api.__main__ import app, lifespan
+from movie_scrapper_api.api.dependencies import get_scrapper
+from movie_scrapper_api.config import Settings, settings
+from movie_scrapper_api.models.media import MediaModel
+from movie_scrapper_api.scrapper import Scrapper
+
+
+@pytest_asyncio.fixture
+async def scrapper(omdb):
+    async with Scrapper(transport=omdb.transport) as scrapper:
+        app.dependency_overrides[get_scrapper] = lambda: scrapper
+        yield scrapper
+    app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def client(scrapper):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+class TestRouter:
+    async def test_lifespan_owns_scrapper(self):
+        async with lifespan(app):
+            scrapper = app.state.scrapper
+            assert not scrapper.is_closed
+        assert scrapper.is_closed
+
+    @pytest.mark.parametrize("params", [
+        {
+            'q': "The Godfather",
+            'mode': 't',
+            'type': 'movie'
+        },
+        {
+            "q": "tt0436992",
+            'mode': 'i',
+            "plot": "full"
+        }
+    ])
+    async def test_get_media(self, client, scrapper, params):
+        res = await client.get("/media", params=params)
+
+        assert res.status_code == 200
+        if params['mode'] == 't':
+            assert res.json()['title'] == params['q']
+        else:
+            assert res.json()['imdb']['id'] == params['q']
+        assert not scrapper.is_closed
+
+    async def test_get_media_invalid_name(self, client):
+        res = await client.get("/media", params={'q': 'asdsadsada', 'mode': 't'})
+
+        assert res.status_code == 404
+        assert res.json()['detail'] == 'Movie not found!'
+
+    async def test_search_movie(self, client):
+        res = await client.get("/search/media/The Godfather")
+
+        assert res.status_code == 200
+        assert len(res.json()['search']) == 10
+        assert res.json()['total_results'] == 21
+
+    @pytest.mark.parametrize(("params", "expected"), [
+        ({'page': 2, 'limit': 3}, ["Godfather of Harlem", "The Godfather Part II", "The Godfather of Green Bay"]),
+        ({'page': 3}, ["The Godfather Diaries"]),
+        ({'type': 'series'}, ["The Godfather Saga"]),
+        ({'year': '1990'}, ["The Godfather Part III", "The Godfather Family: A Look Inside"])
+    ])
+    async def test_search_movie_page(self, client, params, expected):
+        res = await client.get("/search/media/The Godfather", params=params)
+
+        assert res.status_code == 200
+        assert [media['title'] for media in res.json()['search']] == expected
+
+    async def test_search_movie_aggregate(self, client, omdb):
+        res = await client.get("/search/media/The Godfather", params={'aggregate': 5, 'limit': 4})
+
+        assert res.status_code == 200
+        assert [media['title'] for media in res.json()['search']] == [
+            "The Godfather", "The Godfather", "The Godfather II", "The Godfather Saga"
+        ]
+        assert len(omdb.requests) == 3
+
+        res = await client.get("/search/media/The Godfather", params={'aggregate': 3})
+        found = [media['imdbID'] for media in res.json()['search']]
+        assert len(found) == len(set(found)) == 19
+        assert len(omdb.requests) == 3
+
+    async def test_search_movie_stream(self, client):
+        res = await client.get("/search/media/The Godfather", params={'aggregate': 3, 'stream': True})
+        events = await client.get(
+            "/search/media/The Godfather",
+            params={'stream': True, 'limit': 2},
+            headers={'Accept': "text/event-stream"}
+        )
+        missing = await client.get("/search/media/asddsadsa", params={'stream': True})
+
+        assert res.headers['content-type'] == "application/x-ndjson"
+        found = [json.loads(line)['imdbID'] for line in res.text.splitlines()]
+        assert len(found) == len(set(found)) == 19
+        assert events.headers['content-type'].startswith("text/event-stream")
+        *media, end, _ = events.text.split("\n\n")
+        assert [json.loads(event.removeprefix("data: "))['title'] for event in media] == [
+            "The Godfather", "The Godfather Part II"
+        ]
+        assert end == "event: end\ndata: {}"
+        assert missing.status_code == 404
+
+    async def test_stats(self, client):
+        await client.get("/media", params={'q': 'tt0068646'})
+        await client.get("/media", params={'q': 'tt0068646'})
+        res = await client.get("/stats")
+
+        assert res.status_code == 200
+        assert res.json()['cache']['hits'] == 1
+        assert res.json()['cache']['misses'] == 1
+        assert res.json()['admission']['admitted'] >= 2
+
+    async def test_get_media_batch(self, client):
+        res = await client.post("/media/batch", json={'queries': ['tt0068646', 'tt9999999', 'tt0436992']})
+
+        assert res.status_code == 200
+        results = res.json()['results']
+        assert [result['status'] for result in results] == [200, 404, 200]
+        assert results[0]['media']['title'] == "The Godfather"
+        assert results[1]['error'] == "Movie not found!"
+
+    async def test_get_media_batch_stream(self, client):
+        res = await client.post(
+            "/media/batch",
+            params={'stream': True},
+            json={'queries': ['The Godfather', 'Doctor Who'], 'mode': 't', 'plot': 'full'}
+        )
+
+        assert res.status_code == 200
+        assert res.headers['content-type'] == "application/x-ndjson"
+        results = [json.loads(line) for line in res.text.splitlines()]
+        assert sorted(result['media']['title'] for result in results) == ["Doctor Who", "The Godfather"]
+
+    async def test_get_season(self, client, omdb):
+        omdb.add_series("tt9000001", seasons=2, episodes=3)
+
+        res = await client.get("/media/tt9000001/seasons/2", params={'details': True})
+        missing = await client.get("/media/tt9000001/seasons/3")
+
+        assert res.status_code == 200
+        titles = [episode['media']['title'] for episode in res.json()['episodes']]
+        assert titles == ["Episode 2x1", "Episode 2x2", "Episode 2x3"]
+        assert missing.status_code == 404
+
+    async def test_get_series(self, client, omdb):
+        omdb.add_series("tt9000001", seasons=3, episodes=2)
+
+        res = await client.get("/media/tt9000001/seasons")
+        streamed = await client.get("/media/tt9000001/seasons", params={'stream': True})
+        missing = await client.get("/media/tt9000002/seasons", params={'stream': True})
+
+        assert res.status_code == 200
+        assert [season['season'] for season in res.json()['seasons']] == [1, 2, 3]
+        assert streamed.headers['content-type'] == "application/x-ndjson"
+        assert sorted(json.loads(line)['season'] for line in streamed.text.splitlines()) == [1, 2, 3]
+        assert missing.status_code == 404
+
+    async def test_cached_media_is_sent_as_is(self, client, scrapper):
+        first = await client.get("/media", params={'q': 'tt0436992'})
+        second = await client.get("/media", params={'q': 'tt0436992'})
+
+        assert first.content == second.content
+        assert first.headers['etag'] == second.headers['etag']
+        assert MediaModel.model_validate_json(second.content).imdb.id == 'tt0436992'
+        assert (await scrapper.cache.stats()).hits == 1
+
+    async def test_not_modified(self, client):
+        first = await client.get("/media", params={'q': 'tt0436992'})
+        res = await client.get("/media", params={'q': 'tt0436992'}, headers={'If-None-Match': first.headers['etag']})
+
+        assert first.headers['cache-control'] == f"public, max-age={settings.HTTP_CACHE_MEDIA_MAX_AGE}"
+        assert res.status_code == 304
+        assert res.content == b""
+        assert res.headers['etag'] == first.headers['etag']
+
+        res = await client.get(
+            "/search/media/The Godfather",
+            headers={'If-None-Match': 'W/"other", ' + first.headers['etag']}
+        )
+        assert res.status_code == 200
+        assert res.headers['cache-control'] == f"public, max-age={settings.HTTP_CACHE_SEARCH_MAX_AGE}"
+
+        res = await client.get("/search/media/The Godfather", headers={'If-None-Match': res.headers['etag']})
+        assert res.status_code == 304
+
+    async def test_rate_limited(self, omdb):
+        config = Settings(OMDB_API_KEY="key", OMDB_RATE_LIMIT=0.01, OMDB_BURST=1, OMDB_QUEUE_TIMEOUT=0)
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            app.dependency_overrides[get_scrapper] = lambda: scrapper
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                await client.get("/api/v1/media", params={'q': 'tt0068646'})
+                res = await client.get("/api/v1/media", params={'q': 'tt0436992'})
+            app.dependency_overrides.clear()
+
+        assert res.status_code == 503
+        assert res.headers['retry-after'] == "100"
+
+    async def test_upstream_error_page(self):
+        def handle(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, text="<html>Service Unavailable</html>", headers={'content-type': "text/html"})
+
+        config = Settings(OMDB_API_KEY="key", OMDB_RETRIES=0)
+        async with Scrapper(config=config, transport=httpx.MockTransport(handle)) as scrapper:
+            app.dependency_overrides[get_scrapper] = lambda: scrapper
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                res = await client.get("/api/v1/search/media/The Godfather")
+            app.dependency_overrides.clear()
+
+        assert res.status_code == 503
+        assert res.json()['detail'] == "OMDB answered with an error (503)."
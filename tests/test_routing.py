@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi._compat import ModelField
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from movie_scrapper_api.api.routing import DeferredRoute
+from movie_scrapper_api.models.errors import HTTPError
+
+
+class Public(BaseModel):
+    name: str
+
+
+class Private(Public):
+    password: str
+
+
+def create_app() -> tuple[FastAPI, DeferredRoute]:
+    router = APIRouter(route_class=DeferredRoute)
+
+    @router.get("/user", responses={404: {"description": "Not found.", "model": HTTPError}})
+    async def get_user() -> Public:
+        return Private(name="iakovos", password="secret")
+
+    app = FastAPI()
+    app.include_router(router)
+    return app, app.routes[-1]
+
+
+@pytest.mark.asyncio
+class TestDeferredRoute:
+    async def test_fields_are_built_on_the_first_request(self):
+        app, route = create_app()
+        assert route._DeferredRoute__fields is None
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            res = await client.get("/user")
+
+        assert res.json() == {'name': "iakovos"}
+        assert route._DeferredRoute__fields is not None
+
+    async def test_fields_are_built_for_the_openapi_schema(self):
+        app, route = create_app()
+        responses = app.openapi()['paths']['/user']['get']['responses']
+
+        assert responses['200']['content']['application/json']['schema'] == {'$ref': "#/components/schemas/Public"}
+        assert responses['404']['content']['application/json']['schema'] == {'$ref': "#/components/schemas/HTTPError"}
+        assert route._DeferredRoute__fields is not None
+
+
+def test_fastapi_internals_of_deferred_routes():
+    """
+    `DeferredRoute` builds the fields `APIRoute.__init__` builds, with the helpers of FastAPI it
+    uses. This fails when an upgrade of FastAPI changes them, and `FAST_START` with it.
+    """
+    async def get_user() -> Public:
+        return Public(name="iakovos")
+
+    responses = {404: {"description": "Not found.", "model": HTTPError}}
+    route = APIRoute("/user", get_user, responses=responses)
+    deferred = DeferredRoute("/user", get_user, responses=responses)
+
+    def describe(field) -> tuple:
+        return field.name, field.mode, field.type_
+
+    def is_field(value) -> bool:
+        if isinstance(value, dict):
+            return any(isinstance(item, ModelField) for item in value.values())
+        return isinstance(value, ModelField)
+
+    fields = {name for name, value in vars(route).items() if is_field(value)}
+    assert fields == {"response_field", "secure_cloned_response_field", "response_fields"}
+    assert describe(deferred.response_field) == describe(route.response_field)
+    assert describe(deferred.secure_cloned_response_field) == describe(route.secure_cloned_response_field)
+    assert {code: describe(field) for code, field in deferred.response_fields.items()} == {
+        code: describe(field) for code, field in route.response_fields.items()
+    }
+
+
+def test_fast_start_has_the_same_openapi_schema():
+    schema = "import json; from movie_scrapper_api.__main__ import app; print(json.dumps(app.openapi(), sort_keys=True))"
+    schemas = [
+        subprocess.run(
+            [sys.executable, "-c", schema],
+            env={**os.environ, 'OMDB_API_KEY': "test", 'FAST_START': fast_start},
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        for fast_start in ("false", "true")
+    ]
+
+    assert schemas[0] == schemas[1]
@@ -1,10 +1,18 @@
 import httpx
 import pytest
+import pytest_asyncio
 
+from movie_scrapper_api.__main__ import app
+from movie_scrapper_api.api.dependencies import get_scrapper
 from movie_scrapper_api.scrapper import Scrapper
 
 
-@pytest.mark.scrapper
+@pytest_asyncio.fixture
+async def scrapper(omdb):
+    async with Scrapper(transport=omdb.transport) as scrapper:
+        yield scrapper
+
+
 @pytest.mark.asyncio
 class TestScrapper:
     @pytest.mark.parametrize('params', [
@@ -12,8 +20,7 @@ class TestScrapper:
             't': 'asddsadsa'
         },
     ])
-    async def test_find_movie_by_wrong_params(self, params):
-        scrapper = Scrapper()
+    async def test_find_movie_by_wrong_params(self, scrapper, params):
         with pytest.raises(ValueError):
             await scrapper.find_media(params)
 
@@ -27,8 +34,7 @@ class TestScrapper:
             "plot": "full"
         }
     ])
-    async def test_find_media(self, params):
-        scrapper = Scrapper()
+    async def test_find_media(self, scrapper, params):
         media_data = await scrapper.find_media(params)
 
         if 't' in params:
@@ -39,27 +45,29 @@ class TestScrapper:
     @pytest.mark.parametrize('fake_movie_name', [
         'asddsadsa'
     ])
-    async def test_find_movie_by_fake_name(self, fake_movie_name):
-        scrapper = Scrapper()
+    async def test_find_movie_by_fake_name(self, scrapper, fake_movie_name):
         with pytest.raises(ValueError):
             await scrapper.search_media(fake_movie_name)
 
     @pytest.mark.parametrize("movie_name", [
         'Doctor Who',
-        'The Godfather',
-        'Blackadder',
-        'Mr. Bean'
+        'The Godfather'
     ])
-    async def test_search_movie(self, movie_name):
-        scrapper = Scrapper()
+    async def test_search_movie(self, scrapper, movie_name):
         media_data = await scrapper.search_media(movie_name)
         assert len(media_data.search) > 0
 
 
-@pytest.mark.scrapper
 @pytest.mark.asyncio
 class TestScrapperRouter:
-    base_url = "http://localhost:9101/api/v1"
+    base_url = "http://test/api/v1"
+
+    @pytest_asyncio.fixture
+    async def client(self, scrapper):
+        app.dependency_overrides[get_scrapper] = lambda: scrapper
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=self.base_url) as client:
+            yield client
+        app.dependency_overrides.clear()
 
     @pytest.mark.parametrize('params', [
         {
@@ -67,12 +75,11 @@ class TestScrapperRouter:
             'mode': 't'
         }
     ])
-    async def test_get_media_invalid_name(self, params):
-        async with httpx.AsyncClient(base_url=self.base_url) as client:
-            res = await client.get(
-                "/media",
-                params=params
-            )
+    async def test_get_media_invalid_name(self, client, params):
+        res = await client.get(
+            "/media",
+            params=params
+        )
 
         assert res.status_code == 404
         assert res.json()['detail'] == 'Movie not found!'
@@ -89,12 +96,11 @@ class TestScrapperRouter:
             "plot": "full"
         }
     ])
-    async def test_get_media(self, params):
-        async with httpx.AsyncClient(base_url=self.base_url) as client:
-            res = await client.get(
-                "/media",
-                params=params
-            )
+    async def test_get_media(self, client, params):
+        res = await client.get(
+            "/media",
+            params=params
+        )
 
         assert res.status_code == 200
         if params['mode'] == 't':
@@ -105,22 +111,18 @@ class TestScrapperRouter:
     @pytest.mark.parametrize('fake_movie_name', [
         'asddsadsa'
     ])
-    async def test_get_movie_wrong_name(self, fake_movie_name):
-        async with httpx.AsyncClient(base_url=self.base_url) as client:
-            res = await client.get(f"/search/media/{fake_movie_name}")
+    async def test_get_movie_wrong_name(self, client, fake_movie_name):
+        res = await client.get(f"/search/media/{fake_movie_name}")
 
         assert res.status_code == 404
         assert res.json()['detail'] == 'Movie not found!'
 
     @pytest.mark.parametrize("movie_name", [
         'Doctor Who',
-        'The Godfather',
-        'Blackadder',
-        'Mr. Bean'
+        'The Godfather'
     ])
-    async def test_search_movie(self, movie_name):
-        async with httpx.AsyncClient(base_url=self.base_url) as client:
-            res = await client.get(f"/search/media/{movie_name}")
+    async def test_search_movie(self, client, movie_name):
+        res = await client.get(f"/search/media/{movie_name}")
 
         assert res.status_code == 200
         assert len(res.json()['search']) > 0
@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from movie_scrapper_api.cache.keys import search_cache_key
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.models.media import SearchModel
+from movie_scrapper_api.omdb import render_search
+from movie_scrapper_api.scrapper import Scrapper
+from movie_scrapper_api.search_index import Segment, TitleIndex, normalize_title
+from tests.conftest import FIXTURES_PATH
+
+MEDIA = [
+    {'title': "The Godfather", 'year': "1972", 'imdbID': "tt0068646", 'type': "movie", 'poster': None},
+    {'title': "The Godfather Part II", 'year': "1974", 'imdbID': "tt0071562", 'type': "movie", 'poster': None},
+    {'title': "Doctor Who", 'year': "2005–2022", 'imdbID': "tt0436992", 'type': "series", 'poster': None},
+    {'title': "Amélie", 'year': "2001", 'imdbID': "tt0211915", 'type': "movie", 'poster': None}
+]
+
+
+def test_normalize_title():
+    assert normalize_title("  Amélie:  The Movie!") == "amelie the movie"
+
+
+class TestSegment:
+    def test_lookups(self):
+        segment = Segment(Segment.build(MEDIA))
+
+        assert len(segment) == 4
+        assert [segment.get(media_id)['title'] for media_id in segment.starting_with("the godfather")] == [
+            "The Godfather", "The Godfather Part II"
+        ]
+        assert list(segment.starting_with("star wars")) == []
+        assert [segment.key(media_id) for media_id in segment.posting(" wh")] == ["doctor who"]
+        assert segment.posting("xyz") is None
+
+
+@pytest.mark.asyncio
+class TestTitleIndex:
+    @pytest.mark.parametrize("flushed", [False, True])
+    async def test_search(self, flushed):
+        index = TitleIndex()
+        for media in MEDIA:
+            index.add(media)
+        if flushed:
+            await index.flush()
+
+        assert [media['title'] for _, media in index.search("the godf")] == [
+            "The Godfather", "The Godfather Part II"
+        ]
+        assert index.search("godfather part")[0][1]['imdbID'] == "tt0071562"
+        assert index.search("Godfahter")[0][1]['imdbID'] == "tt0068646"
+        assert index.search("amelie")[0][0] == 1.0
+        assert index.search("star wars") == []
+
+    async def test_answer_only_when_confident(self):
+        index = TitleIndex(min_results=2)
+        for media in MEDIA:
+            index.add(media)
+
+        assert [media['title'] for media in index.answer("The Godfather")] == [
+            "The Godfather", "The Godfather Part II"
+        ]
+        # A single title, a prefix or a typo are not enough for the index to know the answer.
+        assert index.answer("Doctor Who") is None
+        assert index.answer("The Godf") is None
+        assert index.answer("who") is None
+        assert index.stats().hits == 1
+        assert index.stats().misses == 3
+
+    async def test_persisted(self, tmp_path):
+        path = tmp_path / "titles.idx"
+        index = TitleIndex(path, max_pending=2)
+        for media in MEDIA[:3]:
+            index.add(media)
+        await index.close()
+
+        other = TitleIndex(path)
+        other.add(MEDIA[3])
+        await other.close()
+
+        index.add({**MEDIA[0], 'year': "1973"})
+        await index.close()
+        reopened = TitleIndex(path)
+        assert reopened.stats().entries == 4
+        assert reopened.stats().pending == 0
+        assert reopened.search("amelie")[0][1]['imdbID'] == "tt0211915"
+        assert reopened.search("the godfather")[0][1]['year'] == "1973"
+
+    async def test_load_dump(self, tmp_path):
+        dump = tmp_path / "dump.ndjson"
+        search = json.loads((FIXTURES_PATH / "search-the-godfather.json").read_text())
+        dump.write_text("\n".join(json.dumps(media) for media in search['Search']))
+
+        index = TitleIndex()
+        await index.load_dump(dump)
+
+        assert index.stats().entries == len(search['Search'])
+        assert index.stats().pending == 0
+
+
+@pytest.mark.asyncio
+class TestScrapperSearchIndex:
+    async def test_search_is_answered_by_the_index(self, omdb, tmp_path):
+        dump = tmp_path / "dump.ndjson"
+        search = json.loads((FIXTURES_PATH / "search-the-godfather.json").read_text())
+        dump.write_text("\n".join(json.dumps(media) for media in search['Search']))
+        config = Settings(
+            OMDB_API_KEY="test", SEARCH_INDEX_ENABLED=True, SEARCH_INDEX_DUMP=str(dump), SEARCH_INDEX_MIN_RESULTS=5
+        )
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            found = await scrapper.search_media("the godfather")
+
+            assert len(omdb.requests) == 0
+            assert isinstance(found, SearchModel)
+            assert found.search[0].title == "The Godfather"
+            assert found.total_results is None
+            # The answers of the index are not cached as the ones of OMDB.
+            assert await scrapper.cache.get(search_cache_key({'s': "the godfather"})) is None
+
+    async def test_cached_search_is_not_answered_by_the_index(self, omdb, tmp_path):
+        dump = tmp_path / "dump.ndjson"
+        search = json.loads((FIXTURES_PATH / "search-the-godfather.json").read_text())
+        dump.write_text("\n".join(json.dumps(media) for media in search['Search']))
+        config = Settings(
+            OMDB_API_KEY="test", SEARCH_INDEX_ENABLED=True, SEARCH_INDEX_DUMP=str(dump), SEARCH_INDEX_MIN_RESULTS=5
+        )
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            body = render_search((FIXTURES_PATH / "search-the-godfather.json").read_bytes())
+            await scrapper.cache.set(search_cache_key({'s': "The Godfather"}), body, 60)
+            found = await scrapper.search_media("The Godfather")
+
+            assert len(omdb.requests) == 0
+            assert found.total_results == 21
+            assert (scrapper.index.stats().hits, scrapper.index.stats().misses) == (0, 0)
+
+    async def test_partial_index_falls_through_to_omdb(self, omdb):
+        config = Settings(OMDB_API_KEY="test", SEARCH_INDEX_ENABLED=True)
+        async with Scrapper(config=config, transport=omdb.transport) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            found = await scrapper.search_media("The Godfather")
+            # OMDB has not found this prefix, the index would have answered with "The Godfather".
+            with pytest.raises(ValueError):
+                await scrapper.search_media("The Godf")
+
+            assert len(omdb.requests) == 3
+            assert len(found.search) == 10
+            assert found.total_results == 21
+            assert scrapper.index.stats().hits == 0
+
+    async def test_disabled_by_default(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            await scrapper.find_media({'i': 'tt0436992'})
+            with pytest.raises(ValueError):
+                await scrapper.search_media("Doctor Wh")
+
+            assert scrapper.index is None
@@ -0,0 +1,41 @@
+import asyncio
+
+import httpx
+import pytest
+
+from movie_scrapper_api.scrapper import Scrapper
+
+
+@pytest.mark.asyncio
+class TestScrapperSearchStream:
+    async def test_first_page_is_yielded_before_the_others(self, omdb):
+        later_pages = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if 'page' in request.url.params:
+                await later_pages.wait()
+            return omdb.handle(request)
+
+        async with Scrapper(transport=httpx.MockTransport(handler)) as scrapper:
+            found = scrapper.stream_search("The Godfather", pages=3)
+            first_page = [await anext(found) for _ in range(10)]
+            later_pages.set()
+            others = [media async for media in found]
+
+        assert first_page[0]['title'] == "The Godfather"
+        ids = [media['imdbID'] for media in first_page + others]
+        assert len(ids) == len(set(ids)) == 19
+        assert len(omdb.requests) == 3
+
+    async def test_limit_cancels_the_other_pages(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            found = [media async for media in scrapper.stream_search("The Godfather", pages=3, limit=4)]
+
+        assert [media['title'] for media in found] == [
+            "The Godfather", "The Godfather Part II", "The Godfather Part III", "The Godfather Trilogy: 1901-1980"
+        ]
+
+    async def test_not_found(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            with pytest.raises(ValueError):
+                await anext(scrapper.stream_search("asddsadsa"))
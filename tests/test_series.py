@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+import pytest
+
+from movie_scrapper_api.cache.keys import alias_cache_key
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.models.media import PlotType
+from movie_scrapper_api.models.series import SeasonModel, SeriesModel
+from movie_scrapper_api.scrapper import Scrapper
+
+
+@pytest.mark.asyncio
+class TestScrapperSeries:
+    async def test_find_season(self, omdb):
+        omdb.add_series("tt9000001", seasons=2, episodes=3)
+
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            season = (await scrapper.find_season_json("tt9000001", 2)).to_model(SeasonModel)
+            await scrapper.find_season_json("tt9000001", 2)
+
+        assert len(omdb.requests) == 1
+        assert omdb.requests[0].url.params['Season'] == "2"
+        assert season.title == "A Series"
+        assert (season.season, season.total_seasons) == (2, 2)
+        assert [episode.episode for episode in season.episodes] == [1, 2, 3]
+        assert season.episodes[0].imdbID == "tt9010201"
+        assert season.episodes[0].media is None
+
+    async def test_find_season_not_found(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            with pytest.raises(ValueError):
+                await scrapper.find_season_json("tt9000001", 1)
+
+    async def test_find_season_details_is_bounded(self, omdb):
+        omdb.add_series("tt9000001", seasons=1, episodes=12)
+        running = 0
+        max_running = 0
+
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return omdb.handle(request)
+
+        config = Settings(OMDB_API_KEY="test", SEARCH_INDEX_ENABLED=True)
+        async with Scrapper(config=config, transport=httpx.MockTransport(slow_handler)) as scrapper:
+            found = await scrapper.find_season_json("tt9000001", 1, PlotType.Full, concurrency=4)
+            requests = len(omdb.requests)
+            again = await scrapper.find_season_json("tt9000001", 1, PlotType.Full, concurrency=4)
+            # An episode is only remembered by its title with its type.
+            typed = await scrapper.alias_cache.get(alias_cache_key("Episode 1x1", "episode", "2005"))
+            untyped = await scrapper.alias_cache.get(alias_cache_key("Episode 1x1", None, "2005"))
+
+        season = found.to_model(SeasonModel)
+        assert max_running == 4
+        assert requests == 13
+        assert len(omdb.requests) == 13
+        assert again.body == found.body
+        assert [episode.media.title for episode in season.episodes] == [f"Episode 1x{n}" for n in range(1, 13)]
+        assert (typed, untyped) == (b"tt9010101", None)
+        assert len(scrapper.index) == 0
+
+    async def test_find_series(self, omdb):
+        omdb.add_series("tt9000001", seasons=4, episodes=2, missing=(3,))
+
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            series = (await scrapper.find_series_json("tt9000001", PlotType.Short)).to_model(SeriesModel)
+
+        assert series.imdbID == "tt9000001"
+        assert series.total_seasons == 4
+        assert [season.season for season in series.seasons] == [1, 2, 4]
+        assert all(episode.media is not None for season in series.seasons for episode in season.episodes)
+        # 4 seasons and 6 episodes.
+        assert len(omdb.requests) == 10
+
+    async def test_find_seasons_is_capped(self, omdb):
+        omdb.add_series("tt9000001", seasons=5, episodes=1)
+        config = Settings(OMDB_API_KEY="test", SERIES_MAX_SEASONS=3)
+
+        async with Scrapper(config, transport=omdb.transport) as scrapper:
+            seasons = [season async for season in scrapper.find_seasons("tt9000001")]
+
+        assert sorted(season.to_model(SeasonModel).season for season in seasons) == [1, 2, 3]
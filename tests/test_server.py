@@ -0,0 +1,97 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.server import event_loop, http_protocol
+from movie_scrapper_api.startup import startup_report
+
+
+def test_event_loop_and_http_protocol():
+    config = Settings(OMDB_API_KEY="test", SERVER_LOOP="asyncio", SERVER_HTTP="h11")
+
+    assert (event_loop(config), http_protocol(config)) == ("asyncio", "h11")
+    assert event_loop(Settings(OMDB_API_KEY="test")) in ("asyncio", "uvloop")
+
+
+def test_startup_report():
+    times = [
+        (2, "pydantic.main", 0.2),
+        (1, "pydantic", 0.3),
+        (1, "fastapi.routing", 0.1),
+        (0, "fastapi", 0.5),
+        (1, "movie_scrapper_api.models.media", 0.05),
+        (0, "movie_scrapper_api.config", 0.1),
+        (0, "fastapi.middleware.cors", 0.01),
+        (0, "movie_scrapper_api.__main__", 0.9)
+    ]
+
+    assert startup_report(times) == [
+        ("fastapi", 0.51), ("pydantic", 0.3), ("models", 0.05), ("settings", 0.1), ("application", 0.9)
+    ]
+
+
+class TestPrefork:
+    def test_workers_share_the_socket_and_the_metrics(self, tmp_path):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        env = {
+            **os.environ,
+            'OMDB_API_KEY': "test",
+            'BIND_HOST': "127.0.0.1",
+            'BIND_PORT': str(port),
+            'WORKERS': "2",
+            'METRICS_ENABLED': "true",
+            'SEARCH_INDEX_ENABLED': "false"
+        }
+        env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "movie_scrapper_api"], env=env, stderr=subprocess.PIPE, text=True
+        )
+        try:
+            deadline = time.monotonic() + 20
+            while True:
+                try:
+                    httpx.get(f"http://127.0.0.1:{port}/api/v1/stats")
+                    break
+                except httpx.TransportError:
+                    assert time.monotonic() < deadline
+                    time.sleep(0.1)
+            for _ in range(5):
+                assert httpx.get(f"http://127.0.0.1:{port}/api/v1/stats").status_code == 200
+            metrics = httpx.get(f"http://127.0.0.1:{port}/metrics").text
+        finally:
+            server.send_signal(signal.SIGTERM)
+            _, logs = server.communicate(timeout=20)
+
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/stats",status="200"} 6.0' in metrics
+        assert "Serving with 2 worker(s)" in logs
+        assert logs.count("Application startup complete") == 2
+        assert server.returncode == 0
+
+    def test_workers_failing_at_startup_stop_the_server(self, tmp_path):
+        (tmp_path / "file").touch()
+        env = {
+            **os.environ,
+            'OMDB_API_KEY': "test",
+            'BIND_HOST': "127.0.0.1",
+            'BIND_PORT': "0",
+            'WORKERS': "2",
+            'SEARCH_INDEX_ENABLED': "false",
+            # The store can not be opened, so the lifespan of every worker fails.
+            'MEDIA_STORE_PATH': str(tmp_path / "file" / "media.sqlite3")
+        }
+        server = subprocess.run(
+            [sys.executable, "-m", "movie_scrapper_api"], env=env, stderr=subprocess.PIPE, text=True, timeout=30
+        )
+
+        assert server.returncode == 1
+        assert "forking another one in 0.1s" in server.stderr
+        assert "forking another one in 0.2s" in server.stderr
+        assert "5 workers died after their start in a row, stopping" in server.stderr
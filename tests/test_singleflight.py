@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+import pytest
+
+from movie_scrapper_api.scrapper import Scrapper
+from movie_scrapper_api.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    async def test_identical_calls_are_coalesced(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        results = await asyncio.gather(*(flights.do('key', fetch, 21) for _ in range(10)))
+
+        assert results == [42] * 10
+        assert calls == [21]
+        assert (flights.flights, flights.callers, flights.max_callers) == (1, 10, 10)
+        assert len(flights) == 0
+
+    async def test_errors_are_shared(self):
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("Movie not found!")
+
+        results = await asyncio.gather(*(flights.do('key', fetch) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.flights == 1
+
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return 'done'
+
+        first = asyncio.ensure_future(flights.do('key', fetch))
+        second = asyncio.ensure_future(flights.do('key', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 'done'
+
+    async def test_abandoned_call_is_cancelled(self):
+        flights = SingleFlight()
+        fetch = asyncio.Event()
+
+        callers = [asyncio.ensure_future(flights.do('key', fetch.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert len(flights) == 0
+        assert flights.stats().abandoned == 1
+
+    async def test_caller_after_an_abandoned_call_starts_a_new_one(self):
+        flights = SingleFlight()
+
+        async def fetch(delay):
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # Like closing a connection or writing to the cache, while being cancelled.
+                await asyncio.sleep(0.01)
+                raise
+            return 'done'
+
+        abandoned = asyncio.ensure_future(flights.do('key', fetch, 1))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        await asyncio.gather(abandoned, return_exceptions=True)
+
+        assert await flights.do('key', fetch, 0) == 'done'
+        assert flights.stats().abandoned == 1
+
+
+@pytest.mark.asyncio
+class TestScrapperCoalescing:
+    async def test_concurrent_lookups_make_one_call(self, omdb):
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            return omdb.handle(request)
+
+        async with Scrapper(transport=httpx.MockTransport(slow_handler)) as scrapper:
+            medias = await asyncio.gather(*(scrapper.find_media({'i': 'tt0436992'}) for _ in range(50)))
+
+        assert {media.imdb.id for media in medias} == {'tt0436992'}
+        assert len(omdb.requests) == 1
+        assert scrapper.flights.max_callers == 50
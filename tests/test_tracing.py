@@ -0,0 +1,117 @@
+import importlib.util
+import json
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from movie_scrapper_api.api.dependencies import get_scrapper
+from movie_scrapper_api.api.v1.routes import v1_router
+from movie_scrapper_api.config import Settings
+from movie_scrapper_api.scrapper import Scrapper
+from movie_scrapper_api.tracing import NO_SPAN, Tracer, TracingMiddleware, create_tracer
+
+
+class RecordedSpan:
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+
+class RecordingTracer(Tracer):
+    """Keeps the spans in the order they end, with the names of their parents."""
+    enabled = True
+
+    def __init__(self):
+        self.spans: list[tuple[str, str | None, dict]] = []
+        self.__stack: list[str] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        span = RecordedSpan(name, attributes)
+        parent = self.__stack[-1] if self.__stack else None
+        self.__stack.append(name)
+        try:
+            yield span
+        finally:
+            self.__stack.pop()
+            self.spans.append((name, parent, span.attributes))
+
+    def names(self) -> list[str]:
+        return [name for name, _, _ in self.spans]
+
+
+@pytest.mark.asyncio
+class TestTracing:
+    async def test_disabled_tracer_records_nothing(self, omdb):
+        async with Scrapper(transport=omdb.transport) as scrapper:
+            assert not scrapper.tracer.enabled
+            assert scrapper.tracer.span("fetch", key="media") is NO_SPAN
+            await scrapper.find_media({'i': 'tt0068646'})
+
+    async def test_stages_of_a_lookup(self, omdb):
+        tracer = RecordingTracer()
+        async with Scrapper(transport=omdb.transport, tracer=tracer) as scrapper:
+            await scrapper.find_media({'i': 'tt0068646'})
+            missed = tracer.spans[:]
+            tracer.spans.clear()
+            await scrapper.find_media({'i': 'tt0068646'})
+
+        assert [name for name, _, _ in missed] == ["cache.get", "cache.get", "omdb.call", "render", "fetch", "validate"]
+        assert missed[0][2] == {'cache': "responses", 'cache.hit': False}
+        assert missed[2][2] == {'hedge': False, 'omdb.status': "200"}
+        assert tracer.names() == ["cache.get", "validate"]
+        assert tracer.spans[0][2] == {'cache': "responses", 'cache.hit': True}
+
+    async def test_spans_of_a_request(self, omdb):
+        tracer = RecordingTracer()
+        api = FastAPI()
+        api.add_middleware(TracingMiddleware, tracer=tracer)
+        api.include_router(v1_router, prefix="/api/v1")
+
+        async with Scrapper(transport=omdb.transport, tracer=tracer) as scrapper:
+            api.dependency_overrides[get_scrapper] = lambda: scrapper
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+                res = await client.get("/api/v1/media", params={'q': 'tt0068646'})
+
+        assert res.status_code == 200
+        spans = {name: (parent, attributes) for name, parent, attributes in tracer.spans}
+        assert spans["GET /api/v1/media"] == (None, {
+            'http.method': "GET", 'http.target': "/api/v1/media", 'http.status_code': 200
+        })
+        assert spans["find_media"][0] == "GET /api/v1/media"
+        assert spans["respond"][0] == "GET /api/v1/media"
+        assert spans["omdb.call"][0] == "fetch"
+        assert spans["render"][0] == "fetch"
+
+
+class TestCreateTracer:
+    def test_disabled(self):
+        assert not create_tracer(Settings(OMDB_API_KEY="key")).enabled
+
+    @pytest.mark.skipif(importlib.util.find_spec("opentelemetry") is not None, reason="OpenTelemetry is installed")
+    def test_missing_extra(self):
+        with pytest.raises(RuntimeError, match="poetry install -E tracing"):
+            create_tracer(Settings(OMDB_API_KEY="key", TRACING_ENABLED=True))
+
+
+@pytest.mark.asyncio
+class TestOpenTelemetryTracer:
+    async def test_spans_are_exported_to_a_file(self, omdb, tmp_path):
+        pytest.importorskip("opentelemetry.sdk")
+        path = tmp_path / "spans.jsonl"
+        tracer = create_tracer(Settings(OMDB_API_KEY="key", TRACING_ENABLED=True, TRACING_PATH=str(path)))
+        async with Scrapper(transport=omdb.transport, tracer=tracer) as scrapper:
+            with tracer.span("request"):
+                await scrapper.find_media({'i': 'tt0068646'})
+        tracer.close()
+
+        spans = {span['name']: span for span in map(json.loads, path.read_text().splitlines())}
+        assert {"request", "cache.get", "fetch", "omdb.call", "render", "validate"} <= spans.keys()
+        assert spans["omdb.call"]['attributes']['omdb.status'] == "200"
+        assert spans["fetch"]['parent_id'] == spans["request"]['context']['span_id']
+        assert spans["request"]['resource']['attributes']['service.name'] == "movie-scrapper-api"